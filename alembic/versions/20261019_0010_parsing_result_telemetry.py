@@ -0,0 +1,34 @@
+"""add per-phase telemetry to parsing_result"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_0010"
+down_revision = "20251210_0009"
+branch_labels = None
+depends_on = None
+
+COUNTERS = ("saved_amount", "duplicate_amount", "rejected_amount")
+DURATIONS = ("spawn_ms", "execute_ms", "decode_ms", "dedup_ms", "insert_ms")
+
+
+def upgrade() -> None:
+    for name in COUNTERS:
+        op.add_column(
+            "parsing_result",
+            sa.Column(name, sa.Integer(), nullable=False, server_default=sa.text("0")),
+        )
+    op.add_column(
+        "parsing_result",
+        sa.Column("output_bytes", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+    )
+    for name in DURATIONS:
+        op.add_column("parsing_result", sa.Column(name, sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    for name in (*DURATIONS, "output_bytes", *COUNTERS):
+        op.drop_column("parsing_result", name)
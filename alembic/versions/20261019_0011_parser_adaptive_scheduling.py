@@ -0,0 +1,31 @@
+"""add adaptive scheduling settings to parser"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_0011"
+down_revision = "20261019_0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "parser",
+        sa.Column(
+            "adaptive_scheduling", sa.Boolean(), nullable=False, server_default=sa.text("false")
+        ),
+    )
+    op.add_column("parser", sa.Column("min_parsing_interval", sa.Integer(), nullable=True))
+    op.add_column("parser", sa.Column("max_parsing_interval", sa.Integer(), nullable=True))
+    op.add_column("parser", sa.Column("last_changed_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("parser", "last_changed_at")
+    op.drop_column("parser", "max_parsing_interval")
+    op.drop_column("parser", "min_parsing_interval")
+    op.drop_column("parser", "adaptive_scheduling")
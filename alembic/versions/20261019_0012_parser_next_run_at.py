@@ -0,0 +1,23 @@
+"""add next_run_at to parser for exact-time dispatch"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_0012"
+down_revision = "20261019_0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # NULL means "unknown": the first dispatch computes it from parsing_result history.
+    op.add_column("parser", sa.Column("next_run_at", sa.DateTime(), nullable=True))
+    op.create_index("idx_parser_next_run_at", "parser", ["next_run_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_parser_next_run_at", table_name="parser")
+    op.drop_column("parser", "next_run_at")
@@ -0,0 +1,19 @@
+"""index publication.source_id for per-parser known-url lookups"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261019_0013"
+down_revision = "20261019_0012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("idx_publication_source_id", "publication", ["source_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_publication_source_id", table_name="publication")
@@ -0,0 +1,27 @@
+"""cover bot search keyset pagination with idx_publication_type_created_at"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261019_0014"
+down_revision = "20261019_0013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index("idx_publication_type_created_at", table_name="publication")
+    op.create_index(
+        "idx_publication_type_created_at",
+        "publication",
+        ["type", sa.text("created_at DESC"), sa.text("id DESC")],
+        postgresql_include=["is_declined"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_publication_type_created_at", table_name="publication")
+    op.create_index("idx_publication_type_created_at", "publication", ["type", "created_at"])
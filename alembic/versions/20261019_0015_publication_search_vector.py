@@ -0,0 +1,35 @@
+"""generated full-text search vector over publication title, company and description"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "20261019_0015"
+down_revision = "20261019_0014"
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('russian', title), 'A') || setweight(to_tsvector('simple', title), 'A')"
+    " || setweight(to_tsvector('russian', company), 'B') || setweight(to_tsvector('simple', company), 'B')"
+    " || setweight(to_tsvector('russian', description), 'C')"
+    " || setweight(to_tsvector('simple', description), 'C')"
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "publication",
+        sa.Column("search_vector", postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR, persisted=True)),
+    )
+    op.create_index(
+        "idx_publication_search_vector", "publication", ["search_vector"], postgresql_using="gin"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_publication_search_vector", table_name="publication")
+    op.drop_column("publication", "search_vector")
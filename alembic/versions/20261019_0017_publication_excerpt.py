@@ -0,0 +1,24 @@
+"""add generated publication.excerpt for list views"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261019_0017"
+down_revision = "20261019_0016"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep in sync with models.EXCERPT_LENGTH.
+    op.add_column(
+        "publication",
+        sa.Column("excerpt", sa.Text(), sa.Computed("substr(description, 1, 200)", persisted=True)),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("publication", "excerpt")
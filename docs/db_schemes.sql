@@ -101,7 +101,12 @@ CREATE TABLE IF NOT EXISTS parser (
     parsing_interval INTEGER NOT NULL,
     parsing_start_time TIMESTAMP NOT NULL,
     last_parsed_at TIMESTAMP,
-    is_active BOOLEAN NOT NULL DEFAULT true
+    is_active BOOLEAN NOT NULL DEFAULT true,
+    adaptive_scheduling BOOLEAN NOT NULL DEFAULT false,
+    min_parsing_interval INTEGER,
+    max_parsing_interval INTEGER,
+    last_changed_at TIMESTAMP,
+    next_run_at TIMESTAMP
 );
 
 CREATE TABLE IF NOT EXISTS parsing_result (
@@ -110,6 +115,15 @@ CREATE TABLE IF NOT EXISTS parsing_result (
     parser_id UUID NOT NULL,
     success BOOLEAN NOT NULL,
     received_amount INTEGER NOT NULL,
+    saved_amount INTEGER NOT NULL DEFAULT 0,
+    duplicate_amount INTEGER NOT NULL DEFAULT 0,
+    rejected_amount INTEGER NOT NULL DEFAULT 0,
+    output_bytes BIGINT NOT NULL DEFAULT 0,
+    spawn_ms INTEGER,
+    execute_ms INTEGER,
+    decode_ms INTEGER,
+    dedup_ms INTEGER,
+    insert_ms INTEGER,
     CONSTRAINT fk_parsing_result_parser FOREIGN KEY (parser_id) REFERENCES parser(id) ON DELETE CASCADE
 );
 
@@ -147,6 +161,8 @@ CREATE TABLE IF NOT EXISTS publication_schedule (
 -- Indexes
 CREATE INDEX IF NOT EXISTS idx_publication_type_created_at ON publication (type, created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_publication_tags_tag ON publication_tags (tag_id);
+CREATE INDEX IF NOT EXISTS idx_publication_source_id ON publication (source_id);
+CREATE INDEX IF NOT EXISTS idx_parser_next_run_at ON parser (next_run_at);
 CREATE INDEX IF NOT EXISTS idx_parsing_result_parser_date ON parsing_result (parser_id, date);
 CREATE INDEX IF NOT EXISTS idx_tg_user_refused_at ON tg_user (refused_at);
 CREATE INDEX IF NOT EXISTS idx_tg_user_subscriptions_user_type ON tg_user_subscriptions (user_id, publication_type);
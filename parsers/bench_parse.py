@@ -0,0 +1,99 @@
+"""
+Проверка и бенчмарк разбора детальных страниц на golden-фикстурах.
+
+    python3 parsers/bench_parse.py            # сверка с golden + время разбора на страницу
+    python3 parsers/bench_parse.py --update   # перезаписать golden (только осознанно!)
+
+Golden-файл parsers/fixtures/golden/parse_detail.json хранит ожидаемый результат
+(без created_at) для каждой фикстуры; при расхождении скрипт завершается с кодом 1.
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import tbank_parser
+import vk_parser
+from scraping_runtime import html_to_text
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+GOLDEN_PATH = FIXTURES_DIR / "golden" / "parse_detail.json"
+
+TBANK_URL = "https://www.tbank.ru/career/it/backend/vacancy-000"
+VK_URL = "https://team.vk.company/vacancy/12345/"
+SHORT_DESC = "<p>Краткое описание из API</p><p>Второй абзац</p>"
+SHORT_DESC_NO_P = "Только текст <b>без</b> абзацев"
+
+
+def _cases() -> list[tuple[str, str, Callable[[str], object]]]:
+    """(имя кейса, фикстура, функция разбора)"""
+    cases: list[tuple[str, str, Callable[[str], object]]] = []
+    for path in sorted((FIXTURES_DIR / "tbank").glob("detail*.html")):
+        cases.append(
+            (
+                f"tbank/{path.name}",
+                str(path),
+                lambda html: tbank_parser.parse_detail(html, TBANK_URL, "Fallback title", SHORT_DESC),
+            )
+        )
+    cases.append(
+        (
+            "tbank/detail_empty.html#no-paragraphs",
+            str(FIXTURES_DIR / "tbank" / "detail_empty.html"),
+            lambda html: tbank_parser.parse_detail(html, TBANK_URL, "Fallback title", SHORT_DESC_NO_P),
+        )
+    )
+    for path in sorted((FIXTURES_DIR / "vk").glob("detail*.html")):
+        cases.append((f"vk/{path.name}", str(path), lambda html: vk_parser.parse_detail(html, VK_URL, "Fallback title")))
+    for path in sorted((FIXTURES_DIR / "tbank").glob("detail*.html")):
+        cases.append((f"html_to_text/{path.name}", str(path), html_to_text))
+    return cases
+
+
+def _stable(result: object) -> object:
+    if isinstance(result, dict):
+        return {k: v for k, v in result.items() if k != "created_at"}
+    return result
+
+
+def main() -> None:
+    argp = argparse.ArgumentParser(description="Check parsers against golden fixtures and time parsing")
+    argp.add_argument("--update", action="store_true", help="Rewrite the golden file from current output")
+    argp.add_argument("--repeat", type=int, default=50, help="Parses per page for timing")
+    args = argp.parse_args()
+
+    golden: dict[str, object] = {}
+    if GOLDEN_PATH.exists() and not args.update:
+        golden = json.loads(GOLDEN_PATH.read_text(encoding="utf-8"))
+
+    outputs: dict[str, object] = {}
+    mismatches = 0
+    for name, path, parse in _cases():
+        html = Path(path).read_text(encoding="utf-8")
+        result = _stable(parse(html))
+        outputs[name] = result
+
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            parse(html)
+        per_page_ms = (time.perf_counter() - started) * 1000 / args.repeat
+
+        status = "new"
+        if name in golden:
+            status = "ok" if golden[name] == result else "MISMATCH"
+            mismatches += status == "MISMATCH"
+        print(json.dumps({"case": name, "parse_ms": round(per_page_ms, 3), "golden": status}, ensure_ascii=False))
+
+    if args.update:
+        GOLDEN_PATH.parent.mkdir(parents=True, exist_ok=True)
+        GOLDEN_PATH.write_text(json.dumps(outputs, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"golden written: {GOLDEN_PATH}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Бенчмарк парсеров на записанном трафике.
+
+Каждый парсер запускается так же, как его запускает раннер (отдельный процесс,
+`--output -`), но все HTTP-ответы берутся из архива parsers/fixtures/recordings/<parser>.jsonl.gz
+(см. replay.py). Для каждого запуска печатается JSON-строка: страницы/с, элементы/с,
+CPU-время процесса и его дочерних процессов, пиковый RSS и число промахов мимо архива.
+
+    python3 parsers/bench_parsers.py                         # все парсеры
+    python3 parsers/bench_parsers.py tbank vk --latency-ms 80 --repeat 3
+    python3 parsers/bench_parsers.py --record                # перезаписать архивы живым трафиком
+
+Промах (запрос, которого нет в архиве) означает, что архив устарел: перезапишите его через --record.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from replay import LATENCY_ENV, RECORD_ENV, REPLAY_ENV, STATS_ENV
+
+PARSERS_DIR = Path(__file__).resolve().parent
+RECORDINGS_DIR = PARSERS_DIR / "fixtures" / "recordings"
+
+PARSERS: dict[str, list[str]] = {
+    "tbank": ["tbank_parser.py"],
+    "vk": ["vk_parser.py"],
+    "nastachku": ["nastachku_parser.py"],
+    "podlodka": ["podlodka_parser.py"],
+    # Водяной знак не должен сокращать обход между повторами.
+    "internships": ["internships_parser.py", "--full"],
+}
+
+
+def archive_path(name: str) -> Path:
+    return RECORDINGS_DIR / f"{name}.jsonl.gz"
+
+
+def run_parser(name: str, env: dict[str, str], extra_args: list[str]) -> dict:
+    """Запускает парсер и меряет wall time и rusage процесса вместе с его пулом разбора."""
+    command = [sys.executable, *PARSERS[name], "--output", "-", *extra_args]
+    with tempfile.TemporaryFile() as stdout, tempfile.TemporaryFile() as stderr:
+        started = time.perf_counter()
+        proc = subprocess.Popen(
+            command, cwd=PARSERS_DIR, env=env, stdin=subprocess.DEVNULL, stdout=stdout, stderr=stderr
+        )
+        # wait4 отдаёт rusage именно этого процесса; ru_maxrss — максимум по нему и его потомкам.
+        _, status, usage = os.wait4(proc.pid, 0)
+        elapsed = time.perf_counter() - started
+        proc.returncode = os.waitstatus_to_exitcode(status)
+
+        if proc.returncode != 0:
+            stderr.seek(0)
+            tail = stderr.read().decode("utf-8", "replace")[-2000:]
+            raise RuntimeError(f"{name} exited with {proc.returncode}:\n{tail}")
+        stdout.seek(0)
+        items = json.load(stdout)
+
+    return {
+        "seconds": elapsed,
+        "items": len(items),
+        "cpu_s": usage.ru_utime + usage.ru_stime,
+        "peak_rss_mb": usage.ru_maxrss / 1024,
+    }
+
+
+def bench(name: str, latency_ms: float, extra_args: list[str]) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        stats_path = os.path.join(tmp, "replay_stats.json")
+        env = dict(
+            os.environ,
+            PARSERS_HTTP_CACHE="off",
+            **{REPLAY_ENV: str(archive_path(name)), STATS_ENV: stats_path, LATENCY_ENV: str(latency_ms)},
+        )
+        env.pop(RECORD_ENV, None)
+        result = run_parser(name, env, extra_args)
+        with open(stats_path, encoding="utf-8") as f:
+            stats = json.load(f)
+
+    seconds = result["seconds"]
+    return {
+        "parser": name,
+        "seconds": round(seconds, 3),
+        "pages": stats["requests"],
+        "pages_per_s": round(stats["requests"] / seconds, 1),
+        "items": result["items"],
+        "items_per_s": round(result["items"] / seconds, 1),
+        "cpu_s": round(result["cpu_s"], 3),
+        "peak_rss_mb": round(result["peak_rss_mb"], 1),
+        "misses": stats["misses"],
+    }
+
+
+def record(name: str, extra_args: list[str]) -> dict:
+    """Прогоняет парсер по живому сайту и сохраняет весь его трафик в архив."""
+    path = archive_path(name)
+    env = dict(os.environ, PARSERS_HTTP_CACHE="off", **{RECORD_ENV: str(path)})
+    env.pop(REPLAY_ENV, None)
+    result = run_parser(name, env, extra_args)
+    return {"parser": name, "items": result["items"], "archive": str(path)}
+
+
+def main() -> None:
+    argp = argparse.ArgumentParser(description="Benchmark parsers against recorded HTTP traffic")
+    argp.add_argument("parsers", nargs="*", metavar="PARSER", help=f"Какие парсеры гонять: {', '.join(PARSERS)}")
+    argp.add_argument("--latency-ms", type=float, default=0.0, help="Имитируемая задержка каждого ответа")
+    argp.add_argument("--repeat", type=int, default=1, help="Сколько раз запускать каждый парсер")
+    argp.add_argument("--record", action="store_true", help="Записать архивы с живых сайтов вместо бенчмарка")
+    argp.add_argument("--parser-args", default="", help="Доп. аргументы парсеру, например '--workers 4'")
+    args = argp.parse_args()
+
+    unknown = sorted(set(args.parsers) - set(PARSERS))
+    if unknown:
+        argp.error(f"unknown parsers: {', '.join(unknown)}")
+    extra_args = args.parser_args.split()
+    failed = False
+    for name in args.parsers or PARSERS:
+        if args.record:
+            print(json.dumps(record(name, extra_args), ensure_ascii=False))
+            continue
+        for _ in range(args.repeat):
+            result = bench(name, args.latency_ms, extra_args)
+            failed = failed or result["misses"] > 0
+            print(json.dumps(result, ensure_ascii=False))
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Бенчмарк загрузки детальных страниц TBankParser на записанных фикстурах.
+
+Ответы берутся из parsers/fixtures/tbank, сетевая задержка имитируется sleep'ом,
+поэтому сравнение последовательного и параллельного режима не зависит от сайта:
+
+    python3 parsers/bench_tbank_parser.py --latency-ms 80 --workers 1 8
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+from scraping_runtime import PARSE_WORKERS
+from tbank_parser import API_LIST_PATH, LIST_PATH, TBankParser
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "tbank"
+
+
+class FixtureSession(requests.Session):
+    """Session, отвечающая фикстурами с фиксированной задержкой вместо похода в сеть."""
+
+    def __init__(self, latency: float) -> None:
+        super().__init__()
+        self.latency = latency
+        self.api_pages = sorted(FIXTURES_DIR.glob("api_page_*.json"))
+        self.list_html = (FIXTURES_DIR / "list.html").read_bytes()
+        self.detail_html = (FIXTURES_DIR / "detail.html").read_bytes()
+
+    def request(self, method, url, params=None, json=None, **kwargs):  # noqa: A002
+        time.sleep(self.latency)
+        path = urlsplit(url).path
+        if path == API_LIST_PATH:
+            page = (json or {}).get("pagination", {}).get("it", {}).get("offset", 0) // 20
+            body = self.api_pages[page].read_bytes() if page < len(self.api_pages) else b"{}"
+            content_type = "application/json"
+        elif path == LIST_PATH:
+            body, content_type = self.list_html, "text/html; charset=utf-8"
+        else:
+            body, content_type = self.detail_html, "text/html; charset=utf-8"
+
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.url = url
+        resp.encoding = "utf-8"
+        resp.headers["Content-Type"] = content_type
+        resp._content = body if method != "HEAD" else b""
+        return resp
+
+
+def run(workers: int, latency: float, max_per_host: int, parse_workers: int, rate: float) -> tuple:
+    parser = TBankParser(
+        session=FixtureSession(latency),
+        max_workers=workers,
+        max_per_host=max_per_host,
+        parse_workers=parse_workers,
+        rate_per_host=rate,
+    )
+    started = time.perf_counter()
+    vacancies = parser.scrape_all()
+    return time.perf_counter() - started, vacancies
+
+
+def main() -> None:
+    argp = argparse.ArgumentParser(description="Benchmark T-Bank detail fetching on fixtures")
+    argp.add_argument("--latency-ms", type=float, default=80.0, help="Имитируемая задержка ответа")
+    argp.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8], help="Размеры пула для сравнения")
+    argp.add_argument("--max-per-host", type=int, default=8, help="Лимит одновременных запросов на хост")
+    argp.add_argument("--parse-workers", type=int, default=PARSE_WORKERS, help="Процессов для разбора HTML")
+    argp.add_argument("--rate", type=float, default=0.0, help="Лимит запросов/с на хост (0 — без лимита)")
+    args = argp.parse_args()
+
+    baseline: list[dict] = []
+    for workers in args.workers:
+        elapsed, vacancies = run(workers, args.latency_ms / 1000, args.max_per_host, args.parse_workers, args.rate)
+        stable = [{k: v for k, v in vac.items() if k != "created_at"} for vac in vacancies]
+        if not baseline:
+            baseline = stable
+        same = "ok" if stable == baseline else "MISMATCH"
+        print(
+            json.dumps(
+                {
+                    "workers": workers,
+                    "vacancies": len(vacancies),
+                    "seconds": round(elapsed, 3),
+                    "vacancies_per_s": round(len(vacancies) / elapsed, 1) if elapsed else None,
+                    "output": same,
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Собирает учебные архивы воспроизведения из HTML/JSON-фикстур, без похода в сеть.
+
+Парсеры запускаются как обычно, но HTTPAdapter.send подменён генератором ответов
+по фикстурам; RecordingAdapter записывает ровно те запросы, что делает парсер,
+поэтому ключи архива совпадают с воспроизведением. Живой трафик записывается
+через bench_parsers.py --record, он перезаписывает эти файлы.
+
+    python3 parsers/fixtures/recordings/build_samples.py
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RECORDINGS_DIR = Path(__file__).resolve().parent
+FIXTURES_DIR = RECORDINGS_DIR.parent
+PARSERS_DIR = FIXTURES_DIR.parent
+sys.path.insert(0, str(PARSERS_DIR))
+
+import replay  # noqa: E402
+
+VK_SAMPLE_SPECIALTIES = 3
+VK_SAMPLE_PAGES = 2
+VK_CARDS_PER_PAGE = 10
+INTERNSHIPS_TOTAL = 230
+
+
+def _vk_list(specialty: str, page: int) -> str:
+    cards = []
+    if page <= VK_SAMPLE_PAGES:
+        for i in range(VK_CARDS_PER_PAGE):
+            vac_id = f"{specialty}{page:02d}{i:02d}"
+            cards.append(f'<a href="/vacancy/{vac_id}/"><h3>Разработчик {vac_id}</h3></a>')
+    return f"<html><body><a href=\"/vacancy/\">Все</a>{''.join(cards)}</body></html>"
+
+
+def _nastachku() -> str:
+    cards = []
+    for i, date in enumerate(["10-11 апреля 2026", "2-3 октября 2026", "14 мая 2026", "5-6 ноября 2025"]):
+        cards.append(
+            f'<div class="conf"><div><div><a href="/conf-{i}"><div><h2>#Стачка conf {i}</h2>'
+            f"<p>{date}, Ульяновск</p><p>Программа для разработчиков</p>"
+            f"<span>{'КУПИТЬ БИЛЕТ' if i < 3 else 'КАК ЭТО БЫЛО'}</span></div></a></div></div></div>"
+        )
+    return f"<html><body><main>{''.join(cards)}</main></body></html>"
+
+
+def _podlodka() -> str:
+    rows = []
+    for i, date in enumerate(["3 марта", "14 апреля", "26 мая", "9 июня", "22 сентября", "17 ноября"]):
+        rows.append(
+            f'<div class="t513__row"><div class="t513__time">{date}</div>'
+            f'<div class="t513__title">Podlodka Crew #{i}</div>'
+            f'<div class="t513__text">Неделя докладов для команды</div><a href="/crew/{i}">Подробнее</a></div>'
+        )
+    return (
+        '<html><body><div class="t-rec"><div><div><div><div><h2>Расписание конференций</h2></div></div>'
+        f"{''.join(rows)}</div></div></div></body></html>"
+    )
+
+
+def _internships(offset: int, limit: int) -> dict:
+    items = []
+    for i in range(offset, min(offset + limit, INTERNSHIPS_TOTAL)):
+        items.append(
+            {
+                "alias": f"internship-{i:03d}",
+                "title": f"Стажировка {i}",
+                "description": "Стажировка для студентов",
+                "text": {"blocks": [{"data": {"text": "Задачи"}}, {"data": {"items": ["Python", "SQL"]}}]},
+                "company": {"caption": f"Компания {i % 17}"},
+                "published_at": f"2026-{1 + i % 9:02d}-{1 + i % 27:02d} 10:00",
+                "unpublished_at": "2026-12-31 23:59",
+            }
+        )
+    return {"data": items}
+
+
+def fixture_response(request: requests.PreparedRequest) -> tuple:
+    """(status, content-type, тело) для запроса парсера."""
+    parts = urlsplit(request.url or "")
+    html = "text/html; charset=utf-8"
+    if parts.netloc == "www.tbank.ru":
+        if parts.path == "/pfpjobs/papi/getVacancies":
+            offset = json.loads(request.body)["pagination"]["it"]["offset"]
+            page = FIXTURES_DIR / "tbank" / f"api_page_{offset // 20}.json"
+            return 200, "application/json", page.read_bytes() if page.exists() else b"{}"
+        if parts.path == "/career/vacancies/it/":
+            return 200, html, (FIXTURES_DIR / "tbank" / "list.html").read_bytes()
+        # Каждая четвёртая вакансия — «тяжёлая» страница, как на живом сайте.
+        name = "detail_large.html" if sum(map(ord, parts.path)) % 4 == 0 else "detail.html"
+        return 200, html, (FIXTURES_DIR / "tbank" / name).read_bytes()
+    if parts.netloc == "team.vk.company":
+        if parts.path == "/vacancy/":
+            query = parse_qs(parts.query)
+            specialty, page = query["specialty"][0], int(query["page"][0])
+            from vk_parser import IT_SPECIALTY_IDS
+
+            if specialty not in IT_SPECIALTY_IDS[:VK_SAMPLE_SPECIALTIES]:
+                page = VK_SAMPLE_PAGES + 1
+            return 200, html, _vk_list(specialty, page).encode("utf-8")
+        name = "detail_large.html" if parts.path.endswith("0/") else "detail_main.html"
+        return 200, html, (FIXTURES_DIR / "vk" / name).read_bytes()
+    if parts.netloc == "nastachku.ru":
+        return 200, html, _nastachku().encode("utf-8")
+    if parts.netloc == "podlodka.io":
+        return 200, html, _podlodka().encode("utf-8")
+    if parts.netloc == "it.fut.ru":
+        query = parse_qs(parts.query)
+        body = _internships(int(query["offset"][0]), int(query["limit"][0]))
+        return 200, "application/json", json.dumps(body, ensure_ascii=False).encode("utf-8")
+    return 404, html, b""
+
+
+def _fake_send(self, request, **kwargs):
+    status, content_type, body = fixture_response(request)
+    resp = requests.Response()
+    resp.status_code = status
+    resp.reason = "OK" if status == 200 else "Not Found"
+    resp.url = request.url
+    resp.request = request
+    resp.headers["Content-Type"] = content_type
+    resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+    resp._content = body if request.method != "HEAD" else b""
+    return resp
+
+
+def _scrape(name: str) -> list:
+    if name == "tbank":
+        from tbank_parser import TBankParser
+
+        return TBankParser(rate_per_host=0).scrape_all()
+    if name == "vk":
+        from vk_parser import VKParser
+
+        return VKParser().scrape_all()
+    if name == "nastachku":
+        from nastachku_parser import scrape_nastachku
+
+        return scrape_nastachku()
+    if name == "podlodka":
+        from podlodka_parser import scrape_podlodka_crew
+
+        return scrape_podlodka_crew()
+    from internships_parser import fetch_internships
+
+    return fetch_internships()
+
+
+def main() -> None:
+    HTTPAdapter.send = _fake_send
+    for name in ("tbank", "vk", "nastachku", "podlodka", "internships"):
+        path = str(RECORDINGS_DIR / f"{name}.jsonl.gz")
+        os.environ[replay.RECORD_ENV] = path
+        items = _scrape(name)
+        replay._writers.pop(path).close()
+        print(json.dumps({"parser": name, "items": len(items), "archive": path}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
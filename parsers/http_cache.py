@@ -0,0 +1,217 @@
+"""
+Общий HTTP-кэш парсеров на диске (SQLite).
+
+Для GET-ответов хранит ETag/Last-Modified, sha256 тела и само тело (zstd; zlib,
+если zstandard не установлен). Повторный запрос уходит условным
+(If-None-Match / If-Modified-Since); на 304 тело отдаётся из кэша как обычный
+200-ответ с ``resp.from_cache = True``. При превышении лимита размера удаляются
+давно не использованные записи (LRU).
+
+Путь задаётся PARSERS_HTTP_CACHE (по умолчанию <repo>/parsers/cache/http_cache.sqlite3),
+значение "off" отключает кэш; лимит — PARSERS_HTTP_CACHE_MAX_MB (по умолчанию 256).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+import requests
+from requests.adapters import HTTPAdapter
+from sentry_service import get_service_logger
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # type: ignore
+
+DEFAULT_MAX_MB = 256
+# Заголовки, которые переносим из сохранённого ответа в ответ, собранный из 304.
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Content-Language")
+
+logger = get_service_logger("http_cache")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body_sha256 TEXT NOT NULL,
+    codec TEXT NOT NULL,
+    body BLOB NOT NULL,
+    headers TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed_at ON responses (accessed_at);
+"""
+
+
+def _compress(body: bytes) -> tuple:
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=6).compress(body)
+    return "zlib", zlib.compress(body, 6)
+
+
+def _decompress(codec: str, blob: bytes) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("zstandard is required to read this cache entry")
+        return zstandard.ZstdDecompressor().decompress(blob)
+    return zlib.decompress(blob)
+
+
+class HTTPCache:
+    """SQLite-хранилище ответов; безопасно для использования из нескольких потоков."""
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # timeout — несколько парсеров могут писать в один файл одновременно.
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, url: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body_sha256, codec, body, headers FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, body_sha256, codec, blob, headers = row
+        try:
+            body = _decompress(codec, blob)
+        except Exception:
+            logger.warning("Dropping unreadable cache entry url=%s codec=%s", url, codec)
+            self.delete(url)
+            return None
+        return {
+            "etag": etag,
+            "last_modified": last_modified,
+            "body_sha256": body_sha256,
+            "body": body,
+            "headers": json.loads(headers),
+        }
+
+    def touch(self, url: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url))
+
+    def delete(self, url: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+
+    def put(self, url: str, resp: requests.Response, body_sha256: str) -> None:
+        codec, blob = _compress(resp.content)
+        headers = {name: resp.headers[name] for name in STORED_HEADERS if name in resp.headers}
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(url, etag, last_modified, body_sha256, codec, body, headers, size, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    resp.headers.get("ETag"),
+                    resp.headers.get("Last-Modified"),
+                    body_sha256,
+                    codec,
+                    blob,
+                    json.dumps(headers),
+                    len(blob),
+                    time.time(),
+                ),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        stale = []
+        for url, size in self._conn.execute("SELECT url, size FROM responses ORDER BY accessed_at"):
+            stale.append((url,))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE url = ?", stale)
+
+
+class CachingAdapter(HTTPAdapter):
+    """HTTPAdapter, делающий GET-запросы условными и отвечающий на 304 телом из HTTPCache."""
+
+    def __init__(self, cache: HTTPCache, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, **kwargs) -> requests.Response:
+        if request.method != "GET" or stream:
+            return super().send(request, stream=stream, **kwargs)
+
+        url = request.url or ""
+        cached = self.cache.get(url)
+        if cached:
+            if cached["etag"]:
+                request.headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                request.headers["If-Modified-Since"] = cached["last_modified"]
+
+        resp = super().send(request, stream=stream, **kwargs)
+        resp.from_cache = False
+
+        if resp.status_code == 304 and cached:
+            _ = resp.content  # дочитываем пустое тело 304, чтобы соединение вернулось в пул
+            resp.status_code = 200
+            resp.reason = "OK"
+            resp.headers.update(cached["headers"])
+            resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+            resp._content = cached["body"]
+            resp.from_cache = True
+            self.cache.touch(url)
+            return resp
+
+        if resp.status_code == 200 and ("ETag" in resp.headers or "Last-Modified" in resp.headers):
+            body_sha256 = hashlib.sha256(resp.content).hexdigest()
+            if cached and cached["body_sha256"] == body_sha256 and cached["etag"] == resp.headers.get("ETag"):
+                # Сервер не поддерживает 304, но тело не изменилось — перезаписывать нечего.
+                self.cache.touch(url)
+            else:
+                self.cache.put(url, resp, body_sha256)
+        elif cached and resp.status_code in (404, 410):
+            self.cache.delete(url)
+        return resp
+
+
+def default_cache_path() -> str | None:
+    path = os.getenv("PARSERS_HTTP_CACHE")
+    if path and path.lower() == "off":
+        return None
+    return path or os.path.join(os.path.dirname(__file__), "cache", "http_cache.sqlite3")
+
+
+def install_http_cache(session: requests.Session, path: str | None = None, **adapter_kwargs) -> requests.Session:
+    """
+    Монтирует на http(s) сессии CachingAdapter; adapter_kwargs передаются в HTTPAdapter
+    (pool_connections, pool_maxsize, ...). Если кэш отключён или файл недоступен,
+    монтируется обычный HTTPAdapter с теми же параметрами.
+    """
+    path = path or default_cache_path()
+    cache: HTTPCache | None = None
+    if path:
+        max_mb = float(os.getenv("PARSERS_HTTP_CACHE_MAX_MB") or DEFAULT_MAX_MB)
+        try:
+            cache = HTTPCache(path, max_bytes=int(max_mb * 1024 * 1024))
+        except Exception:
+            logger.exception("HTTP cache disabled: cannot open %s", path)
+    adapter = CachingAdapter(cache, **adapter_kwargs) if cache else HTTPAdapter(**adapter_kwargs)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
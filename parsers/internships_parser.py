@@ -1,135 +1,189 @@
-# -*- coding: utf-8 -*-
 """
 Парсер стажировок с https://it.fut.ru/internship.
 Источник: публичное API Fut.ru (CMS).
-Заполняет поля:
-- title
-- company
-- description (текст без HTML, формируем из description/text)
-- url (каноническая ссылка)
-- type = "internship"
-- vacancy_created_at (published_at в UTC, если есть)
-- created_at (текущее UTC)
-- deadline_at (если есть явный дедлайн; иначе None)
+Заполняет поля:
+- title
+- company
+- description (текст без HTML, формируем из description/text)
+- url (каноническая ссылка)
+- type = "internship"
+- vacancy_created_at (published_at в UTC, если есть)
+- created_at (текущее UTC)
+- deadline_at (если есть явный дедлайн; иначе None)
 - contact_info / contact_info_encrypted отсутствуют в источнике -> None
 """
 
 import argparse
 import json
+import os
 import sys
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
-
-import requests
 
+from scraping_runtime import ScrapingRuntime
 from sentry_service import get_service_logger, init_sentry
 
 BASE_LIST_URL = "https://it.fut.ru/api/cms/api/publications"
 SITE_BASE = "https://it.fut.ru"
 
+PAGE_CONCURRENCY = 4
+MAX_PAGES = 50
+# Водяной знак — самый свежий vacancy_created_at этого источника в базе; его передаёт
+# раннер, поэтому знак сдвигается только вместе с сохранёнными публикациями.
+WATERMARK_ENV = "PARSER_WATERMARK"
+# Запас на публикации, задним числом появившиеся в API; повторы отсеет дедупликация раннера.
+WATERMARK_OVERLAP = timedelta(days=1)
+
 logger = get_service_logger("internships_parser")
 
 
-def _parse_dt(val: Optional[str]) -> Optional[str]:
+def _parse_dt(val: str | None) -> str | None:
     if not val:
         return None
     try:
-        # API возвращает строки вроде "2023-12-31 05:12" или ISO с Z
-        if "T" in val:
-            return datetime.fromisoformat(val.replace("Z", "+00:00")).astimezone(timezone.utc).isoformat()
-        dt = datetime.strptime(val, "%Y-%m-%d %H:%M")
-        return dt.replace(tzinfo=timezone.utc).isoformat()
-    except Exception:
-        return None
-
-
-def _extract_text(blocks: Optional[Dict]) -> str:
-    """
-    Разворачиваем editor.js структуру (blocks) в плоский текст.
-    """
-    if not isinstance(blocks, dict):
-        return ""
-    out: List[str] = []
-    for blk in blocks.get("blocks", []):
-        data = blk.get("data", {}) if isinstance(blk, dict) else {}
-        txt = data.get("text") or data.get("title") or data.get("items")
-        if isinstance(txt, list):
-            out.append("\n".join(str(x) for x in txt if x))
-        elif txt:
-            out.append(str(txt))
-    return "\n".join([t.replace("\xa0", " ") for t in out if t]).strip()
-
-
-def fetch_internships(limit: int = 100, direction: str = "it") -> List[Dict]:
+        # API возвращает строки вроде "2023-12-31 05:12" или ISO с Z
+        if "T" in val:
+            return datetime.fromisoformat(val.replace("Z", "+00:00")).astimezone(timezone.utc).isoformat()
+        dt = datetime.strptime(val, "%Y-%m-%d %H:%M")
+        return dt.replace(tzinfo=timezone.utc).isoformat()
+    except Exception:
+        return None
+
+
+def _as_datetime(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _parse_watermark(value: str) -> datetime:
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _extract_text(blocks: dict | None) -> str:
     """
-    Получаем стажировки из публичного API.
-    direction='it' — ограничиваем IT-направлением (поле direction).
+    Разворачиваем editor.js структуру (blocks) в плоский текст.
     """
-    params = {
+    if not isinstance(blocks, dict):
+        return ""
+    out: list[str] = []
+    for blk in blocks.get("blocks", []):
+        data = blk.get("data", {}) if isinstance(blk, dict) else {}
+        txt = data.get("text") or data.get("title") or data.get("items")
+        if isinstance(txt, list):
+            out.append("\n".join(str(x) for x in txt if x))
+        elif txt:
+            out.append(str(txt))
+    return "\n".join([t.replace("\xa0", " ") for t in out if t]).strip()
+
+
+def _to_record(item: dict, now_iso: str) -> dict | None:
+    title = item.get("title") or ""
+    company = ""
+    comp = item.get("company") or {}
+    if isinstance(comp, dict):
+        company = comp.get("caption") or comp.get("alias") or ""
+
+    description_parts: list[str] = []
+    if item.get("description"):
+        description_parts.append(str(item.get("description")))
+    if item.get("text"):
+        description_parts.append(_extract_text(item.get("text")))
+    if comp and isinstance(comp, dict) and comp.get("description"):
+        description_parts.append(_extract_text(comp.get("description")))
+    description = "\n".join([p.strip() for p in description_parts if p]).strip()
+    description = description or title
+
+    alias = item.get("alias") or item.get("uuid") or ""
+    if not alias:
+        logger.warning("Skipping internship without alias/uuid: title=%s", title)
+        return None
+    url = f"{SITE_BASE}/{alias.lstrip('/')}"
+
+    vacancy_created_at = _parse_dt(item.get("published_at"))
+    deadline_at = _parse_dt(item.get("unpublished_at"))
+
+    return {
+        "title": title,
+        "company": company,
+        "description": description,
+        "url": url,
         "type": "internship",
-        "offset": 0,
-        "limit": limit,
-        "direction": direction,
+        "vacancy_created_at": vacancy_created_at,
+        "created_at": now_iso,
+        "deadline_at": deadline_at,
+        "contact_info": None,
+        "contact_info_encrypted": None,
     }
-    try:
-        resp = requests.get(BASE_LIST_URL, params=params, timeout=20)
-        resp.raise_for_status()
-        data = resp.json()
-    except Exception:
-        logger.exception("Failed to fetch internships list from %s with params=%s", BASE_LIST_URL, params)
-        raise
-    items = data.get("data", [])
 
-    results: List[Dict] = []
+
+def _page_items(data: dict, offset: int) -> list[dict]:
+    return data.get("data", []) if isinstance(data, dict) else []
+
+
+def fetch_internships(
+    limit: int = 100,
+    direction: str = "it",
+    since: datetime | None = None,
+    concurrency: int = PAGE_CONCURRENCY,
+    max_pages: int = MAX_PAGES,
+) -> list[dict]:
+    """
+    Получаем стажировки из публичного API постранично (offset/limit), по concurrency
+    страниц параллельно. direction='it' — ограничиваем IT-направлением (поле direction).
+    since — водяной знак: публикации старше него пропускаются. Порядок выдачи API
+    не гарантирован, поэтому обход останавливается, только когда вся страница целиком
+    старше since; публикация без даты продолжает обход.
+    """
+    results: list[dict] = []
+    seen: set[str] = set()
     now_iso = datetime.now(timezone.utc).isoformat()
 
-    for item in items:
-        title = item.get("title") or ""
-        company = ""
-        comp = item.get("company") or {}
-        if isinstance(comp, dict):
-            company = comp.get("caption") or comp.get("alias") or ""
-
-        description_parts: List[str] = []
-        if item.get("description"):
-            description_parts.append(str(item.get("description")))
-        if item.get("text"):
-            description_parts.append(_extract_text(item.get("text")))
-        if comp and isinstance(comp, dict) and comp.get("description"):
-            description_parts.append(_extract_text(comp.get("description")))
-        description = "\n".join([p.strip() for p in description_parts if p]).strip()
-        description = description or title
-
-        alias = item.get("alias") or item.get("uuid") or ""
-        if not alias:
-            logger.warning("Skipping internship without alias/uuid: title=%s", title)
-            continue
-        url = f"{SITE_BASE}/{alias.lstrip('/')}"
-
-        vacancy_created_at = _parse_dt(item.get("published_at"))
-        deadline_at = _parse_dt(item.get("unpublished_at"))
-
-        results.append(
-            {
-                "title": title,
-                "company": company,
-                "description": description,
-                "url": url,
-                "type": "internship",
-                "vacancy_created_at": vacancy_created_at,
-                "created_at": now_iso,
-                "deadline_at": deadline_at,
-                "contact_info": None,
-                "contact_info_encrypted": None,
-            }
-        )
-
+    def fetch_page(offset: int) -> dict:
+        params = {"type": "internship", "offset": offset, "limit": limit, "direction": direction}
+        return runtime.get_json(BASE_LIST_URL, params=params)
+
+    with ScrapingRuntime("internships_parser", timeout=20, io_workers=concurrency, parse_workers=0) as runtime:
+        page = 0
+        done = False
+        while not done and page < max_pages:
+            offsets = [(page + i) * limit for i in range(min(concurrency, max_pages - page))]
+            pages = runtime.pipeline(offsets, fetch_page, _page_items)
+            page += len(offsets)
+
+            for offset, items in zip(offsets, pages, strict=True):
+                if items is None:
+                    # Пропуск страницы оставил бы дыру, а водяной знак всё равно сдвинулся бы.
+                    raise RuntimeError(f"Failed to fetch internships page offset={offset}")
+                older = 0
+                for item in items:
+                    record = _to_record(item, now_iso)
+                    published_at = _as_datetime(record["vacancy_created_at"]) if record else None
+                    if since and published_at and published_at < since:
+                        older += 1
+                        continue
+                    if not record or record["url"] in seen:
+                        continue
+                    results.append(record)
+                    seen.add(record["url"])
+
+                if len(items) < limit:
+                    done = True
+                    break
+                if since and older == len(items):
+                    logger.info("Reached watermark %s at offset=%s, stop paging", since.isoformat(), offset)
+                    done = True
+                    break
+
     return results
 
 
-def save_to_file(path: str = "internships.json", limit: int = 100, direction: str = "it") -> str:
-    data = fetch_internships(limit=limit, direction=direction)
+def save_to_file(
+    path: str = "internships.json",
+    limit: int = 100,
+    direction: str = "it",
+    data: list[dict] | None = None,
+) -> str:
+    data = data if data is not None else fetch_internships(limit=limit, direction=direction)
     out_path = Path(path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
     with out_path.open("w", encoding="utf-8") as f:
@@ -150,17 +204,35 @@ def main() -> None:
     )
     argp.add_argument("--limit", type=int, default=100, help="Limit publications per request")
     argp.add_argument("--direction", default="it", help="Direction filter (e.g. 'it')")
+    argp.add_argument("--concurrency", type=int, default=PAGE_CONCURRENCY, help="Pages fetched in parallel")
+    argp.add_argument("--max-pages", type=int, default=MAX_PAGES, help="Upper bound on pages per run")
+    argp.add_argument(
+        "--since",
+        type=_parse_watermark,
+        default=os.getenv(WATERMARK_ENV) or None,
+        help=f"Skip publications older than this ISO datetime (default: ${WATERMARK_ENV})",
+    )
+    argp.add_argument("--full", action="store_true", help="Ignore the watermark and fetch everything")
     args = argp.parse_args()
 
-    data = fetch_internships(limit=args.limit, direction=args.direction)
+    watermark = None if args.full else args.since
+    since = watermark - WATERMARK_OVERLAP if watermark else None
+    data = fetch_internships(
+        limit=args.limit,
+        direction=args.direction,
+        since=since,
+        concurrency=args.concurrency,
+        max_pages=args.max_pages,
+    )
 
     if args.output in ("-", "/dev/stdout"):
         json.dump(data, sys.stdout, ensure_ascii=False)
+        sys.stdout.flush()
     else:
-        output_path = save_to_file(args.output, limit=args.limit, direction=args.direction)
+        output_path = save_to_file(args.output, data=data)
         print(output_path)
 
 
 if __name__ == "__main__":
     main()
-
+
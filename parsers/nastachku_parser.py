@@ -9,6 +9,7 @@ from typing import Dict, List, Optional, Set
 import requests
 from bs4 import BeautifulSoup, Tag
 
+from scraping_runtime import ScrapingRuntime
 from sentry_service import get_service_logger, init_sentry
 
 BASE_URL = "https://nastachku.ru/"
@@ -134,30 +135,10 @@ def _parse_cards(soup: BeautifulSoup) -> List[Dict]:
     return results
 
 
-def _get_html(url: str, session: requests.Session, timeout: float) -> str:
-    try:
-        resp = session.get(url, timeout=timeout)
-        if not resp.encoding or resp.encoding.lower() == "iso-8859-1":
-            resp.encoding = resp.apparent_encoding or "utf-8"
-        resp.raise_for_status()
-        return resp.text
-    except Exception:
-        logger.exception("Failed to GET %s", url)
-        raise
-
-
 def scrape_nastachku(session: Optional[requests.Session] = None, timeout: float = 15.0) -> List[Dict]:
-    session = session or requests.Session()
-    session.headers.update(
-        {
-            "User-Agent": (
-                "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
-                "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
-            ),
-            "Accept-Language": "ru,en;q=0.9",
-        }
-    )
-    html = _get_html(BASE_URL, session=session, timeout=timeout)
+    # Одна страница: разбираем в текущем процессе, пул процессов не нужен.
+    with ScrapingRuntime("nastachku_parser", session=session, timeout=timeout, parse_workers=0) as runtime:
+        html = runtime.get_html(BASE_URL)
     soup = BeautifulSoup(html, "html.parser")
     items = _parse_cards(soup)
     if not items:
@@ -202,4 +183,4 @@ def main() -> None:
 
 if __name__ == "__main__":
     main()
-
+
@@ -8,6 +8,7 @@ from typing import Dict, List, Optional
 import requests
 from bs4 import BeautifulSoup
 
+from scraping_runtime import ScrapingRuntime
 from sentry_service import get_service_logger, init_sentry
 
 BASE_URL = "https://podlodka.io/crew"
@@ -97,31 +98,11 @@ def _parse_conference_rows(soup: BeautifulSoup) -> List[Dict]:
     return results
 
 
-def _get_html(url: str, session: requests.Session, timeout: float) -> str:
-    try:
-        resp = session.get(url, timeout=timeout)
-        if not resp.encoding or resp.encoding.lower() == "iso-8859-1":
-            resp.encoding = resp.apparent_encoding or "utf-8"
-        resp.raise_for_status()
-        return resp.text
-    except Exception:
-        logger.exception("Failed to GET %s", url)
-        raise
-
-
 def scrape_podlodka_crew(session: Optional[requests.Session] = None, timeout: float = 15.0) -> List[Dict]:
     """Скрейпить страницу Podlodka Crew и вернуть список конференций."""
-    session = session or requests.Session()
-    session.headers.update(
-        {
-            "User-Agent": (
-                "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
-                "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
-            ),
-            "Accept-Language": "ru,en;q=0.9",
-        }
-    )
-    html = _get_html(BASE_URL, session=session, timeout=timeout)
+    # Одна страница: разбираем в текущем процессе, пул процессов не нужен.
+    with ScrapingRuntime("podlodka_parser", session=session, timeout=timeout, parse_workers=0) as runtime:
+        html = runtime.get_html(BASE_URL)
     soup = BeautifulSoup(html, "html.parser")
     return _parse_conference_rows(soup)
 
@@ -163,4 +144,4 @@ def main() -> None:
 
 if __name__ == "__main__":
     main()
-
+
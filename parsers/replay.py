@@ -0,0 +1,172 @@
+"""
+Запись и воспроизведение HTTP-трафика парсеров.
+
+Архив — gzip с JSON-строками: запрос (метод, URL, sha1 тела) и ответ (статус,
+заголовки, тело в base64). ScrapingRuntime подключает адаптер по переменным окружения:
+
+- PARSERS_HTTP_RECORD=<archive>  — ходить в сеть и записывать все ответы в архив;
+- PARSERS_HTTP_REPLAY=<archive>  — отвечать только из архива, без сети; запрос,
+  которого нет в архиве, получает 404 и считается промахом;
+- PARSERS_HTTP_REPLAY_LATENCY_MS — искусственная задержка ответа при воспроизведении;
+- PARSERS_HTTP_REPLAY_STATS=<json> — куда при выходе записать {"requests", "misses"}.
+
+HTTP-кэш при записи и воспроизведении не используется, чтобы в архив попадали
+полные ответы, а бенчмарк не зависел от состояния кэша.
+"""
+
+import atexit
+import base64
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+RECORD_ENV = "PARSERS_HTTP_RECORD"
+REPLAY_ENV = "PARSERS_HTTP_REPLAY"
+LATENCY_ENV = "PARSERS_HTTP_REPLAY_LATENCY_MS"
+STATS_ENV = "PARSERS_HTTP_REPLAY_STATS"
+
+# Тело хранится уже распакованным, поэтому заголовки транспорта не сохраняем.
+SKIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+
+def request_key(method: str, url: str, body: bytes | str | None) -> str:
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    return f"{method.upper()} {url} {hashlib.sha1(body or b'').hexdigest()}"
+
+
+class ArchiveWriter:
+    def __init__(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def add(self, request: requests.PreparedRequest, resp: requests.Response) -> None:
+        entry = {
+            "key": request_key(request.method or "GET", request.url or "", request.body),
+            "status": resp.status_code,
+            "reason": resp.reason,
+            "headers": {k: v for k, v in resp.headers.items() if k.lower() not in SKIPPED_HEADERS},
+            "body": base64.b64encode(resp.content).decode("ascii"),
+        }
+        with self._lock:
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class ArchiveReader:
+    """Ответы по ключу запроса; повторные запросы получают записанные ответы по очереди, последний — повторяется."""
+
+    def __init__(self, path: str) -> None:
+        self._entries: dict[str, deque[dict]] = defaultdict(deque)
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                self._entries[entry["key"]].append(entry)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.misses = 0
+
+    def take(self, key: str) -> dict | None:
+        with self._lock:
+            self.requests += 1
+            queue = self._entries.get(key)
+            if not queue:
+                self.misses += 1
+                return None
+            return queue.popleft() if len(queue) > 1 else queue[0]
+
+
+class RecordingAdapter(HTTPAdapter):
+    def __init__(self, writer: ArchiveWriter, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.writer = writer
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        resp = super().send(request, **kwargs)
+        self.writer.add(request, resp)
+        return resp
+
+
+class ReplayAdapter(HTTPAdapter):
+    def __init__(self, reader: ArchiveReader, latency: float = 0.0, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.reader = reader
+        self.latency = latency
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if self.latency:
+            time.sleep(self.latency)
+        entry = self.reader.take(request_key(request.method or "GET", request.url or "", request.body))
+
+        resp = requests.Response()
+        resp.request = request
+        resp.url = request.url or ""
+        resp.connection = self
+        if entry is None:
+            resp.status_code, resp.reason, resp._content = 404, "Not Recorded", b""
+        else:
+            resp.status_code = entry["status"]
+            resp.reason = entry["reason"]
+            resp.headers = CaseInsensitiveDict(entry["headers"])
+            resp._content = base64.b64decode(entry["body"])
+        resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+        resp._content_consumed = True
+        return resp
+
+
+# Один архив на процесс, даже если парсер создаёт несколько сессий.
+_writers: dict[str, ArchiveWriter] = {}
+_readers: dict[str, ArchiveReader] = {}
+_archives_lock = threading.Lock()
+
+
+def _dump_stats(reader: ArchiveReader, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"requests": reader.requests, "misses": reader.misses}, f)
+
+
+def _get_reader(path: str) -> ArchiveReader:
+    with _archives_lock:
+        if path not in _readers:
+            _readers[path] = ArchiveReader(path)
+            stats_path = os.getenv(STATS_ENV)
+            if stats_path:
+                atexit.register(_dump_stats, _readers[path], stats_path)
+        return _readers[path]
+
+
+def _get_writer(path: str) -> ArchiveWriter:
+    with _archives_lock:
+        if path not in _writers:
+            _writers[path] = ArchiveWriter(path)
+        return _writers[path]
+
+
+def install_from_env(session: requests.Session, **adapter_kwargs) -> bool:
+    """Монтирует адаптер записи/воспроизведения, если он включён окружением; иначе False."""
+    replay_path = os.getenv(REPLAY_ENV)
+    record_path = os.getenv(RECORD_ENV)
+    if replay_path:
+        latency = float(os.getenv(LATENCY_ENV) or 0) / 1000
+        adapter: HTTPAdapter = ReplayAdapter(_get_reader(replay_path), latency=latency, **adapter_kwargs)
+    elif record_path:
+        adapter = RecordingAdapter(_get_writer(record_path), **adapter_kwargs)
+    else:
+        return False
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return True
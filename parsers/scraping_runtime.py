@@ -0,0 +1,267 @@
+"""
+Общий рантайм для парсеров: сессия, лимиты, повторы и конвейер загрузки/разбора.
+
+- пул keep-alive соединений (requests.Session + HTTPAdapter, через http_cache);
+  переменные PARSERS_HTTP_RECORD/PARSERS_HTTP_REPLAY вместо кэша включают запись
+  или воспроизведение трафика (replay.py);
+- token bucket на каждый хост (RATE_PER_HOST запросов/с) плюс лимит одновременных
+  запросов MAX_PER_HOST;
+- повтор сетевых ошибок, 429 и 5xx с экспоненциальной паузой со случайным разбросом;
+- pipeline(): потоки качают страницы, а разбор BeautifulSoup уходит в пул процессов,
+  поэтому тяжёлый разбор не тормозит очередь загрузки.
+"""
+
+import multiprocessing
+import os
+import random
+import threading
+import time
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from http_cache import install_http_cache
+from replay import install_from_env as install_replay
+from sentry_service import get_service_logger, parse_worker_initializer
+
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None  # type: ignore
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "ru,en;q=0.9",
+}
+
+IO_WORKERS = 8
+PARSE_WORKERS = min(os.cpu_count() or 1, 4)
+MAX_PER_HOST = 4
+RATE_PER_HOST = 10.0
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Целые страницы разбираем lxml (C), если он установлен; иначе встроенным html.parser.
+PAGE_FEATURES = "lxml" if lxml_html is not None else "html.parser"
+
+_PARAGRAPHS = SoupStrainer("p")
+
+
+def html_to_text(html: str) -> str:
+    """Текст абзацев <p> через пустую строку; если абзацев нет — весь текст фрагмента."""
+    # Сначала строим дерево только из <p>; полный разбор нужен, лишь если абзацев нет.
+    soup = BeautifulSoup(html or "", "html.parser", parse_only=_PARAGRAPHS)
+    parts = []
+    for p in soup.find_all("p"):
+        text = p.get_text(" ", strip=True)
+        if text:
+            parts.append(text)
+    if not parts:
+        text = BeautifulSoup(html or "", "html.parser").get_text(" ", strip=True)
+        if text:
+            parts.append(text)
+    return "\n\n".join(parts)
+
+
+def lxml_fragment(element) -> Tag:
+    """Переносит найденный через lxml узел в BeautifulSoup, чтобы извлекать текст тем же кодом."""
+    markup = lxml_html.tostring(element, encoding="unicode", with_tail=False)
+    return BeautifulSoup(markup, "html.parser").find()
+
+
+class TokenBucket:
+    """Потокобезопасный token bucket: rate токенов в секунду, не больше burst в запасе."""
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def _parse_pool_context() -> multiprocessing.context.BaseContext:
+    """forkserver, где он есть (Linux/macOS); иначе spawn."""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+class ScrapingRuntime:
+    """
+    Сессия и пулы одного запуска парсера. Используется как контекстный менеджер,
+    чтобы пул процессов разбора гарантированно завершился.
+    """
+
+    def __init__(
+        self,
+        service_name: str,
+        session: requests.Session | None = None,
+        timeout: float = 15.0,
+        io_workers: int = IO_WORKERS,
+        parse_workers: int = PARSE_WORKERS,
+        max_per_host: int = MAX_PER_HOST,
+        rate_per_host: float = RATE_PER_HOST,
+        retries: int = RETRY_ATTEMPTS,
+        backoff: float = RETRY_BACKOFF,
+    ) -> None:
+        self.logger = get_service_logger(service_name)
+        self.io_workers = max(io_workers, 1)
+        # 0 — разбирать прямо в потоке загрузки (для парсеров с одной страницей).
+        self.parse_workers = max(parse_workers, 0)
+        self.max_per_host = max(max_per_host, 1)
+        self.rate_per_host = rate_per_host
+        self.retries = max(retries, 1)
+        self.backoff = backoff
+        self.timeout = timeout
+        if session is None:
+            session = requests.Session()
+            # Пул соединений должен вмещать все потоки, иначе urllib3 закрывает лишние.
+            pool = {"pool_connections": self.max_per_host, "pool_maxsize": self.io_workers}
+            if install_replay(session, **pool):
+                # Ответы из архива: беречь сайт не от чего, лимит исказил бы бенчмарк.
+                self.rate_per_host = 0
+            else:
+                install_http_cache(session, **pool)
+        self.session = session
+        self.session.headers.update(DEFAULT_HEADERS)
+        self._host_slots: dict[str, threading.BoundedSemaphore] = {}
+        self._host_buckets: dict[str, TokenBucket] = {}
+        self._hosts_lock = threading.Lock()
+        # Пул создаётся до запуска потоков загрузки, а его процессы стартуют через
+        # forkserver: fork из процесса с живыми потоками может унаследовать чужие
+        # захваченные блокировки (логгинг, urllib3) и зависнуть.
+        self._parse_pool: ProcessPoolExecutor | None = None
+        if self.parse_workers:
+            self._parse_pool = ProcessPoolExecutor(
+                max_workers=self.parse_workers,
+                mp_context=_parse_pool_context(),
+                initializer=parse_worker_initializer(service_name),
+            )
+
+    def __enter__(self) -> "ScrapingRuntime":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown()
+            self._parse_pool = None
+
+    @contextmanager
+    def _host_slot(self, url: str) -> Iterator[None]:
+        host = urlsplit(url).netloc
+        with self._hosts_lock:
+            slot = self._host_slots.setdefault(host, threading.BoundedSemaphore(self.max_per_host))
+            bucket = self._host_buckets.setdefault(host, TokenBucket(self.rate_per_host, self.rate_per_host))
+        bucket.acquire()
+        with slot:
+            yield
+
+    def _retry_delay(self, attempt: int, resp: requests.Response | None = None) -> float:
+        retry_after = resp.headers.get("Retry-After") if resp is not None else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff * (2**attempt) * random.uniform(0.5, 1.5)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """HTTP-запрос с лимитами на хост и повтором при сетевых сбоях/429/5xx."""
+        kwargs.setdefault("timeout", self.timeout)
+        for attempt in range(self.retries):
+            last_attempt = attempt == self.retries - 1
+            resp = None
+            try:
+                with self._host_slot(url):
+                    resp = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if last_attempt:
+                    raise
+                self.logger.warning("Retrying %s %s after network error (attempt %s)", method, url, attempt + 1)
+            else:
+                if resp.status_code not in RETRY_STATUSES or last_attempt:
+                    return resp
+                self.logger.warning(
+                    "Retrying %s %s after status=%s (attempt %s)", method, url, resp.status_code, attempt + 1
+                )
+            time.sleep(self._retry_delay(attempt, resp))
+        raise AssertionError("unreachable")
+
+    def get_html(self, url: str, params: dict | None = None) -> str:
+        try:
+            resp = self.request("GET", url, params=params)
+            # Уточняем кодировку, чтобы не получить кракозябры в описании.
+            if not resp.encoding or resp.encoding.lower() == "iso-8859-1":
+                resp.encoding = resp.apparent_encoding or "utf-8"
+            resp.raise_for_status()
+            return resp.text
+        except Exception:
+            self.logger.exception("Failed to GET %s params=%s", url, params)
+            raise
+
+    def get_json(self, url: str, params: dict | None = None) -> Any:
+        try:
+            resp = self.request("GET", url, params=params)
+            resp.raise_for_status()
+            return resp.json()
+        except Exception:
+            self.logger.exception("Failed to GET %s params=%s", url, params)
+            raise
+
+    def pipeline(
+        self,
+        items: Sequence[Any],
+        fetch: Callable[[Any], Any],
+        parse: Callable[[Any, Any], Any],
+    ) -> list[Any]:
+        """
+        fetch(item) выполняется в потоках загрузки, parse(payload, item) — в пуле процессов
+        сразу по готовности payload. parse должна быть функцией уровня модуля (pickle).
+        Возвращает результаты в порядке items; fetch, вернувший None, и ошибки дают None.
+        """
+        parse_pool = self._parse_pool
+
+        def fetch_and_submit(item: Any) -> Any:
+            payload = fetch(item)
+            if payload is None:
+                return None
+            if parse_pool is None:
+                return parse(payload, item)
+            return parse_pool.submit(parse, payload, item)
+
+        results: list[Any] = []
+        with ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="scrape-io") as io_pool:
+            futures = [io_pool.submit(fetch_and_submit, item) for item in items]
+            for item, future in zip(items, futures, strict=True):
+                try:
+                    result = future.result()
+                    if isinstance(result, Future):
+                        result = result.result()
+                except Exception:
+                    self.logger.exception("Failed to scrape item=%s", item)
+                    result = None
+                results.append(result)
+        return results
@@ -1,7 +1,18 @@
 import atexit
+import copy
+import functools
+import glob
+import gzip
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import shutil
 import sys
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
 from typing import Optional, Set
 
 try:
@@ -13,6 +24,12 @@ except ImportError:
     LoggingIntegration = None  # type: ignore
     StdlibIntegration = None  # type: ignore
 
+DEFAULT_LOG_MAX_MB = 10
+DEFAULT_LOG_ROTATE_HOURS = 24
+DEFAULT_LOG_BACKUPS = 14
+
+_TEXT_FORMATTER = logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s")
+
 # Track which services have already been initialized to avoid double init.
 _sentry_initialized: Set[str] = set()
 # Track which services already configured file logging to avoid duplicate handlers.
@@ -25,17 +42,153 @@ _run_failed: Set[str] = set()
 _atexit_installed: Set[str] = set()
 
 
-def _ensure_file_logging(service_name: str) -> None:
+class _ParserQueueHandler(logging.handlers.QueueHandler):
     """
-    Configure a per-parser file handler so every run leaves a TXT log.
-    Log directory can be overridden via PARSERS_LOG_DIR env var,
-    defaults to <repo>/parsers/logs next to this file.
+    QueueHandler that only merges args and renders the traceback in the caller thread.
+    The stock prepare() formats the whole line up front; we leave that to the listener
+    and keep exc_text separate so the JSON formatter can emit it as its own field.
     """
-    global _log_initialized
 
-    if service_name in _log_initialized:
-        return
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _TEXT_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _JsonLinesFormatter(logging.Formatter):
+    """One JSON object per line; attributes passed via `extra=` are kept as fields."""
+
+    _reserved = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+    def __init__(self, service_name: str) -> None:
+        super().__init__()
+        self.service_name = service_name
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "service": self.service_name,
+            "message": record.getMessage(),
+            "process": record.process,
+            "thread": record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in self._reserved and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class SizeAndTimeRotatingFileHandler(logging.handlers.BaseRotatingHandler):
+    """
+    Rotate when the file exceeds max_bytes or is older than interval seconds.
+    Old segments are renamed to <file>.<timestamp>[.<n>] and gzipped; only the newest
+    backup_count segments are kept. Runs in the QueueListener thread, so compression
+    never blocks a scraper.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        max_bytes: int,
+        interval: float,
+        backup_count: int,
+        compress: bool = True,
+    ) -> None:
+        super().__init__(filename, "a", encoding="utf-8", delay=True)
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.backup_count = backup_count
+        self.compress = compress
+        # Parsers are short-lived processes and the file's mtime moves on every write,
+        # so the start of the current segment is kept in a hidden sidecar next to it.
+        log_dir, log_name = os.path.split(self.baseFilename)
+        self.start_path = os.path.join(log_dir, f".{log_name}.start")
+        self.rollover_at = self._segment_started() + interval
+
+    def _segment_started(self) -> float:
+        try:
+            if os.path.getsize(self.baseFilename):
+                with open(self.start_path, encoding="utf-8") as f:
+                    return float(f.read())
+        except (OSError, ValueError):
+            pass
+        # New or empty file, or a log written before the sidecar existed.
+        return self._start_segment()
+
+    def _start_segment(self) -> float:
+        started = time.time()
+        try:
+            with open(self.start_path, "w", encoding="utf-8") as f:
+                f.write(repr(started))
+        except OSError:
+            pass
+        return started
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if not os.path.exists(self.baseFilename) or os.path.getsize(self.baseFilename) == 0:
+            return False
+        if self.interval and time.time() >= self.rollover_at:
+            return True
+        if self.max_bytes:
+            if self.stream is None:
+                self.stream = self._open()
+            return self.stream.tell() + len(self.format(record)) + 1 >= self.max_bytes
+        return False
+
+    def _segment_name(self) -> str:
+        base = f"{self.baseFilename}.{time.strftime('%Y%m%d-%H%M%S')}"
+        name, counter = base, 0
+        while os.path.exists(name) or os.path.exists(f"{name}.gz"):
+            counter += 1
+            name = f"{base}.{counter}"
+        return name
+
+    def doRollover(self) -> None:
+        if self.stream:
+            self.stream.close()
+            self.stream = None  # type: ignore[assignment]
+        if os.path.exists(self.baseFilename):
+            segment = self._segment_name()
+            os.replace(self.baseFilename, segment)
+            if self.compress:
+                with open(segment, "rb") as src, gzip.open(f"{segment}.gz", "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                os.remove(segment)
+            self._delete_old_segments()
+        self.rollover_at = self._start_segment() + self.interval
+        self.stream = self._open()
+
+    def _delete_old_segments(self) -> None:
+        if self.backup_count <= 0:
+            return
+        segments = sorted(glob.glob(f"{glob.escape(self.baseFilename)}.*"), key=os.path.getmtime)
+        for path in segments[: -self.backup_count]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name) or default)
+    except ValueError:
+        return default
+
 
+def _log_target(service_name: str) -> tuple[str, logging.Formatter]:
+    """Path and formatter of the parser's log file."""
     log_dir = os.getenv("PARSERS_LOG_DIR") or os.path.join(os.path.dirname(__file__), "logs")
     try:
         os.makedirs(log_dir, exist_ok=True)
@@ -44,10 +197,71 @@ def _ensure_file_logging(service_name: str) -> None:
         log_dir = os.getcwd()
         os.makedirs(log_dir, exist_ok=True)
 
-    log_path = os.path.join(log_dir, f"{service_name}.txt")
-    handler = logging.FileHandler(log_path, encoding="utf-8")
+    json_lines = (os.getenv("PARSERS_LOG_FORMAT") or "text").strip().lower() == "json"
+    log_path = os.path.join(log_dir, f"{service_name}.{'jsonl' if json_lines else 'txt'}")
+    return log_path, _JsonLinesFormatter(service_name) if json_lines else _TEXT_FORMATTER
+
+
+def _attach_file_handler(service_name: str) -> None:
+    # Rotation belongs to the parent's handler alone: a worker rolling the file over
+    # would gzip and delete a segment the parent still writes to. WatchedFileHandler
+    # reopens the path once the parent has rotated it.
+    log_path, formatter = _log_target(service_name)
+    file_handler = logging.handlers.WatchedFileHandler(log_path, encoding="utf-8", delay=True)
+    file_handler.setLevel(logging.INFO)
+    file_handler.setFormatter(formatter)
+    root_logger = logging.getLogger()
+    if root_logger.level > logging.INFO or root_logger.level == logging.NOTSET:
+        root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(file_handler)
+
+
+def parse_worker_initializer(service_name: str) -> Callable[[], None] | None:
+    """
+    Initializer for the parser's process-pool workers. They start clean (forkserver),
+    have no listener thread and exit without atexit, so they append to the log file
+    directly and leave rotation to the parent.
+    None if file logging was not set up in this process.
+    """
+    if service_name not in _log_initialized:
+        return None
+    return functools.partial(_attach_file_handler, service_name)
+
+
+def _ensure_file_logging(service_name: str) -> None:
+    """
+    Configure per-parser file logging so every run leaves a log.
+
+    Records go through a QueueHandler on the root logger; a QueueListener thread
+    formats and writes them, so scraping threads never touch the disk.
+    Environment:
+    - PARSERS_LOG_DIR: log directory, defaults to <repo>/parsers/logs next to this file;
+    - PARSERS_LOG_FORMAT: "text" (<service>.txt, default) or "json" (<service>.jsonl);
+    - PARSERS_LOG_MAX_MB / PARSERS_LOG_ROTATE_HOURS: rotate by size (10) and age (24);
+    - PARSERS_LOG_BACKUPS: gzipped segments to keep (14).
+    """
+    global _log_initialized
+
+    if service_name in _log_initialized:
+        return
+
+    log_path, formatter = _log_target(service_name)
+    file_handler = SizeAndTimeRotatingFileHandler(
+        log_path,
+        max_bytes=int(_env_number("PARSERS_LOG_MAX_MB", DEFAULT_LOG_MAX_MB) * 1024 * 1024),
+        interval=_env_number("PARSERS_LOG_ROTATE_HOURS", DEFAULT_LOG_ROTATE_HOURS) * 3600,
+        backup_count=int(_env_number("PARSERS_LOG_BACKUPS", DEFAULT_LOG_BACKUPS)),
+    )
+    file_handler.setLevel(logging.INFO)
+    file_handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    handler = _ParserQueueHandler(log_queue)
     handler.setLevel(logging.INFO)
-    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    # Registered before init_sentry's success logger, so atexit (LIFO) flushes after it.
+    atexit.register(listener.stop)
 
     root_logger = logging.getLogger()
     # Ensure INFO and below are emitted (default WARNING would drop our messages).
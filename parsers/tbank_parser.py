@@ -3,19 +3,165 @@ import json
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Set
 from urllib.parse import urljoin
 
 import requests
-from bs4 import BeautifulSoup
-
-from sentry_service import get_service_logger, init_sentry
-
+from bs4 import BeautifulSoup, Tag
+from scraping_runtime import (
+    IO_WORKERS,
+    MAX_PER_HOST,
+    PARSE_WORKERS,
+    RATE_PER_HOST,
+    RETRY_ATTEMPTS,
+    RETRY_BACKOFF,
+    ScrapingRuntime,
+    html_to_text,
+    lxml_fragment,
+    lxml_html,
+)
+from sentry_service import init_sentry
 
 BASE_URL = "https://www.tbank.ru"
 LIST_PATH = "/career/vacancies/it/"
 API_LIST_PATH = "/pfpjobs/papi/getVacancies"
 
+CARDS_CLASS = "VacancyDescriptionView__cards-desktop_djsrvZ"
+CARD_CLASS = "Card__card_aZ3-+--E"
+HTML_BOX_CLASS = "atom-desktop-dangerously-html__box_aCYBaw"
+
+
+def _has_class(name: str) -> str:
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+# XPath-аналоги selector_candidates из _parse_detail_soup, в том же порядке приоритета.
+DESCRIPTION_XPATHS = [
+    '//*[contains(@data-qa-type, "vacancy-description")]',
+    '//*[contains(@data-qa-type, "VacancyDescription")]',
+    '//*[contains(@data-test, "vacancy-description")]',
+    '//section[contains(@data-qa-type, "description")]',
+    f"//*[{_has_class(CARDS_CLASS)}]//*[{_has_class(CARD_CLASS)}]//*[{_has_class(HTML_BOX_CLASS)}]",
+    f"//*[{_has_class(CARDS_CLASS)}]//*[{_has_class(HTML_BOX_CLASS)}]",
+]
+TITLE_XPATHS = [
+    "//h1",
+    '//*[substring(@data-qa-type, string-length(@data-qa-type) - 4) = "title"]',
+]
+
+
+def _container_text(desc_container: Tag) -> list[str]:
+    text_parts: list[str] = []
+    paragraphs = desc_container.select("p, li")
+    for p in paragraphs:
+        text = p.get_text(" ", strip=True)
+        if text:
+            text_parts.append(text)
+    if not text_parts:
+        fallback_text = desc_container.get_text(" ", strip=True)
+        if fallback_text:
+            text_parts.append(fallback_text)
+    return text_parts
+
+
+def _parse_detail_lxml(html: str) -> tuple[str | None, str] | None:
+    """
+    Быстрый путь: lxml находит заголовок и блок описания по XPath, а в BeautifulSoup
+    уходят только эти поддеревья. None — блока описания нет, нужен полный разбор
+    с обходом заголовков (_parse_detail_soup).
+    """
+    try:
+        tree = lxml_html.document_fromstring(html)
+    except (ValueError, lxml_html.etree.ParserError):
+        return None
+
+    container = next((found[0] for xpath in DESCRIPTION_XPATHS if (found := tree.xpath(xpath))), None)
+    if container is None:
+        return None
+    title_el = next((found[0] for xpath in TITLE_XPATHS if (found := tree.xpath(xpath))), None)
+    title = lxml_fragment(title_el).get_text(strip=True) if title_el is not None else None
+    return title, "\n\n".join(_container_text(lxml_fragment(container)))
+
+
+def _parse_detail_soup(html: str) -> tuple[str | None, str]:
+    soup = BeautifulSoup(html, "html.parser")
+
+    title_el = soup.select_one("h1") or soup.select_one('[data-qa-type$="title"]')
+    title = title_el.get_text(strip=True) if title_el else None
+
+    # Ищем описание, избегая захвата шапки.
+    desc_container = None
+    selector_candidates = [
+        '[data-qa-type*="vacancy-description"]',
+        '[data-qa-type*="VacancyDescription"]',
+        '[data-test*="vacancy-description"]',
+        'section[data-qa-type*="description"]',
+        '.VacancyDescriptionView__cards-desktop_djsrvZ .Card__card_aZ3-\\+--E .atom-desktop-dangerously-html__box_aCYBaw',
+        '.VacancyDescriptionView__cards-desktop_djsrvZ .atom-desktop-dangerously-html__box_aCYBaw',
+    ]
+    for selector in selector_candidates:
+        desc_container = soup.select_one(selector)
+        if desc_container:
+            break
+
+    heading_capture: list[str] = []
+    if not desc_container:
+        heading_tags = ["h2", "h3", "h4", "h5"]
+        keywords = ("опис", "ваканси")
+        for heading in soup.find_all(heading_tags):
+            heading_text = heading.get_text(" ", strip=True).lower()
+            if any(k in heading_text for k in keywords):
+                for node in heading.next_elements:
+                    if getattr(node, "name", None) in heading_tags:
+                        break
+                    if getattr(node, "name", None) in ["p", "li"]:
+                        text = node.get_text(" ", strip=True)
+                        if text:
+                            heading_capture.append(text)
+                    if getattr(node, "name", None) in ["div", "section", "article"]:
+                        block_text = node.get_text(" ", strip=True)
+                        if block_text:
+                            heading_capture.append(block_text)
+                break
+    if heading_capture and not desc_container:
+        description = "\n\n".join(heading_capture)
+    else:
+        description = ""
+
+    if not heading_capture:
+        if not desc_container:
+            desc_container = soup.select_one('div[data-test*="htmlTag"], div.atom-desktop-dangerously-html__box_aCYBaw')
+
+        text_parts = _container_text(desc_container) if desc_container else []
+        description = description or "\n\n".join(text_parts)
+
+    return title, description
+
+
+def parse_detail(html: str, url: str, fallback_title: str = "", fallback_desc_html: str = "") -> dict[str, str | None]:
+    """Разбирает детальную страницу вакансии; функция модуля, чтобы её можно было отдать в пул процессов."""
+    parsed = _parse_detail_lxml(html) if lxml_html is not None else None
+    title, description = parsed or _parse_detail_soup(html)
+    if title is None:
+        title = fallback_title
+
+    if not description and fallback_desc_html:
+        description = html_to_text(fallback_desc_html)
+
+    return {
+        "title": title,
+        "company": "Т-Банк",
+        "description": description,
+        "url": url,
+        "type": "job",
+        "vacancy_created_at": None,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def parse_vacancy(payload: tuple[str, str], task: dict[str, str]) -> dict[str, str | None]:
+    url, html = payload
+    return parse_detail(html, url, fallback_title=task["title"], fallback_desc_html=task["desc_html"])
+
 
 class TBankParser:
     """
@@ -24,33 +170,32 @@ class TBankParser:
     - Поля соответствуют ожиданиям parsing_service (_normalize_item)
     """
 
-    def __init__(self, session: Optional[requests.Session] = None, timeout: float = 20.0) -> None:
-        self.session = session or requests.Session()
-        self.timeout = timeout
-        self.logger = get_service_logger("tbank_parser")
-        self.session.headers.update(
-            {
-                "User-Agent": (
-                    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
-                    "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
-                ),
-                "Accept-Language": "ru,en;q=0.9",
-            }
+    def __init__(
+        self,
+        session: requests.Session | None = None,
+        timeout: float = 20.0,
+        max_workers: int = IO_WORKERS,
+        max_per_host: int = MAX_PER_HOST,
+        parse_workers: int = PARSE_WORKERS,
+        rate_per_host: float = RATE_PER_HOST,
+        retries: int = RETRY_ATTEMPTS,
+        backoff: float = RETRY_BACKOFF,
+    ) -> None:
+        self.runtime = ScrapingRuntime(
+            "tbank_parser",
+            session=session,
+            timeout=timeout,
+            io_workers=max_workers,
+            parse_workers=parse_workers,
+            max_per_host=max_per_host,
+            rate_per_host=rate_per_host,
+            retries=retries,
+            backoff=backoff,
         )
+        self.session = self.runtime.session
+        self.logger = self.runtime.logger
 
-    def _get_html(self, url: str, params: Optional[dict] = None) -> str:
-        try:
-            resp = self.session.get(url, params=params, timeout=self.timeout)
-            # Уточняем кодировку, чтобы не получить кракозябры в описании.
-            if not resp.encoding or resp.encoding.lower() == "iso-8859-1":
-                resp.encoding = resp.apparent_encoding or "utf-8"
-            resp.raise_for_status()
-            return resp.text
-        except Exception:
-            self.logger.exception("Failed to GET %s params=%s", url, params)
-            raise
-
-    def fetch_api_page(self, offset: int = 0, city_id: str = "0c5b2444-70a0-4932-980c-b4dc0d3f02b5") -> Dict:
+    def fetch_api_page(self, offset: int = 0, city_id: str = "0c5b2444-70a0-4932-980c-b4dc0d3f02b5") -> dict:
         """
         Вызывает внутренний API вакансий с пагинацией.
         city_id по умолчанию — «Любой город».
@@ -60,11 +205,7 @@ class TBankParser:
             "pagination": {"it": {"offset": offset, "isFinished": False}},
         }
         try:
-            resp = self.session.post(
-                urljoin(BASE_URL, API_LIST_PATH),
-                json=payload,
-                timeout=self.timeout,
-            )
+            resp = self.runtime.request("POST", urljoin(BASE_URL, API_LIST_PATH), json=payload)
             if not resp.encoding or resp.encoding.lower() == "iso-8859-1":
                 resp.encoding = resp.apparent_encoding or "utf-8"
             resp.raise_for_status()
@@ -73,96 +214,11 @@ class TBankParser:
             self.logger.exception("Failed to POST vacancies API offset=%s city_id=%s", offset, city_id)
             raise
 
-    def _html_to_text(self, html: str) -> str:
-        soup = BeautifulSoup(html or "", "html.parser")
-        parts = []
-        for p in soup.find_all("p"):
-            text = p.get_text(" ", strip=True)
-            if text:
-                parts.append(text)
-        if not parts:
-            text = soup.get_text(" ", strip=True)
-            if text:
-                parts.append(text)
-        return "\n\n".join(parts)
-
-    def fetch_detail(self, url: str, fallback_title: str = "", fallback_desc_html: str = "") -> Dict[str, Optional[str]]:
-        html = self._get_html(url)
-        soup = BeautifulSoup(html, "html.parser")
-
-        title_el = soup.select_one("h1") or soup.select_one('[data-qa-type$="title"]')
-        title = title_el.get_text(strip=True) if title_el else fallback_title
-
-        # Ищем описание, избегая захвата шапки.
-        desc_container = None
-        selector_candidates = [
-            '[data-qa-type*="vacancy-description"]',
-            '[data-qa-type*="VacancyDescription"]',
-            '[data-test*="vacancy-description"]',
-            'section[data-qa-type*="description"]',
-            '.VacancyDescriptionView__cards-desktop_djsrvZ .Card__card_aZ3-\\+--E .atom-desktop-dangerously-html__box_aCYBaw',
-            '.VacancyDescriptionView__cards-desktop_djsrvZ .atom-desktop-dangerously-html__box_aCYBaw',
-        ]
-        for selector in selector_candidates:
-            desc_container = soup.select_one(selector)
-            if desc_container:
-                break
-
-        heading_capture: List[str] = []
-        if not desc_container:
-            heading_tags = ["h2", "h3", "h4", "h5"]
-            keywords = ("опис", "ваканси")
-            for heading in soup.find_all(heading_tags):
-                heading_text = heading.get_text(" ", strip=True).lower()
-                if any(k in heading_text for k in keywords):
-                    for node in heading.next_elements:
-                        if getattr(node, "name", None) in heading_tags:
-                            break
-                        if getattr(node, "name", None) in ["p", "li"]:
-                            text = node.get_text(" ", strip=True)
-                            if text:
-                                heading_capture.append(text)
-                        if getattr(node, "name", None) in ["div", "section", "article"]:
-                            block_text = node.get_text(" ", strip=True)
-                            if block_text:
-                                heading_capture.append(block_text)
-                    break
-        if heading_capture and not desc_container:
-            description = "\n\n".join(heading_capture)
-        else:
-            description = ""
-
-        if not heading_capture:
-            if not desc_container:
-                desc_container = soup.select_one('div[data-test*="htmlTag"], div.atom-desktop-dangerously-html__box_aCYBaw')
-
-            text_parts: List[str] = []
-            if desc_container:
-                paragraphs = desc_container.select("p, li")
-                for p in paragraphs:
-                    text = p.get_text(" ", strip=True)
-                    if text:
-                        text_parts.append(text)
-                if not text_parts:
-                    fallback_text = desc_container.get_text(" ", strip=True)
-                    if fallback_text:
-                        text_parts.append(fallback_text)
-            description = description or "\n\n".join(text_parts)
-
-        if not description and fallback_desc_html:
-            description = self._html_to_text(fallback_desc_html)
-
-        return {
-            "title": title,
-            "company": "Т-Банк",
-            "description": description,
-            "url": url,
-            "type": "job",
-            "vacancy_created_at": None,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-        }
+    def fetch_detail(self, url: str, fallback_title: str = "", fallback_desc_html: str = "") -> dict[str, str | None]:
+        html = self.runtime.get_html(url)
+        return parse_detail(html, url, fallback_title=fallback_title, fallback_desc_html=fallback_desc_html)
 
-    def _extract_urls_from_list_page(self, html: str) -> Dict[str, str]:
+    def _extract_urls_from_list_page(self, html: str) -> dict[str, str]:
         """
         Извлекает полные URL вакансий из HTML страницы со списком.
         Возвращает словарь {slug: full_url} для сопоставления.
@@ -187,9 +243,13 @@ class TBankParser:
 
         return url_map
 
-    def scrape_all(self, max_pages: int = 50) -> List[Dict[str, Optional[str]]]:
-        results: List[Dict[str, Optional[str]]] = []
-        seen: Set[str] = set()
+    def _collect_vacancies(self, max_pages: int = 50) -> list[dict[str, str]]:
+        """
+        Проходит пагинацию API и собирает список вакансий для загрузки деталей:
+        [{url, title, desc_html, from_list}], без повторов по URL.
+        """
+        tasks: list[dict[str, str]] = []
+        seen: set[str] = set()
 
         offset = 0
         for _ in range(max_pages):
@@ -202,7 +262,7 @@ class TBankParser:
             list_url = urljoin(BASE_URL, LIST_PATH)
             if offset == 0:
                 try:
-                    list_html = self._get_html(list_url)
+                    list_html = self.runtime.get_html(list_url)
                     url_map = self._extract_urls_from_list_page(list_html)
                 except Exception:
                     url_map = {}
@@ -229,37 +289,15 @@ class TBankParser:
 
                 if url in seen:
                     continue
-                try:
-                    detail = self.fetch_detail(
-                        url,
-                        fallback_title=vac.get("title", ""),
-                        fallback_desc_html=vac.get("shortDescription", ""),
-                    )
-                except requests.HTTPError:
-                    if not url_map.get(slug):
-                        try:
-                            resp = self.session.head(url, allow_redirects=True, timeout=self.timeout)
-                            if resp.status_code == 200:
-                                url = resp.url
-                                detail = self.fetch_detail(
-                                    url,
-                                    fallback_title=vac.get("title", ""),
-                                    fallback_desc_html=vac.get("shortDescription", ""),
-                                )
-                            else:
-                                self.logger.warning("Vacancy detail returned status=%s url=%s", resp.status_code, url)
-                                continue
-                        except Exception:
-                            self.logger.exception("Vacancy detail fetch failed (after redirect probe) url=%s", url)
-                            continue
-                    else:
-                        self.logger.warning("Vacancy detail fetch failed (HTTPError) url=%s", url)
-                        continue
-                except Exception:
-                    self.logger.exception("Vacancy detail parse failed url=%s", url)
-                    continue
-                results.append(detail)
                 seen.add(url)
+                tasks.append(
+                    {
+                        "url": url,
+                        "title": vac.get("title", ""),
+                        "desc_html": vac.get("shortDescription", ""),
+                        "from_list": bool(url_map.get(slug)),
+                    }
+                )
 
             next_pagination = payload.get("nextPagination", {}).get("it", {})
             next_offset = next_pagination.get("offset")
@@ -268,11 +306,51 @@ class TBankParser:
                 break
             offset = next_offset
 
+        return tasks
+
+    def _fetch_vacancy_html(self, task: dict[str, str]) -> tuple[str, str] | None:
+        """Загружает детальную страницу; при HTTP-ошибке по угаданному URL пробует редирект через HEAD."""
+        url = task["url"]
+        try:
+            return url, self.runtime.get_html(url)
+        except requests.HTTPError:
+            if task["from_list"]:
+                self.logger.warning("Vacancy detail fetch failed (HTTPError) url=%s", url)
+                return None
+            try:
+                resp = self.runtime.request("HEAD", url, allow_redirects=True)
+                if resp.status_code != 200:
+                    self.logger.warning("Vacancy detail returned status=%s url=%s", resp.status_code, url)
+                    return None
+                return resp.url, self.runtime.get_html(resp.url)
+            except Exception:
+                self.logger.exception("Vacancy detail fetch failed (after redirect probe) url=%s", url)
+                return None
+        except Exception:
+            self.logger.exception("Vacancy detail fetch failed url=%s", url)
+            return None
+
+    def scrape_all(self, max_pages: int = 50) -> list[dict[str, str | None]]:
+        tasks = self._collect_vacancies(max_pages=max_pages)
+
+        # Потоки качают детальные страницы, разбор идёт в пуле процессов; порядок — как в API.
+        try:
+            details = self.runtime.pipeline(tasks, self._fetch_vacancy_html, parse_vacancy)
+        finally:
+            self.runtime.close()
+
+        results: list[dict[str, str | None]] = []
+        seen: set[str] = set()
+        for detail in details:
+            if detail is None or detail["url"] in seen:
+                continue
+            results.append(detail)
+            seen.add(detail["url"])
         return results
 
 
 def save_vacancies_to_file(
-    parser: Optional[TBankParser] = None,
+    parser: TBankParser | None = None,
     output_path: str = "tbank_vacancies.json",
     max_pages: int = 50,
 ) -> str:
@@ -306,9 +384,38 @@ def main() -> None:
         default=50,
         help="Сколько страниц пагинации дергать",
     )
+    argp.add_argument(
+        "--workers",
+        type=int,
+        default=IO_WORKERS,
+        help="Сколько детальных страниц качать параллельно",
+    )
+    argp.add_argument(
+        "--parse-workers",
+        type=int,
+        default=PARSE_WORKERS,
+        help="Сколько процессов разбирают HTML (0 — разбор в потоках загрузки)",
+    )
+    argp.add_argument(
+        "--max-per-host",
+        type=int,
+        default=MAX_PER_HOST,
+        help="Максимум одновременных запросов к одному хосту",
+    )
+    argp.add_argument(
+        "--rate",
+        type=float,
+        default=RATE_PER_HOST,
+        help="Запросов в секунду к одному хосту (0 — без ограничения)",
+    )
     args = argp.parse_args()
 
-    parser = TBankParser()
+    parser = TBankParser(
+        max_workers=args.workers,
+        max_per_host=args.max_per_host,
+        parse_workers=args.parse_workers,
+        rate_per_host=args.rate,
+    )
     vacancies = parser.scrape_all(max_pages=args.max_pages)
 
     if args.output in ("-", "/dev/stdout"):
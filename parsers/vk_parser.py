@@ -7,9 +7,10 @@ from typing import Dict, List, Optional, Set
 from urllib.parse import urljoin
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
-from sentry_service import get_service_logger, init_sentry
+from scraping_runtime import IO_WORKERS, PAGE_FEATURES, PARSE_WORKERS, ScrapingRuntime
+from sentry_service import init_sentry
 
 BASE_URL = "https://team.vk.company"
 LIST_PATH = "/vacancy/"
@@ -40,46 +41,66 @@ IT_SPECIALTY_IDS = [
 ]
 
 
+# Всё, что читает parse_detail, лежит внутри этих тегов; остальная страница в дерево не попадает.
+DETAIL_STRAINER = SoupStrainer(["h1", "h2", "main", "article"])
+
+
+def parse_detail(html: str, url: str, fallback_title: str = "") -> dict[str, str | None]:
+    """Разбирает детальную страницу вакансии; функция модуля, чтобы её можно было отдать в пул процессов."""
+    soup = BeautifulSoup(html, PAGE_FEATURES, parse_only=DETAIL_STRAINER)
+    # Описание — берём основной текст из <main> или <article>, пытаемся собрать параграфы и списки
+    main = soup.find("main") or soup.find("article")
+    if main is None:
+        # Без <main>/<article> текст собирается со всей страницы — нужен полный разбор.
+        soup = BeautifulSoup(html, "html.parser")
+        main = soup
+
+    title_el = soup.select_one("h1") or soup.select_one("h2")
+    title = title_el.get_text(strip=True) if title_el else fallback_title
+
+    text_parts: list[str] = []
+    for p in main.select("p"):
+        text = p.get_text(" ", strip=True)
+        if len(text) >= 40:
+            text_parts.append(text)
+    # списки
+    for ul in main.select("ul"):
+        items = [li.get_text(" ", strip=True) for li in ul.select("li") if li.get_text(strip=True)]
+        if items:
+            text_parts.append("\n".join(f"• {item}" for item in items))
+
+    description = "\n\n".join(text_parts).strip()
+
+    return {
+        "title": title,
+        "company": "VK",
+        "description": description,
+        "url": url,
+        "type": "job",
+        "vacancy_created_at": None,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def parse_vacancy(html: str, vac: dict[str, str]) -> dict[str, str | None]:
+    return parse_detail(html, vac["url"], fallback_title=vac["title"])
+
+
 class VKParser:
     """Лёгкий парсер вакансий VK (team.vk.company) без Selenium."""
 
-    def __init__(self, session: Optional[requests.Session] = None, timeout: float = 15.0) -> None:
-        self.session = session or requests.Session()
-        self.timeout = timeout
-        self.logger = get_service_logger("vk_parser")
-        self.session.headers.update(
-            {
-                "User-Agent": (
-                    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
-                    "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
-                ),
-                "Accept-Language": "ru,en;q=0.9",
-            }
+    def __init__(
+        self,
+        session: requests.Session | None = None,
+        timeout: float = 15.0,
+        io_workers: int = IO_WORKERS,
+        parse_workers: int = PARSE_WORKERS,
+    ) -> None:
+        self.runtime = ScrapingRuntime(
+            "vk_parser", session=session, timeout=timeout, io_workers=io_workers, parse_workers=parse_workers
         )
-
-    def _get_html(self, url: str, params: Optional[dict] = None) -> str:
-        try:
-            resp = self.session.get(url, params=params, timeout=self.timeout)
-            if not resp.encoding or resp.encoding.lower() == "iso-8859-1":
-                resp.encoding = resp.apparent_encoding or "utf-8"
-            resp.raise_for_status()
-            return resp.text
-        except Exception:
-            self.logger.exception("Failed to GET %s params=%s", url, params)
-            raise
-
-    def _html_to_text(self, html: str) -> str:
-        soup = BeautifulSoup(html or "", "html.parser")
-        parts = []
-        for p in soup.find_all("p"):
-            text = p.get_text(" ", strip=True)
-            if text:
-                parts.append(text)
-        if not parts:
-            text = soup.get_text(" ", strip=True)
-            if text:
-                parts.append(text)
-        return "\n\n".join(parts)
+        self.session = self.runtime.session
+        self.logger = self.runtime.logger
 
     def _parse_list(self, html: str) -> List[Dict[str, str]]:
         soup = BeautifulSoup(html, "html.parser")
@@ -116,75 +137,82 @@ class VKParser:
         return vacancies
 
     def _parse_detail(self, url: str, fallback_title: str = "") -> Dict[str, Optional[str]]:
-        html = self._get_html(url)
-        soup = BeautifulSoup(html, "html.parser")
+        return parse_detail(self.runtime.get_html(url), url, fallback_title=fallback_title)
 
-        title_el = soup.select_one("h1") or soup.select_one("h2")
-        title = title_el.get_text(strip=True) if title_el else fallback_title
-
-        # Описание — берём основной текст из <main> или <article>, пытаемся собрать параграфы и списки
-        main = soup.find("main") or soup.find("article") or soup
-        text_parts: List[str] = []
-        for p in main.select("p"):
-            text = p.get_text(" ", strip=True)
-            if len(text) >= 40:
-                text_parts.append(text)
-        # списки
-        for ul in main.select("ul"):
-            items = [li.get_text(" ", strip=True) for li in ul.select("li") if li.get_text(strip=True)]
-            if items:
-                text_parts.append("\n".join(f"• {item}" for item in items))
-
-        description = "\n\n".join(text_parts).strip()
-
-        return {
-            "title": title,
-            "company": "VK",
-            "description": description,
-            "url": url,
-            "type": "job",
-            "vacancy_created_at": None,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-        }
-
-    def scrape_all(self, specialty_ids: Optional[List[str]] = None, max_pages: int = 5) -> List[Dict[str, Optional[str]]]:
+    def scrape_all(
+        self,
+        specialty_ids: list[str] | None = None,
+        max_pages: int = 5,
+        known_urls: set[str] | None = None,
+    ) -> list[dict[str, str | None]]:
+        """
+        Обходит списки по специальностям и качает детальные страницы.
+        URL из known_urls (уже сохранённые в publication) и уже скачанные в этом запуске
+        не скачиваются; страница, на которой все вакансии такие, завершает обход
+        специальности. Ошибки загрузки обход не останавливают.
+        """
         specialties = specialty_ids or IT_SPECIALTY_IDS
+        known = known_urls or set()
         results: List[Dict[str, Optional[str]]] = []
         seen: Set[str] = set()
+        failed = 0
 
-        for specialty in specialties:
-            page = 1
-            while page <= max_pages:
-                params = {"specialty": specialty, "page": page}
-                html = self._get_html(urljoin(BASE_URL, LIST_PATH), params=params)
-                vacancies = self._parse_list(html)
-                new_cards = 0
-                for vac in vacancies:
-                    if vac["url"] in seen:
-                        continue
-                    try:
-                        detail = self._parse_detail(vac["url"], fallback_title=vac["title"])
+        try:
+            for specialty in specialties:
+                page = 1
+                while page <= max_pages:
+                    params = {"specialty": specialty, "page": page}
+                    html = self.runtime.get_html(urljoin(BASE_URL, LIST_PATH), params=params)
+                    vacancies = self._parse_list(html)
+                    if not vacancies:
+                        break
+                    pending = [vac for vac in vacancies if vac["url"] not in seen and vac["url"] not in known]
+                    if not pending:
+                        self.logger.info("Only known vacancies on specialty=%s page=%s, stop paging", specialty, page)
+                        break
+                    details = self.runtime.pipeline(
+                        pending, lambda vac: self.runtime.get_html(vac["url"]), parse_vacancy
+                    )
+                    page_failed = 0
+                    for vac, detail in zip(pending, details, strict=True):
+                        if detail is None:
+                            # Не помечаем как seen: вакансия может встретиться и скачаться снова.
+                            page_failed += 1
+                            continue
                         results.append(detail)
                         seen.add(vac["url"])
-                        new_cards += 1
-                    except Exception:
-                        self.logger.exception("Failed to parse vacancy detail url=%s", vac.get("url"))
-                        continue
-                if new_cards == 0:
-                    break
-                page += 1
+                    if page_failed:
+                        self.logger.warning(
+                            "Failed to fetch %s of %s vacancies on specialty=%s page=%s",
+                            page_failed, len(pending), specialty, page,
+                        )
+                        failed += page_failed
+                    page += 1
+        finally:
+            self.runtime.close()
 
+        if failed:
+            self.logger.warning("Vacancy fetch failures: %s, saved: %s", failed, len(results))
         return results
 
 
+def load_known_urls(source: str) -> set[str]:
+    """Читает известные URL (по одному на строку) из файла или из stdin, если source == '-'."""
+    if source == "-":
+        return {line.strip() for line in sys.stdin if line.strip()}
+    with open(source, encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
 def save_vacancies_to_file(
     parser: Optional[VKParser] = None,
     output_path: str = "vk_vacancies.json",
     specialty_ids: Optional[List[str]] = None,
     max_pages: int = 5,
+    known_urls: set[str] | None = None,
 ) -> str:
     parser = parser or VKParser()
-    vacancies = parser.scrape_all(specialty_ids=specialty_ids, max_pages=max_pages)
+    vacancies = parser.scrape_all(specialty_ids=specialty_ids, max_pages=max_pages, known_urls=known_urls)
     out_path = Path(output_path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
     with out_path.open("w", encoding="utf-8") as f:
@@ -208,15 +236,35 @@ def main() -> None:
         default=5,
         help="Pages per specialty to crawl",
     )
+    argp.add_argument("--workers", type=int, default=IO_WORKERS, help="Parallel detail page downloads")
+    argp.add_argument(
+        "--parse-workers",
+        type=int,
+        default=PARSE_WORKERS,
+        help="Processes parsing detail HTML (0 parses in the download threads)",
+    )
+    argp.add_argument(
+        "--known-urls",
+        default=None,
+        help=(
+            "File with already stored vacancy URLs, one per line ('-' reads stdin). "
+            "By default stdin is read when it is not a terminal (run_due_parsers pipes them there)"
+        ),
+    )
     args = argp.parse_args()
 
-    parser = VKParser()
-    vacancies = parser.scrape_all(max_pages=args.max_pages)
+    known_source = args.known_urls
+    if known_source is None and not sys.stdin.isatty():
+        known_source = "-"
+    known_urls = load_known_urls(known_source) if known_source else set()
+
+    parser = VKParser(io_workers=args.workers, parse_workers=args.parse_workers)
 
     if args.output in ("-", "/dev/stdout"):
+        vacancies = parser.scrape_all(max_pages=args.max_pages, known_urls=known_urls)
         json.dump(vacancies, sys.stdout, ensure_ascii=False)
     else:
-        output_path = save_vacancies_to_file(parser, args.output, max_pages=args.max_pages)
+        output_path = save_vacancies_to_file(parser, args.output, max_pages=args.max_pages, known_urls=known_urls)
         print(output_path)
 
 
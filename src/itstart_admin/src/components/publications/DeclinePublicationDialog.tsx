@@ -21,12 +21,12 @@ import {
 } from "@/components/ui/form"
 import { Textarea } from "@/components/ui/textarea"
 import { useDeclinePublication } from "@/hooks/use-publications"
-import type { PublicationRead } from "@/types/api"
+import type { PublicationSummary } from "@/types/api"
 
 type DeclinePublicationFormValues = z.infer<typeof declinePublicationSchema>
 
 interface DeclinePublicationDialogProps {
-  publication: PublicationRead
+  publication: PublicationSummary
   open: boolean
   onOpenChange: (open: boolean) => void
 }
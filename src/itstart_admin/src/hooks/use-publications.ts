@@ -1,7 +1,13 @@
-import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query"
+import {
+  useInfiniteQuery,
+  useQuery,
+  useMutation,
+  useQueryClient,
+} from "@tanstack/react-query"
 import api from "@/lib/api"
 import type {
   PublicationRead,
+  PublicationSummary,
   PublicationType,
 } from "@/types/api"
 import { useToast } from "@/components/ui/use-toast"
@@ -26,10 +32,20 @@ interface PublicationsFilters {
   tag_ids?: string[] | null
 }
 
+export interface PublicationListPage {
+  items: PublicationSummary[]
+  // Cursor of the next page from X-Next-Cursor; null on the last page
+  nextCursor: string | null
+  // Estimated total from X-Total-Count; sent with the first page only
+  total: number | null
+}
+
 export function usePublications(filters?: PublicationsFilters) {
-  return useQuery({
+  return useInfiniteQuery({
     queryKey: ["publications", filters],
-    queryFn: async () => {
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage: PublicationListPage) => lastPage.nextCursor,
+    queryFn: async ({ pageParam }): Promise<PublicationListPage> => {
       const searchParams = new URLSearchParams()
       if (filters?.pub_type) {
         searchParams.set("pub_type", filters.pub_type)
@@ -50,19 +66,22 @@ export function usePublications(filters?: PublicationsFilters) {
         searchParams.set("date_to", dateStr)
       }
 
-      const options: any = {
-        searchParams: searchParams.toString(),
+      for (const tagId of filters?.tag_ids ?? []) {
+        searchParams.append("tag_ids", tagId)
       }
-
-      // Tag IDs should be sent in request body according to OpenAPI spec
-      if (filters?.tag_ids && filters.tag_ids.length > 0) {
-        options.json = filters.tag_ids
+      if (pageParam) {
+        searchParams.set("cursor", pageParam)
       }
 
-      const response = await api
-        .get("admin/publications", options)
-        .json<PublicationRead[]>()
-      return response
+      const response = await api.get("admin/publications", {
+        searchParams: searchParams.toString(),
+      })
+      const total = response.headers.get("X-Total-Count")
+      return {
+        items: await response.json<PublicationSummary[]>(),
+        nextCursor: response.headers.get("X-Next-Cursor"),
+        total: total === null ? null : Number(total),
+      }
     },
   })
 }
@@ -1,6 +1,10 @@
 import { useState } from "react"
 import { useNavigate } from "react-router-dom"
-import { usePublications, useDeletePublication } from "@/hooks/use-publications"
+import {
+  usePublication,
+  usePublications,
+  useDeletePublication,
+} from "@/hooks/use-publications"
 import { useApproveAndSend } from "@/hooks/use-publications"
 import { EditPublicationDialog } from "@/components/publications/EditPublicationDialog"
 import { DeclinePublicationDialog } from "@/components/publications/DeclinePublicationDialog"
@@ -37,7 +41,7 @@ import {
 import { format } from "date-fns"
 import { ru } from "date-fns/locale"
 import { FiEye, FiEdit, FiX, FiCheck } from "react-icons/fi"
-import type { PublicationRead, PublicationType } from "@/types/api"
+import type { PublicationSummary, PublicationType } from "@/types/api"
 import { PUBLICATION_TYPES, PUBLICATION_STATUSES } from "@/lib/constants"
 
 const statusLabels: Record<string, string> = {
@@ -62,15 +66,24 @@ export function PublicationsPage() {
     date_from?: Date | null
     date_to?: Date | null
   }>({})
-  const [editingPublication, setEditingPublication] =
-    useState<PublicationRead | null>(null)
+  // The list has no description/contacts, so the edit form loads the full row
+  const [editingId, setEditingId] = useState<string | null>(null)
   const [decliningPublication, setDecliningPublication] =
-    useState<PublicationRead | null>(null)
+    useState<PublicationSummary | null>(null)
   const [approvingPublication, setApprovingPublication] =
-    useState<PublicationRead | null>(null)
+    useState<PublicationSummary | null>(null)
   const [creatingOpen, setCreatingOpen] = useState(false)
 
-  const { data: publications, isLoading } = usePublications(filters)
+  const {
+    data,
+    isLoading,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = usePublications(filters)
+  const publications = data?.pages.flatMap((page) => page.items)
+  const total = data?.pages[0]?.total ?? null
+  const { data: editingPublication } = usePublication(editingId || "")
   const approveAndSend = useApproveAndSend()
   const deletePublication = useDeletePublication()
 
@@ -212,7 +225,7 @@ export function PublicationsPage() {
                         <Button
                           variant="ghost"
                           size="sm"
-                          onClick={() => setEditingPublication(pub)}
+                          onClick={() => setEditingId(pub.id)}
                         >
                           <FiEdit className="h-4 w-4" />
                         </Button>
@@ -257,12 +270,31 @@ export function PublicationsPage() {
         </div>
       )}
 
+      {/* Pagination */}
+      {!isLoading && publications && publications.length > 0 && (
+        <div className="flex items-center justify-between">
+          <span className="text-sm text-muted-foreground">
+            Показано {publications.length}
+            {total !== null && ` из ~${total}`}
+          </span>
+          {hasNextPage && (
+            <Button
+              variant="outline"
+              onClick={() => fetchNextPage()}
+              disabled={isFetchingNextPage}
+            >
+              {isFetchingNextPage ? "Загрузка..." : "Загрузить ещё"}
+            </Button>
+          )}
+        </div>
+      )}
+
       {/* Dialogs */}
-      {editingPublication && (
+      {editingId && editingPublication?.id === editingId && (
         <EditPublicationDialog
           publication={editingPublication}
-          open={!!editingPublication}
-          onOpenChange={(open) => !open && setEditingPublication(null)}
+          open={!!editingId}
+          onOpenChange={(open) => !open && setEditingId(null)}
         />
       )}
 
@@ -54,6 +54,12 @@ export interface PublicationRead {
   editor_id: string | null
 }
 
+// List row: no description/contact_info, an excerpt of the description instead
+export interface PublicationSummary
+  extends Omit<PublicationRead, "description" | "contact_info"> {
+  excerpt: string
+}
+
 export interface ParserRead {
   id: string
   source_name: string
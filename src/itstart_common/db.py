@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from collections.abc import AsyncIterator, Callable
 from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from typing import Any
 
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -11,8 +12,12 @@ from sqlalchemy.ext.asyncio import (
 )
 
 
-def create_engine(url: str) -> AsyncEngine:
-    return create_async_engine(url, future=True, echo=False)
+def create_engine(url: str, **pool_options: Any) -> AsyncEngine:
+    """pool_options (pool_size, max_overflow, poolclass, ...) are ignored for SQLite,
+    whose in-memory/file pools reject them."""
+    if url.startswith("sqlite"):
+        pool_options = {}
+    return create_async_engine(url, future=True, echo=False, **pool_options)
 
 
 def create_session_maker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import asyncio
+from weakref import WeakKeyDictionary
+
+import redis.asyncio as redis
+
+# Клиент (и его пул соединений) привязан к event loop: Celery-задачи запускают
+# asyncio.run() на каждый вызов, поэтому кэшируем по паре (loop, url).
+_clients: WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, redis.Redis]] = WeakKeyDictionary()
+
+
+def get_redis(url: str) -> redis.Redis:
+    """Общий для процесса пул соединений к ``url`` (в пределах текущего event loop)."""
+    per_loop = _clients.setdefault(asyncio.get_running_loop(), {})
+    client = per_loop.get(url)
+    if client is None:
+        client = per_loop[url] = redis.from_url(url)
+    return client
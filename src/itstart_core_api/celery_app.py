@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import datetime
+import heapq
 import logging
 from typing import Any
 
@@ -15,6 +16,7 @@ from sqlalchemy import select
 from .config import get_settings
 from .db import build_engine, build_session_maker
 from .models import PublicationSchedule
+from .parsing_service import PARSER_RUN_LEASE_MINUTES, list_parser_next_runs
 
 logger = logging.getLogger(__name__)
 
@@ -22,12 +24,25 @@ logger = logging.getLogger(__name__)
 async def _fetch_publication_schedules() -> list[PublicationSchedule]:
     settings = get_settings()
     engine = build_engine(settings)
-    Session = build_session_maker(engine)
-    async with Session() as session:
-        result = await session.execute(
-            select(PublicationSchedule).where(PublicationSchedule.is_active.is_(True))
-        )
-        return list(result.scalars())
+    try:
+        async with build_session_maker(engine)() as session:
+            result = await session.execute(
+                select(PublicationSchedule).where(PublicationSchedule.is_active.is_(True))
+            )
+            return list(result.scalars())
+    finally:
+        # Each call runs in its own asyncio.run loop, so the pool cannot be reused.
+        await engine.dispose()
+
+
+async def _fetch_parser_next_runs() -> list[tuple[datetime.datetime, str]]:
+    settings = get_settings()
+    engine = build_engine(settings)
+    try:
+        async with build_session_maker(engine)() as session:
+            return await list_parser_next_runs(session)
+    finally:
+        await engine.dispose()
 
 
 def _build_beat_schedule(settings) -> dict[str, Any]:
@@ -41,10 +56,6 @@ def _build_beat_schedule(settings) -> dict[str, Any]:
             "task": "itstart_core_api.tasks.cleanup_old_publications",
             "schedule": crontab(hour=3, minute=0),
         },
-        "run-parsers": {
-            "task": "itstart_core_api.tasks.run_parsers",
-            "schedule": datetime.timedelta(minutes=settings.parsers_poll_interval_minutes),
-        },
     }
 
     try:
@@ -74,12 +85,20 @@ def _build_beat_schedule(settings) -> dict[str, Any]:
 
 
 class PublicationScheduler(Scheduler):
-    """Dynamic scheduler that refreshes publication intervals from DB without restarts."""
+    """Dynamic scheduler that refreshes publication intervals from DB without restarts.
+
+    It also dispatches parsers: a heap of ``parser.next_run_at`` is reloaded with the
+    schedules, beat sleeps until its earliest entry and enqueues ``run_parser`` for
+    exactly the parsers that are due. A dispatched parser stays due in the DB until a
+    worker claims it, so it is not re-enqueued on refresh for the length of a run lease.
+    """
 
     def __init__(self, *args, refresh_interval: int = 60, **kwargs):
         self.refresh_interval = refresh_interval
         self.last_refresh: float = 0
         self.dynamic_schedule: dict[str, ScheduleEntry] = {}
+        self.parser_heap: list[tuple[datetime.datetime, str]] = []
+        self.dispatched_at: dict[str, datetime.datetime] = {}
         super().__init__(*args, **kwargs)
 
     def setup_schedule(self):
@@ -136,6 +155,42 @@ class PublicationScheduler(Scheduler):
 
         self.dynamic_schedule = base_entries
 
+        try:
+            parser_runs = asyncio.run(_fetch_parser_next_runs())
+        except Exception:
+            logger.exception("Failed to refresh parser next_run_at heap")
+        else:
+            self._load_parser_heap(parser_runs, datetime.datetime.utcnow())
+
+    def _load_parser_heap(
+        self, parser_runs: list[tuple[datetime.datetime, str]], now: datetime.datetime
+    ) -> None:
+        lease = datetime.timedelta(minutes=PARSER_RUN_LEASE_MINUTES)
+        self.dispatched_at = {
+            parser_id: at for parser_id, at in self.dispatched_at.items() if now - at < lease
+        }
+        # Still due after a recent dispatch means the task is queued, not yet claimed;
+        # a claim moves next_run_at into the future.
+        self.parser_heap = [
+            (run_at, parser_id)
+            for run_at, parser_id in parser_runs
+            if not (run_at <= now and parser_id in self.dispatched_at)
+        ]
+        heapq.heapify(self.parser_heap)
+
+    def _dispatch_due_parsers(self) -> float:
+        """Enqueue due parsers; return seconds until the next one is due."""
+
+        now = datetime.datetime.utcnow()
+        while self.parser_heap and self.parser_heap[0][0] <= now:
+            _, parser_id = heapq.heappop(self.parser_heap)
+            self.app.send_task("itstart_core_api.tasks.run_parser", kwargs={"parser_id": parser_id})
+            self.dispatched_at[parser_id] = now
+            logger.info("Dispatched parser", extra={"parser_id": parser_id})
+        if not self.parser_heap:
+            return self.max_interval
+        return max((self.parser_heap[0][0] - now).total_seconds(), 0.0)
+
     @property
     def schedule(self):
         # Scheduler reads this property each tick
@@ -144,7 +199,9 @@ class PublicationScheduler(Scheduler):
 
     def tick(self):
         self._refresh_from_db()
-        return super().tick()
+        delay = super().tick()
+        # Never sleep past the next parser due time or the next DB refresh.
+        return min(delay, self._dispatch_due_parsers(), self.refresh_interval)
 
 
 def make_celery() -> Celery:
@@ -203,3 +260,10 @@ def run_parsers_task():
     from .tasks import run_parsers
 
     asyncio.run(run_parsers())
+
+
+@celery_app.task(name="itstart_core_api.tasks.run_parser")
+def run_parser_task(parser_id: str):
+    from .tasks import run_parser
+
+    asyncio.run(run_parser(parser_id))
@@ -5,10 +5,21 @@ from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 from itstart_common.db import create_engine, create_session_maker
 
 from .config import Settings
+from .metrics import MeteredAsyncPool, instrument_engine
 
 
 def build_engine(settings: Settings) -> AsyncEngine:
-    return create_engine(settings.database_url)
+    engine = create_engine(
+        settings.database_url,
+        poolclass=MeteredAsyncPool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+    instrument_engine(engine)
+    return engine
 
 
 def build_session_maker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
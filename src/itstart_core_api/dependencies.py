@@ -1,17 +1,17 @@
+import asyncio
 from collections.abc import AsyncIterator
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
-from fastapi import Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import Depends, FastAPI, Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from .config import get_settings
+from .config import Settings
 from .db import build_engine, build_session_maker
+from .tag_catalog import tag_catalog
 
 
-def get_session_maker():
-    settings = get_settings()
-    engine = build_engine(settings)
-    return build_session_maker(engine)
+def get_session_maker(request: Request) -> async_sessionmaker[AsyncSession]:
+    return request.app.state.session_maker
 
 
 async def get_db_session(session_maker=Depends(get_session_maker)) -> AsyncIterator[AsyncSession]:
@@ -20,5 +20,16 @@ async def get_db_session(session_maker=Depends(get_session_maker)) -> AsyncItera
 
 
 @asynccontextmanager
-async def lifespan_context() -> AsyncIterator[None]:
-    yield
+async def lifespan_context(app: FastAPI, settings: Settings) -> AsyncIterator[None]:
+    """One engine (and connection pool) per app, disposed on shutdown; tag catalog listener."""
+    engine = build_engine(settings)
+    app.state.engine = engine
+    app.state.session_maker = build_session_maker(engine)
+    listener = asyncio.create_task(tag_catalog.listen(settings.redis_url))
+    try:
+        yield
+    finally:
+        listener.cancel()
+        with suppress(asyncio.CancelledError):
+            await listener
+        await engine.dispose()
@@ -1,89 +1,150 @@
 from __future__ import annotations
 
+import asyncio
 import csv
 import datetime
 import io
+import tempfile
+from collections.abc import AsyncIterator
 
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from openpyxl import Workbook
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from itstart_domain import AdminRole
 
 from .auth import get_current_admin
-from .dependencies import get_db_session
+from .dependencies import get_session_maker
 from .models import Publication, PublicationTag, Tag
 
 router = APIRouter(prefix="/admin/export", tags=["export"])
 
+COLUMNS = ["id", "title", "type", "company", "url", "created_at", "status", "tags"]
+# Rows fetched per round trip from the server-side cursor.
+FETCH_SIZE = 1000
+# XLSX files up to this size are assembled in memory, larger ones on disk.
+XLSX_SPOOL_MAX_BYTES = 16 * 1024 * 1024
+XLSX_CHUNK_BYTES = 64 * 1024
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def _export_query(date_from: datetime.date | None, date_to: datetime.date | None) -> Select:
+    """One row per publication with its tag names aggregated in the same query."""
+    q = (
+        select(
+            Publication.id,
+            Publication.title,
+            Publication.type,
+            Publication.company,
+            Publication.url,
+            Publication.created_at,
+            Publication.status,
+            func.coalesce(func.aggregate_strings(Tag.name, ","), "").label("tags"),
+        )
+        .outerjoin(PublicationTag, PublicationTag.publication_id == Publication.id)
+        .outerjoin(Tag, Tag.id == PublicationTag.tag_id)
+        .group_by(Publication.id)
+        .order_by(Publication.created_at, Publication.id)
+    )
+    if date_from:
+        q = q.where(
+            Publication.created_at >= datetime.datetime.combine(date_from, datetime.time.min)
+        )
+    if date_to:
+        q = q.where(Publication.created_at <= datetime.datetime.combine(date_to, datetime.time.max))
+    return q.execution_options(yield_per=FETCH_SIZE)
+
+
+async def _stream_rows(
+    session_maker: async_sessionmaker[AsyncSession], query: Select
+) -> AsyncIterator[list[list[str]]]:
+    """
+    Batches of export rows from a server-side cursor. The session is opened here rather
+    than taken from ``get_db_session``, which is closed before a streamed body is sent.
+    """
+    async with session_maker() as session:
+        result = await session.stream(query)
+        async for partition in result.partitions():
+            yield [
+                [
+                    str(row.id),
+                    row.title,
+                    row.type,
+                    row.company,
+                    row.url,
+                    row.created_at.isoformat(),
+                    row.status,
+                    row.tags,
+                ]
+                for row in partition
+            ]
+
+
+async def _csv_chunks(batches: AsyncIterator[list[list[str]]]) -> AsyncIterator[str]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(COLUMNS)
+    async for rows in batches:
+        writer.writerows(rows)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+
+async def _build_xlsx(batches: AsyncIterator[list[list[str]]]) -> tempfile.SpooledTemporaryFile:
+    # Write-only worksheets keep rows in their own temp file instead of cell objects.
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("publications")
+    ws.append(COLUMNS)
+    async for rows in batches:
+        for row in rows:
+            ws.append(row)
+    out = tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_MAX_BYTES)
+    try:
+        await asyncio.to_thread(wb.save, out)
+    except BaseException:
+        out.close()
+        raise
+    out.seek(0)
+    return out
+
+
+async def _file_chunks(file: tempfile.SpooledTemporaryFile) -> AsyncIterator[bytes]:
+    try:
+        while chunk := file.read(XLSX_CHUNK_BYTES):
+            yield chunk
+    finally:
+        file.close()
+
 
 @router.get("/publications")
 async def export_publications(
     date_from: datetime.date | None = None,
     date_to: datetime.date | None = None,
     fmt: str = "csv",
-    session: AsyncSession = Depends(get_db_session),
+    session_maker: async_sessionmaker[AsyncSession] = Depends(get_session_maker),
     current=Depends(get_current_admin),
 ):
     if current.role != AdminRole.admin:
         raise HTTPException(status_code=403, detail="Forbidden")
 
-    q = select(Publication)
-    if date_from:
-        q = q.where(
-            Publication.created_at >= datetime.datetime.combine(date_from, datetime.time.min)
-        )
-    if date_to:
-        q = q.where(Publication.created_at <= datetime.datetime.combine(date_to, datetime.time.max))
-    pubs = (await session.execute(q)).scalars().all()
-
-    rows = []
-    for pub in pubs:
-        tag_rows = await session.execute(
-            select(Tag.name)
-            .join(PublicationTag, PublicationTag.tag_id == Tag.id)
-            .where(PublicationTag.publication_id == pub.id)
-        )
-        tags = ",".join([r[0] for r in tag_rows])
-        rows.append(
-            [
-                str(pub.id),
-                pub.title,
-                pub.type,
-                pub.company,
-                pub.url,
-                pub.created_at.isoformat(),
-                pub.status if hasattr(pub, "status") else "",
-                tags,
-            ]
-        )
-
+    batches = _stream_rows(session_maker, _export_query(date_from, date_to))
     if fmt == "csv":
-        buf = io.StringIO()
-        writer = csv.writer(buf)
-        writer.writerow(["id", "title", "type", "company", "url", "created_at", "status", "tags"])
-        writer.writerows(rows)
-        return Response(
-            content=buf.getvalue(),
+        return StreamingResponse(
+            _csv_chunks(batches),
             media_type="text/csv",
             headers={"Content-Disposition": "attachment; filename=publications.csv"},
         )
     if fmt == "xlsx":
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "publications"
-        ws.append(["id", "title", "type", "company", "url", "created_at", "status", "tags"])
-        for row in rows:
-            ws.append(row)
-
-        stream = io.BytesIO()
-        wb.save(stream)
-        stream.seek(0)
-
-        return Response(
-            content=stream.getvalue(),
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        # The zip directory goes at the end, so the file is complete before it is sent.
+        file = await _build_xlsx(batches)
+        return StreamingResponse(
+            _file_chunks(file),
+            media_type=XLSX_MEDIA_TYPE,
             headers={"Content-Disposition": "attachment; filename=publications.xlsx"},
         )
     else:
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import datetime
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 import sentry_sdk
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from itstart_domain import AdminRole, ParserType
 
@@ -14,30 +17,36 @@ from .admin_users import router as admin_users_router
 from .api import router
 from .auth import router as auth_router
 from .config import Settings, get_settings
-from .db import build_engine, build_session_maker
+from .dependencies import lifespan_context
 from .export import router as export_router
 from .metrics import middleware_factory as metrics_middleware_factory
 from .metrics import router as metrics_router
 from .models import Parser
+from .pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
 from .parsers import router as parsers_router
 from .publications import router as publications_router
 from .repositories import AdminUserRepository, ParserRepository
 from .schedule import router as schedule_router
 from .security import hash_password
 from .stats import router as stats_router
+from .tag_catalog import publish_tags_changed
 from .tag_seed import TagRepository, seed_tags
 from .tags import router as tags_router
 
 logger = logging.getLogger(__name__)
 
 
-def create_app(settings: Settings | None = None) -> FastAPI:
+def create_app(settings: Settings | None = None, seed_defaults: bool = False) -> FastAPI:
     settings = settings or get_settings()
     if settings.sentry_dsn:
         sentry_sdk.init(dsn=settings.sentry_dsn, traces_sample_rate=1.0)
 
-    engine = build_engine(settings)
-    session_maker = build_session_maker(engine)
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        async with lifespan_context(app, settings):
+            if seed_defaults:
+                await seed_startup(app.state.session_maker, settings)
+            yield
 
     tags_metadata = [
         {"name": "auth", "description": "Логин, 2FA, смена пароля, профайл администратора."},
@@ -57,6 +66,7 @@ def create_app(settings: Settings | None = None) -> FastAPI:
         openapi_tags=tags_metadata,
         docs_url="/docs",
         redoc_url="/redoc",
+        lifespan=lifespan,
     )
 
     # Add CORS middleware
@@ -66,11 +76,10 @@ def create_app(settings: Settings | None = None) -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER],
     )
 
-    # Dependency wiring placeholder; once repos are added, inject get_session.
-    app.state.engine = engine
-    app.state.session_maker = session_maker
+    # app.state.engine / app.state.session_maker are set by the lifespan.
     app.dependency_overrides = {}
     app.include_router(router, dependencies=[])
     app.include_router(auth_router)
@@ -87,17 +96,10 @@ def create_app(settings: Settings | None = None) -> FastAPI:
     return app
 
 
-app = create_app()
-
-
-@app.on_event("startup")
-async def seed_startup():
-    settings = get_settings()
-    engine = build_engine(settings)
-    Session = build_session_maker(engine)
+async def seed_startup(Session: async_sessionmaker[AsyncSession], settings: Settings) -> None:
     async with Session() as session:
         tag_repo = TagRepository(session)
-        await seed_tags(tag_repo)
+        created_tags = await seed_tags(tag_repo, settings.redis_url)
 
         # Seed default admin user if configured and not present
         if settings.admin_default_username and settings.admin_default_password:
@@ -196,6 +198,11 @@ async def seed_startup():
             logger.info("Seeded default internships parser")
 
         await session.commit()
+    if created_tags:
+        await publish_tags_changed(settings.redis_url)
+
+
+app = create_app(seed_defaults=True)
 
 
 def run() -> None:
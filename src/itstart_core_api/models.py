@@ -3,12 +3,24 @@ from __future__ import annotations
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import BigInteger, Enum, ForeignKey, Index, LargeBinary, Text, UniqueConstraint
+from sqlalchemy import (
+    BigInteger,
+    Computed,
+    Enum,
+    ForeignKey,
+    Index,
+    LargeBinary,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 from itstart_domain import AdminRole, ParserType, PublicationType, TagCategory
 
+# Length of ``publication.excerpt``, the description prefix shown in lists.
+EXCERPT_LENGTH = 200
+
 
 class Base(DeclarativeBase):
     pass
@@ -24,6 +36,9 @@ class Publication(Base):
     id: Mapped[UUID] = uuid_pk()
     title: Mapped[str] = mapped_column(Text, nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
+    excerpt: Mapped[str] = mapped_column(
+        Text, Computed(f"substr(description, 1, {EXCERPT_LENGTH})", persisted=True)
+    )
     type: Mapped[PublicationType] = mapped_column(
         Enum(PublicationType, name="publication_type"), nullable=False
     )
@@ -173,6 +188,11 @@ class Parser(Base):
     parsing_start_time: Mapped[datetime] = mapped_column(nullable=False)
     last_parsed_at: Mapped[datetime | None]
     is_active: Mapped[bool] = mapped_column(default=True, nullable=False)
+    adaptive_scheduling: Mapped[bool] = mapped_column(default=False, nullable=False)
+    min_parsing_interval: Mapped[int | None]
+    max_parsing_interval: Mapped[int | None]
+    last_changed_at: Mapped[datetime | None]
+    next_run_at: Mapped[datetime | None]
 
     results: Mapped[list[ParsingResult]] = relationship(
         cascade="all, delete-orphan", back_populates="parser"
@@ -189,6 +209,15 @@ class ParsingResult(Base):
     )
     success: Mapped[bool] = mapped_column(nullable=False)
     received_amount: Mapped[int] = mapped_column(nullable=False)
+    saved_amount: Mapped[int] = mapped_column(default=0, nullable=False)
+    duplicate_amount: Mapped[int] = mapped_column(default=0, nullable=False)
+    rejected_amount: Mapped[int] = mapped_column(default=0, nullable=False)
+    output_bytes: Mapped[int] = mapped_column(BigInteger(), default=0, nullable=False)
+    spawn_ms: Mapped[int | None]
+    execute_ms: Mapped[int | None]
+    decode_ms: Mapped[int | None]
+    dedup_ms: Mapped[int | None]
+    insert_ms: Mapped[int | None]
 
     parser: Mapped[Parser] = relationship(back_populates="results")
 
@@ -218,8 +247,19 @@ class AdminAuditLog(Base):
     created_at: Mapped[datetime] = mapped_column(nullable=False, default=datetime.utcnow)
 
 
-Index("idx_publication_type_created_at", Publication.type, Publication.created_at.desc())
+# Covers bot search keyset pages: (type, created_at, id) order plus the is_declined filter.
+Index(
+    "idx_publication_type_created_at",
+    Publication.type,
+    Publication.created_at.desc(),
+    Publication.id.desc(),
+    postgresql_include=["is_declined"],
+)
+# Admin list keyset pages across all types.
+Index("idx_publication_created_at_id", Publication.created_at.desc(), Publication.id.desc())
 Index("idx_publication_tags_tag", PublicationTag.tag_id)
+Index("idx_publication_source_id", Publication.source_id)
+Index("idx_parser_next_run_at", Parser.next_run_at)
 Index("idx_parsing_result_parser_date", ParsingResult.parser_id, ParsingResult.date)
 Index("idx_tg_user_refused_at", TgUser.refused_at)
 Index(
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import datetime
+import json
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import ClauseElement, Executable, Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+
+# Responses of list endpoints are plain JSON arrays; paging state travels in headers.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+@dataclass(frozen=True)
+class KeysetCursor:
+    """
+    Position after the last row of a page ordered by ``created_at DESC, id DESC``, with
+    the text rank in front of both when the list is sorted by relevance.
+    """
+
+    created_at: datetime.datetime
+    id: UUID
+    rank: float | None = None
+
+    def encode(self) -> str:
+        row: list[Any] = [self.created_at.isoformat(), self.id.hex]
+        if self.rank is not None:
+            row.append(self.rank)
+        raw = json.dumps(row, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    @classmethod
+    def decode(cls, value: str) -> KeysetCursor:
+        try:
+            raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+            row = json.loads(raw)
+        except (binascii.Error, ValueError, UnicodeDecodeError) as exc:
+            raise ValueError("Invalid cursor") from exc
+        # A well-formed cursor can still carry values of the wrong type.
+        if (
+            not isinstance(row, list)
+            or len(row) not in (2, 3)
+            or not isinstance(row[0], str)
+            or not isinstance(row[1], str)
+            or (len(row) == 3 and (isinstance(row[2], bool) or not isinstance(row[2], int | float)))
+        ):
+            raise ValueError("Invalid cursor")
+        try:
+            return cls(
+                created_at=datetime.datetime.fromisoformat(row[0]),
+                id=UUID(row[1]),
+                rank=float(row[2]) if len(row) == 3 else None,
+            )
+        except ValueError as exc:
+            raise ValueError("Invalid cursor") from exc
+
+
+class explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a statement; PostgreSQL only."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select) -> None:
+        self.statement = statement
+
+
+@compiles(explain, "postgresql")
+def _pg_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def estimate_count(session: AsyncSession, statement: Select) -> int:
+    """
+    Row count of ``statement`` (without ORDER BY/LIMIT). On PostgreSQL this is the
+    planner's estimate, which costs the same however many rows match; other dialects
+    count exactly.
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        return await session.scalar(select(func.count()).select_from(statement.subquery())) or 0
+    plan = await session.scalar(explain(statement))
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
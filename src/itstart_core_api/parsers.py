@@ -16,6 +16,18 @@ from .schemas import ParserRead
 router = APIRouter(prefix="/admin/parsers", tags=["parsers"])
 
 
+def _check_interval_bounds(
+    parsing_interval: int, min_interval: int | None, max_interval: int | None
+) -> None:
+    lo = min_interval if min_interval is not None else parsing_interval
+    hi = max_interval if max_interval is not None else parsing_interval
+    if lo <= 0 or not lo <= parsing_interval <= hi:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Expected 0 < min_parsing_interval <= parsing_interval <= max_parsing_interval",
+        )
+
+
 @router.get("", response_model=list[ParserRead])
 async def list_parsers(
     session: AsyncSession = Depends(get_db_session),
@@ -36,11 +48,15 @@ async def create_parser(
     parsing_interval: int,
     parsing_start_time: datetime.datetime,
     is_active: bool = True,
+    adaptive_scheduling: bool = False,
+    min_parsing_interval: int | None = None,
+    max_parsing_interval: int | None = None,
     session: AsyncSession = Depends(get_db_session),
     current=Depends(get_current_admin),
 ):
     if current.role != AdminRole.admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    _check_interval_bounds(parsing_interval, min_parsing_interval, max_parsing_interval)
     repo = ParserRepository(session)
     audit = AdminAuditRepository(session)
     parser = repo.create(
@@ -50,6 +66,9 @@ async def create_parser(
         parsing_interval=parsing_interval,
         parsing_start_time=parsing_start_time,
         is_active=is_active,
+        adaptive_scheduling=adaptive_scheduling,
+        min_parsing_interval=min_parsing_interval,
+        max_parsing_interval=max_parsing_interval,
     )
     await session.commit()
     await session.refresh(parser)
@@ -73,16 +92,38 @@ async def update_parser(
     parsing_interval: int | None = None,
     parsing_start_time: datetime.datetime | None = None,
     is_active: bool | None = None,
+    adaptive_scheduling: bool | None = None,
+    min_parsing_interval: int | None = None,
+    max_parsing_interval: int | None = None,
+    clear_min_parsing_interval: bool = False,
+    clear_max_parsing_interval: bool = False,
     session: AsyncSession = Depends(get_db_session),
     current=Depends(get_current_admin),
 ):
+    """``clear_*_parsing_interval`` drop a bound so it falls back to ``parsing_interval``."""
     if current.role != AdminRole.admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    if (clear_min_parsing_interval and min_parsing_interval is not None) or (
+        clear_max_parsing_interval and max_parsing_interval is not None
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A bound cannot be both set and cleared",
+        )
     repo = ParserRepository(session)
     audit = AdminAuditRepository(session)
     parser = await repo.get(parser_id)
     if not parser:
         raise HTTPException(status_code=404, detail="Not found")
+    if not clear_min_parsing_interval and min_parsing_interval is None:
+        min_parsing_interval = parser.min_parsing_interval
+    if not clear_max_parsing_interval and max_parsing_interval is None:
+        max_parsing_interval = parser.max_parsing_interval
+    _check_interval_bounds(
+        parsing_interval if parsing_interval is not None else parser.parsing_interval,
+        min_parsing_interval,
+        max_parsing_interval,
+    )
     await repo.update(
         parser,
         source_name=source_name,
@@ -91,6 +132,11 @@ async def update_parser(
         parsing_interval=parsing_interval,
         parsing_start_time=parsing_start_time,
         is_active=is_active,
+        adaptive_scheduling=adaptive_scheduling,
+        min_parsing_interval=min_parsing_interval,
+        max_parsing_interval=max_parsing_interval,
+        clear_min_parsing_interval=clear_min_parsing_interval,
+        clear_max_parsing_interval=clear_max_parsing_interval,
     )
     await session.commit()
     await session.refresh(parser)
@@ -119,6 +165,7 @@ async def enable_parser(
     if not parser:
         raise HTTPException(status_code=404, detail="Not found")
     parser.is_active = True
+    parser.next_run_at = None
     await session.commit()
     audit.log(
         admin_id=current.id,
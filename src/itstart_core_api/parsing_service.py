@@ -7,9 +7,11 @@ import logging
 import os
 import shlex
 import sys
+import time
 from collections.abc import Iterable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
+from uuid import UUID
 
 import sentry_sdk
 from sqlalchemy import select
@@ -18,11 +20,21 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from itstart_domain import PublicationType
 
 from .config import Settings
-from .models import Parser, ParsingResult, Publication, Tag
-from .repositories import ParserRepository, PublicationRepository, TagRepository
+from .models import Parser, ParsingResult, Publication
+from .repositories import ParserRepository, PublicationRepository
+from .search_cache import bump_search_version
+from .tag_catalog import TagCatalog, tag_catalog
 
 logger = logging.getLogger(__name__)
 
+# Adaptive scheduling: with no new items in the recent window a parser is polled
+# every ADAPTIVE_IDLE_FRACTION of the time since it last produced something.
+ADAPTIVE_IDLE_FRACTION = 0.1
+# How long a claimed parser run blocks re-dispatch before it is considered crashed.
+PARSER_RUN_LEASE_MINUTES = 60
+# Newest vacancy_created_at already stored for the source, as ISO 8601 UTC.
+PARSER_WATERMARK_ENV = "PARSER_WATERMARK"
+
 
 class ParserExecutionError(RuntimeError):
     pass
@@ -47,6 +59,26 @@ class ParserRunStats:
     saved: int
 
 
+@dataclass
+class ParserRunTelemetry:
+    """Per-phase timings (ms) and item counters of a single parser run."""
+
+    spawn_ms: int | None = None
+    execute_ms: int | None = None
+    decode_ms: int | None = None
+    dedup_ms: int = 0
+    insert_ms: int = 0
+    output_bytes: int = 0
+    saved: int = 0
+    duplicates: int = 0
+    rejected: int = 0
+    saved_types: set[PublicationType] = field(default_factory=set)
+
+
+def _elapsed_ms(started: float) -> int:
+    return int((time.perf_counter() - started) * 1000)
+
+
 def _parse_datetime(value: Any, fallback: datetime.datetime) -> datetime.datetime:
     if isinstance(value, datetime.datetime):
         dt = value
@@ -93,7 +125,21 @@ def _normalize_item(raw: dict[str, Any], now: datetime.datetime) -> NormalizedIt
     )
 
 
-async def _execute_parser_command(command: str, cwd: str | None = None) -> list[dict[str, Any]]:
+async def _execute_parser_command(
+    command: str,
+    cwd: str | None = None,
+    telemetry: ParserRunTelemetry | None = None,
+    known_urls: Iterable[str] | None = None,
+    watermark: datetime.datetime | None = None,
+) -> list[dict[str, Any]]:
+    """Run a parser script and decode its JSON output.
+
+    ``known_urls`` are written to the parser's stdin one per line so incremental
+    parsers can skip detail pages that are already stored; others ignore stdin.
+    ``watermark`` is passed in ``PARSER_WATERMARK``. It comes from committed rows,
+    so a run whose output was never ingested does not move it.
+    """
+    telemetry = telemetry or ParserRunTelemetry()
     tokens = shlex.split(command)
     if tokens and tokens[0] == "python":
         tokens[0] = sys.executable
@@ -102,13 +148,30 @@ async def _execute_parser_command(command: str, cwd: str | None = None) -> list[
 
     run_cwd = cwd if cwd and os.path.isdir(cwd) else None
 
+    stdin_data = "".join(f"{url}\n" for url in known_urls or ()).encode()
+    env = None
+    if watermark is not None:
+        if watermark.tzinfo is None:
+            watermark = watermark.replace(tzinfo=datetime.timezone.utc)
+        env = {**os.environ, PARSER_WATERMARK_ENV: watermark.isoformat()}
+
+    started = time.perf_counter()
     proc = await asyncio.create_subprocess_exec(
         *tokens,
+        stdin=asyncio.subprocess.PIPE,
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
         cwd=run_cwd,
+        env=env,
     )
-    stdout, stderr = await proc.communicate()
+    telemetry.spawn_ms = _elapsed_ms(started)
+
+    started = time.perf_counter()
+    stdout, stderr = await proc.communicate(stdin_data)
+    telemetry.execute_ms = _elapsed_ms(started)
+    telemetry.output_bytes = len(stdout or b"")
+
+    started = time.perf_counter()
     out_text = (stdout or b"").decode()
     err_text = (stderr or b"").decode()
     if proc.returncode != 0:
@@ -118,16 +181,21 @@ async def _execute_parser_command(command: str, cwd: str | None = None) -> list[
         )
 
     if not out_text.strip():
+        telemetry.decode_ms = _elapsed_ms(started)
         return []
 
     try:
-        return json.loads(out_text)
+        items = json.loads(out_text)
     except json.JSONDecodeError:
         path = out_text.strip()
         if path and os.path.exists(path):
+            telemetry.output_bytes = os.path.getsize(path)
             with open(path, encoding="utf-8") as f:
-                return json.load(f)
-        raise ParserExecutionError("Parser output is not valid JSON", err_text)
+                items = json.load(f)
+        else:
+            raise ParserExecutionError("Parser output is not valid JSON", err_text)
+    telemetry.decode_ms = _elapsed_ms(started)
+    return items
 
 
 async def _recent_results(session: AsyncSession, parser_id) -> list[ParsingResult]:
@@ -149,35 +217,72 @@ def _failure_streak(results: Iterable[ParsingResult]) -> int:
     return streak
 
 
-def _is_due(parser: Parser, results: list[ParsingResult], now: datetime.datetime) -> bool:
-    if not parser.is_active:
-        return False
-    if now < parser.parsing_start_time:
-        return False
+def _effective_interval(
+    parser: Parser, results: list[ParsingResult], now: datetime.datetime
+) -> int:
+    """Interval (minutes) after a successful run, adapted to the parser's recent yield.
+
+    Parsers with ``adaptive_scheduling`` are polled more often while their recent
+    runs keep producing new items (down to ``min_parsing_interval``) and less often
+    the longer they go without any change (up to ``max_parsing_interval``).
+    """
+
+    base = parser.parsing_interval
+    if not parser.adaptive_scheduling:
+        return base
+    lo = parser.min_parsing_interval or base
+    hi = max(parser.max_parsing_interval or base, lo)
+
+    window = [r for r in results if r.success]
+    if not window:
+        return min(max(base, lo), hi)
+
+    received = sum(r.received_amount for r in window)
+    saved = sum(r.saved_amount or 0 for r in window)
+    if saved:
+        interval = base * (1 - saved / received) if received else base
+    elif parser.last_changed_at is None:
+        # No change observed yet, e.g. adaptive mode was just switched on.
+        interval = base
+    else:
+        idle_minutes = (now - parser.last_changed_at).total_seconds() / 60
+        interval = max(base, idle_minutes * ADAPTIVE_IDLE_FRACTION)
+    return int(min(max(interval, lo), hi))
+
+
+def _due_at(
+    parser: Parser, results: list[ParsingResult], now: datetime.datetime
+) -> datetime.datetime:
+    """Moment the parser becomes due: start time, success interval or 15/45 min backoff."""
+
     last_result = results[0] if results else None
     if not last_result:
-        return True
+        return parser.parsing_start_time
 
     if last_result.success:
-        due_at = last_result.date + datetime.timedelta(minutes=parser.parsing_interval)
+        interval = _effective_interval(parser, results, now)
+        due_at = last_result.date + datetime.timedelta(minutes=interval)
     else:
         streak = _failure_streak(results)
         delay = 15 if streak == 1 else 45
         due_at = last_result.date + datetime.timedelta(minutes=delay)
-    return now >= due_at
+    return max(due_at, parser.parsing_start_time)
 
 
-def _match_tags(tags: Iterable[Tag], text: str) -> set[Any]:
-    haystack = text.casefold()
-    return {tag.id for tag in tags if tag.name.casefold() in haystack}
+def _is_due(parser: Parser, results: list[ParsingResult], now: datetime.datetime) -> bool:
+    if not parser.is_active:
+        return False
+    return now >= _due_at(parser, results, now)
 
 
 async def _ingest_items(
     session: AsyncSession,
     parser: Parser,
     items: list[dict[str, Any]],
-    tags: list[Tag],
+    tags: TagCatalog,
+    telemetry: ParserRunTelemetry | None = None,
 ) -> int:
+    telemetry = telemetry or ParserRunTelemetry()
     pub_repo = PublicationRepository(session)
     saved = 0
     now = datetime.datetime.utcnow()
@@ -185,16 +290,21 @@ async def _ingest_items(
     for raw in items:
         normalized = _normalize_item(raw, now)
         if not normalized:
+            telemetry.rejected += 1
             continue
+        started = time.perf_counter()
         duplicate = await pub_repo.exists_duplicate(
             url=normalized.url,
             title=normalized.title,
             company=normalized.company,
             vacancy_created_at=normalized.vacancy_created_at,
         )
+        telemetry.dedup_ms += _elapsed_ms(started)
         if duplicate:
+            telemetry.duplicates += 1
             continue
 
+        started = time.perf_counter()
         pub = Publication(
             title=normalized.title,
             description=normalized.description,
@@ -210,64 +320,148 @@ async def _ingest_items(
         session.add(pub)
         await session.flush()
 
-        tag_ids = _match_tags(tags, f"{normalized.title} {normalized.description}")
+        tag_ids = tags.match(f"{normalized.title} {normalized.description}")
         if tag_ids:
             await pub_repo.add_tags(pub.id, tag_ids)
+        telemetry.insert_ms += _elapsed_ms(started)
 
         saved += 1
+        telemetry.saved_types.add(normalized.type)
+    telemetry.saved = saved
     return saved
 
 
+async def _run_parser(
+    session: AsyncSession,
+    parser: Parser,
+    recent: list[ParsingResult],
+    tags: TagCatalog,
+    settings: Settings,
+    now: datetime.datetime,
+) -> ParserRunStats:
+    success = False
+    received = 0
+    saved = 0
+    telemetry = ParserRunTelemetry()
+    try:
+        publications = PublicationRepository(session)
+        known_urls = await publications.list_urls_by_source(parser.id)
+        watermark = await publications.latest_vacancy_created_at(parser.id)
+        items = await _execute_parser_command(
+            parser.executable_file_path,
+            cwd=settings.parsers_workdir,
+            telemetry=telemetry,
+            known_urls=known_urls,
+            watermark=watermark,
+        )
+        received = len(items)
+        saved = await _ingest_items(session, parser, items, tags, telemetry)
+        parser.last_parsed_at = now
+        if saved:
+            parser.last_changed_at = now
+        success = True
+    except Exception as exc:  # pragma: no cover - network/cmd errors
+        logger.exception("Parser execution failed", extra={"parser_id": str(parser.id)})
+        sentry_sdk.capture_exception(exc)
+
+    result = ParsingResult(
+        date=now,
+        parser_id=parser.id,
+        success=success,
+        received_amount=received,
+        saved_amount=telemetry.saved,
+        duplicate_amount=telemetry.duplicates,
+        rejected_amount=telemetry.rejected,
+        output_bytes=telemetry.output_bytes,
+        spawn_ms=telemetry.spawn_ms,
+        execute_ms=telemetry.execute_ms,
+        decode_ms=telemetry.decode_ms,
+        dedup_ms=telemetry.dedup_ms,
+        insert_ms=telemetry.insert_ms,
+    )
+    session.add(result)
+    parser.next_run_at = _due_at(parser, [result, *recent], now)
+    await session.commit()
+    await bump_search_version(settings.redis_url, telemetry.saved_types)
+    return ParserRunStats(parser_id=str(parser.id), success=success, received=received, saved=saved)
+
+
+async def _claim_and_run(
+    session: AsyncSession,
+    repo: ParserRepository,
+    parser: Parser,
+    tags: TagCatalog,
+    settings: Settings,
+    now: datetime.datetime,
+) -> ParserRunStats | None:
+    """Run ``parser`` if it is due and no other worker has claimed it yet.
+
+    The claim pushes ``next_run_at`` forward by a lease, so a parser dispatched twice
+    (or picked up by a concurrent sweep) runs once; a crashed run is retried after the
+    lease expires. ``next_run_at`` is then set to the real due time.
+    """
+
+    lease_until = now + datetime.timedelta(minutes=PARSER_RUN_LEASE_MINUTES)
+    if not await repo.claim(parser.id, now, lease_until):
+        return None
+    await session.commit()
+
+    recent = await _recent_results(session, parser.id)
+    if not _is_due(parser, recent, now):
+        # next_run_at was unknown (new or edited parser): store it and wait for it.
+        parser.next_run_at = _due_at(parser, recent, now)
+        await session.commit()
+        return None
+    return await _run_parser(session, parser, recent, tags, settings, now)
+
+
 async def run_due_parsers(
     session: AsyncSession, settings: Settings, now: datetime.datetime | None = None
 ) -> list[ParserRunStats]:
     """Run all parsers that are due, persist publications and parsing results."""
 
     repo = ParserRepository(session)
-    tag_repo = TagRepository(session)
-    tags = await tag_repo.get_all()
-    parsers = await repo.list_active()
-    stats: list[ParserRunStats] = []
+    tags = await tag_catalog.get(session, settings.redis_url)
     now = now or datetime.datetime.utcnow()
+    parsers = await repo.list_due(now)
+    stats: list[ParserRunStats] = []
 
     for parser in parsers:
-        recent = await _recent_results(session, parser.id)
-        if not _is_due(parser, recent, now):
-            continue
-
-        success = False
-        received = 0
-        saved = 0
-        try:
-            items = await _execute_parser_command(
-                parser.executable_file_path, cwd=settings.parsers_workdir
-            )
-            received = len(items)
-            saved = await _ingest_items(session, parser, items, tags)
-            parser.last_parsed_at = now
-            success = True
-        except Exception as exc:  # pragma: no cover - network/cmd errors
-            logger.exception("Parser execution failed", extra={"parser_id": str(parser.id)})
-            sentry_sdk.capture_exception(exc)
-
-        session.add(
-            ParsingResult(
-                date=now,
-                parser_id=parser.id,
-                success=success,
-                received_amount=received,
-            )
-        )
-        await session.commit()
-        stats.append(
-            ParserRunStats(
-                parser_id=str(parser.id), success=success, received=received, saved=saved
-            )
-        )
+        run = await _claim_and_run(session, repo, parser, tags, settings, now)
+        if run:
+            stats.append(run)
 
     return stats
 
 
+async def run_parser(
+    session: AsyncSession,
+    settings: Settings,
+    parser_id: UUID,
+    now: datetime.datetime | None = None,
+) -> ParserRunStats | None:
+    """Run a single dispatched parser; no-op if it is not due or already claimed."""
+
+    repo = ParserRepository(session)
+    parser = await repo.get(parser_id)
+    if not parser or not parser.is_active:
+        return None
+    tags = await tag_catalog.get(session, settings.redis_url)
+    return await _claim_and_run(
+        session, repo, parser, tags, settings, now or datetime.datetime.utcnow()
+    )
+
+
+async def list_parser_next_runs(session: AsyncSession) -> list[tuple[datetime.datetime, str]]:
+    """``(next_run_at, parser_id)`` pairs for the dispatcher; unknown times are due now."""
+
+    res = await session.execute(
+        select(Parser.next_run_at, Parser.id).where(Parser.is_active.is_(True))
+    )
+    now = datetime.datetime.utcnow()
+    return [(next_run_at or now, str(parser_id)) for next_run_at, parser_id in res.all()]
+
+
 async def run_parsers_once(
     session_maker: async_sessionmaker[AsyncSession], settings: Settings
 ) -> list[ParserRunStats]:
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import datetime
+from typing import Any, Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import ColumnElement, exists, func, literal, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import defer, selectinload
 
 from itstart_domain import PublicationType
 
@@ -14,12 +16,18 @@ from .config import get_settings
 from .crypto import encrypt_contact_info
 from .dependencies import get_db_session
 from .models import Publication, PublicationTag
+from .pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, KeysetCursor, estimate_count
 from .repositories import AdminAuditRepository, PublicationRepository, TagRepository
-from .schemas import PublicationCreate, PublicationRead
+from .schemas import PublicationCreate, PublicationRead, PublicationSummary, TagRead
+from .search_cache import bump_search_version
 from .tasks import send_publication_with_session
+from .text_search import text_match, text_rank
 
 router = APIRouter(prefix="/admin/publications", tags=["publications"])
 
+LIST_PAGE_SIZE = 50
+LIST_PAGE_SIZE_MAX = 200
+
 
 def _to_utc_naive(dt: datetime.datetime | None) -> datetime.datetime | None:
     """Convert aware datetime to UTC naive to match DB columns.
@@ -62,6 +70,36 @@ def _to_pub_read(pub) -> PublicationRead:
     )
 
 
+def _to_pub_summary(pub: Publication) -> PublicationSummary:
+    return PublicationSummary(
+        id=pub.id,
+        title=pub.title,
+        excerpt=pub.excerpt or "",
+        type=pub.type,
+        company=pub.company,
+        url=pub.url,
+        created_at=pub.created_at,
+        vacancy_created_at=pub.vacancy_created_at,
+        updated_at=pub.updated_at,
+        is_edited=pub.is_edited,
+        is_declined=pub.is_declined,
+        deadline_at=pub.deadline_at,
+        tags=[TagRead.model_validate(pt.tag) for pt in pub.tags if pt.tag],
+        status=pub.status,
+        decline_reason=pub.decline_reason,
+        editor_id=pub.editor_id,
+    )
+
+
+# Columns list views never show; raiseload turns an accidental access into an error
+# instead of one extra query per row.
+_LIST_DEFERRED = (
+    defer(Publication.description, raiseload=True),
+    defer(Publication.contact_info, raiseload=True),
+    defer(Publication.contact_info_encrypted, raiseload=True),
+)
+
+
 @router.post("", response_model=PublicationRead, status_code=201)
 async def create_publication(
     payload: PublicationCreate,
@@ -115,6 +153,7 @@ async def create_publication(
         await repo.add_tags(pub.id, payload.tag_ids)
 
     await session.commit()
+    await bump_search_version(get_settings().redis_url, [pub.type])
     await session.refresh(pub)
     audit.log(
         admin_id=current.id,
@@ -127,30 +166,99 @@ async def create_publication(
     return _to_pub_read(pub)
 
 
-@router.get("", response_model=list[PublicationRead])
+def _tag_filter(tag_ids: list[UUID], match_all: bool):
+    """EXISTS for any of ``tag_ids``; relational division when all of them are required."""
+    tagged = select(PublicationTag.publication_id).where(PublicationTag.tag_id.in_(tag_ids))
+    if not match_all:
+        return exists(tagged.where(PublicationTag.publication_id == Publication.id))
+    wanted = len(set(tag_ids))
+    return Publication.id.in_(
+        tagged.group_by(PublicationTag.publication_id).having(
+            func.count(PublicationTag.tag_id.distinct()) == wanted
+        )
+    )
+
+
+@router.get("", response_model=list[PublicationSummary])
 async def list_publications(
+    response: Response,
     pub_type: PublicationType | None = None,
     status: str | None = None,
     date_from: str | None = None,
     date_to: str | None = None,
-    tag_ids: list[UUID] | None = None,
+    tag_ids: list[UUID] | None = Query(None),
+    tags_match: Literal["any", "all"] = "any",
+    q: str | None = None,
+    cursor: str | None = None,
+    limit: int = Query(LIST_PAGE_SIZE, ge=1, le=LIST_PAGE_SIZE_MAX),
     session: AsyncSession = Depends(get_db_session),
     current=Depends(get_current_admin),
 ):
-    repo = PublicationRepository(session)
-    q = repo.base_query().options(selectinload(repo.model.tags).selectinload(PublicationTag.tag))
+    """
+    One page of summaries, newest first (best text match first with ``q``). The next page is
+    requested with the ``X-Next-Cursor`` response header, absent on the last page;
+    ``X-Total-Count`` is an estimate on PostgreSQL.
+    """
+    terms = q.split() if q else []
+    try:
+        after = KeysetCursor.decode(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+    if after is not None and (after.rank is not None) != bool(terms):
+        raise HTTPException(status_code=400, detail="Cursor does not match the query")
+
+    conditions: list[ColumnElement[bool]] = []
+    if terms:
+        conditions.append(text_match(terms))
     if pub_type:
-        q = q.where(repo.model.type == pub_type)
+        conditions.append(Publication.type == pub_type)
     if status:
-        q = q.where(repo.model.status == status)
+        conditions.append(Publication.status == status)
     if date_from:
-        q = q.where(repo.model.created_at >= date_from)
+        conditions.append(Publication.created_at >= date_from)
     if date_to:
-        q = q.where(repo.model.created_at <= date_to)
+        conditions.append(Publication.created_at <= date_to)
     if tag_ids:
-        q = q.join(repo.model.tags).where(repo.model.tags.tag_id.in_(tag_ids))
-    result = await session.execute(q.order_by(repo.model.created_at.desc()))
-    return [_to_pub_read(p) for p in result.scalars()]
+        conditions.append(_tag_filter(tag_ids, tags_match == "all"))
+
+    rank = text_rank(terms) if terms else None
+    key: list[ColumnElement[Any]] = [Publication.created_at.expression, Publication.id.expression]
+    if after is not None:
+        after_key: list[ColumnElement[Any]] = [literal(after.created_at), literal(after.id)]
+        if rank is not None:
+            key, after_key = [rank, *key], [literal(after.rank), *after_key]
+        page_conditions = [*conditions, tuple_(*key) < tuple_(*after_key)]
+    else:
+        page_conditions = conditions
+
+    order: list[ColumnElement[Any]] = [Publication.created_at.desc(), Publication.id.desc()]
+    if rank is not None:
+        order.insert(0, rank.desc())
+    columns = [Publication] if rank is None else [Publication, rank]
+    query = (
+        select(*columns)
+        .where(*page_conditions)
+        .options(
+            *_LIST_DEFERRED,
+            selectinload(Publication.tags).selectinload(PublicationTag.tag),
+        )
+        .order_by(*order)
+        .limit(limit + 1)
+    )
+    rows = (await session.execute(query)).all()
+
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        response.headers[NEXT_CURSOR_HEADER] = KeysetCursor(
+            created_at=last[0].created_at,
+            id=last[0].id,
+            rank=float(last[1]) if rank is not None else None,
+        ).encode()
+        rows = rows[:limit]
+    if after is None:
+        total = await estimate_count(session, select(Publication.id).where(*conditions))
+        response.headers[TOTAL_COUNT_HEADER] = str(total)
+    return [_to_pub_summary(row[0]) for row in rows]
 
 
 @router.get("/{pub_id}", response_model=PublicationRead)
@@ -159,8 +267,11 @@ async def get_publication(
     session: AsyncSession = Depends(get_db_session),
     current=Depends(get_current_admin),
 ):
-    repo = PublicationRepository(session)
-    pub = await repo.get(pub_id)
+    pub = await session.scalar(
+        select(Publication)
+        .where(Publication.id == pub_id)
+        .options(selectinload(Publication.tags).selectinload(PublicationTag.tag))
+    )
     if not pub:
         raise HTTPException(status_code=404, detail="Not found")
     return _to_pub_read(pub)
@@ -177,8 +288,10 @@ async def delete_publication(
     pub = await repo.get(pub_id)
     if not pub:
         raise HTTPException(status_code=404, detail="Not found")
+    pub_type = pub.type
     await session.delete(pub)
     await session.commit()
+    await bump_search_version(get_settings().redis_url, [pub_type])
     audit.log(
         admin_id=current.id,
         action="delete_publication",
@@ -222,6 +335,7 @@ async def update_publication(
     pub.updated_at = datetime.datetime.utcnow()
     pub.editor_id = current.id
     await session.commit()
+    await bump_search_version(get_settings().redis_url, [pub.type])
     await session.refresh(pub)
     audit.log(
         admin_id=current.id,
@@ -251,6 +365,7 @@ async def decline_publication(
     pub.decline_reason = reason
     pub.editor_id = current.id
     await session.commit()
+    await bump_search_version(get_settings().redis_url, [pub.type])
     audit.log(
         admin_id=current.id,
         action="decline_publication",
@@ -281,6 +396,7 @@ async def approve_and_send(
     await session.commit()
 
     settings = get_settings()
+    await bump_search_version(settings.redis_url, [pub.type])
     await send_publication_with_session(session, settings, pub)
     await session.commit()
 
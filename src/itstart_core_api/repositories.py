@@ -1,10 +1,25 @@
 from __future__ import annotations
 
 import datetime
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
+from typing import Any
+from typing import cast as typing_cast
 from uuid import UUID
 
-from sqlalchemy import and_, or_, select
+from sqlalchemy import (
+    CursorResult,
+    Text,
+    and_,
+    cast,
+    column,
+    delete,
+    func,
+    or_,
+    select,
+    true,
+    update,
+    values,
+)
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -84,6 +99,19 @@ class PublicationRepository(BaseRepository):
     def base_query(self):
         return select(Publication)
 
+    async def list_urls_by_source(self, source_id: UUID) -> list[str]:
+        result = await self.session.execute(
+            select(Publication.url).where(Publication.source_id == source_id)
+        )
+        return list(result.scalars())
+
+    async def latest_vacancy_created_at(self, source_id: UUID) -> datetime.datetime | None:
+        return await self.session.scalar(
+            select(func.max(Publication.vacancy_created_at)).where(
+                Publication.source_id == source_id
+            )
+        )
+
     async def add_tags(self, pub_id: UUID, tag_ids: Iterable[UUID]) -> None:
         for tag_id in tag_ids:
             self.session.add(PublicationTag(publication_id=pub_id, tag_id=tag_id))
@@ -135,10 +163,197 @@ class TgUserRepository(BaseRepository):
             self.session.add(user)
         return user
 
+    def _activate_stmt(self, tg_id: int, now: datetime.datetime):
+        return (
+            insert(TgUser)
+            .values(tg_id=tg_id, register_at=now, is_active=True)
+            .on_conflict_do_update(
+                index_elements=[TgUser.tg_id],
+                set_={"is_active": True, "register_at": now, "refused_at": None},
+            )
+            .returning(TgUser.id)
+        )
+
+    async def activate(self, tg_id: int, now: datetime.datetime) -> UUID:
+        """create_or_activate in one INSERT ... ON CONFLICT DO UPDATE ... RETURNING id."""
+        result = await self.session.execute(self._activate_stmt(tg_id, now))
+        return result.scalar_one()
+
+    async def deactivate(
+        self,
+        tg_id: int,
+        now: datetime.datetime,
+        clear_subscriptions: bool = False,
+    ) -> UUID | None:
+        """
+        Mark the user refused; with ``clear_subscriptions`` also drop their subscriptions
+        and preferences. One statement on PostgreSQL. Returns None for unknown users.
+        """
+        user = (
+            update(TgUser)
+            .where(TgUser.tg_id == tg_id)
+            .values(is_active=False, refused_at=now)
+            .returning(TgUser.id)
+        )
+        if not clear_subscriptions:
+            return (await self.session.execute(user)).scalar_one_or_none()
+        return await _run_for_user(
+            self.session,
+            user,
+            lambda user_id: [
+                delete(UserPreference).where(UserPreference.user_id.in_(user_id)),
+                delete(TgUserSubscription).where(TgUserSubscription.user_id.in_(user_id)),
+            ],
+        )
+
+    async def unsubscribe(
+        self, tg_id: int, pub_types: Iterable[PublicationType], tag_ids: Iterable[UUID]
+    ) -> UUID | None:
+        """Drop subscriptions of ``pub_types`` and preferences for ``tag_ids``."""
+        pub_types, tag_ids = list(pub_types), list(tag_ids)
+
+        def statements(user_id):
+            stmts = []
+            if pub_types:
+                stmts.append(
+                    delete(TgUserSubscription).where(
+                        TgUserSubscription.user_id.in_(user_id),
+                        TgUserSubscription.publication_type.in_(pub_types),
+                    )
+                )
+            if tag_ids:
+                stmts.append(
+                    delete(UserPreference).where(
+                        UserPreference.user_id.in_(user_id), UserPreference.tag_id.in_(tag_ids)
+                    )
+                )
+            return stmts
+
+        return await _run_for_user(
+            self.session, select(TgUser.id).where(TgUser.tg_id == tg_id), statements
+        )
+
+
+def _is_postgres(session: AsyncSession) -> bool:
+    return session.get_bind().dialect.name == "postgresql"
+
+
+async def _run_for_user(
+    session: AsyncSession,
+    user_stmt,
+    statements: Callable[[Any], list],
+) -> UUID | None:
+    """
+    Run ``user_stmt`` (returning one user id) and the statements built from that id.
+
+    On PostgreSQL everything is one statement: ``user_stmt`` and the dependent ones become
+    data-modifying CTEs. ``statements`` gets a one-column selectable of the id there and a
+    one-element list elsewhere, so it should compare with ``in_``.
+    """
+    if _is_postgres(session):
+        user = user_stmt.cte("u")
+        user_id = select(user.c.id)
+        ctes = [stmt.cte(f"s{i}") for i, stmt in enumerate(statements(user_id))]
+        return (await session.execute(user_id.add_cte(*ctes))).scalar_one_or_none()
+
+    found = (await session.execute(user_stmt)).scalar_one_or_none()
+    if found is None:
+        return None
+    for stmt in statements([found]):
+        await session.execute(stmt)
+    return found
+
 
 class SubscriptionRepository(BaseRepository):
     model = TgUserSubscription
 
+    async def subscribe(
+        self,
+        tg_id: int,
+        now: datetime.datetime,
+        pub_types: Iterable[PublicationType],
+        tag_ids: Iterable[UUID],
+    ) -> UUID:
+        """
+        Activate the user, upsert a subscription per type, attach ``tag_ids`` to each of
+        them and to the user's preferences. One statement on PostgreSQL, where the rows
+        inserted by one CTE are only visible through its RETURNING.
+        """
+        pub_types = list(dict.fromkeys(pub_types))
+        tag_ids = list(dict.fromkeys(tag_ids))
+        user_stmt = TgUserRepository(self.session)._activate_stmt(tg_id, now)
+        subs_key = ["user_id", "publication_type"]
+        subs_set = {"deadline_reminder": True}
+
+        if _is_postgres(self.session):
+            user = user_stmt.cte("u")
+            ctes = []
+            type_column = TgUserSubscription.__table__.c.publication_type
+            tag_column = UserPreference.__table__.c.tag_id
+            tags = values(column("tag_id", Text), name="tags").data([(str(t),) for t in tag_ids])
+            if pub_types:
+                types = values(column("publication_type", Text), name="types").data(
+                    [(t.value,) for t in pub_types]
+                )
+                subs = (
+                    insert(TgUserSubscription)
+                    .from_select(
+                        ["user_id", "publication_type", "deadline_reminder"],
+                        select(user.c.id, cast(types.c.publication_type, type_column.type), true())
+                        .select_from(user)
+                        .join(types, true()),
+                        include_defaults=False,
+                    )
+                    .on_conflict_do_update(index_elements=subs_key, set_=subs_set)
+                    .returning(TgUserSubscription.id)
+                    .cte("subs")
+                )
+                ctes.append(subs)
+                if tag_ids:
+                    ctes.append(
+                        insert(TgUserSubscriptionTag)
+                        .from_select(
+                            ["subscription_id", "tag_id"],
+                            select(subs.c.id, cast(tags.c.tag_id, tag_column.type))
+                            .select_from(subs)
+                            .join(tags, true()),
+                        )
+                        .on_conflict_do_nothing()
+                        .cte("sub_tags")
+                    )
+            if tag_ids:
+                ctes.append(
+                    insert(UserPreference)
+                    .from_select(
+                        ["user_id", "tag_id"],
+                        select(user.c.id, cast(tags.c.tag_id, tag_column.type))
+                        .select_from(user)
+                        .join(tags, true()),
+                    )
+                    .on_conflict_do_nothing()
+                    .cte("prefs")
+                )
+            result = await self.session.execute(select(user.c.id).add_cte(*ctes))
+            return result.scalar_one()
+
+        user_id = (await self.session.execute(user_stmt)).scalar_one()
+        if pub_types:
+            result = await self.session.execute(
+                insert(TgUserSubscription)
+                .values([{"user_id": user_id, "publication_type": t} for t in pub_types])
+                .on_conflict_do_update(index_elements=subs_key, set_=subs_set)
+                .returning(TgUserSubscription.id)
+            )
+            sub_ids = result.scalars().all()
+            if tag_ids:
+                await self.session.execute(
+                    insert(TgUserSubscriptionTag)
+                    .values([{"subscription_id": s, "tag_id": t} for s in sub_ids for t in tag_ids])
+                    .on_conflict_do_nothing()
+                )
+        await UserPreferenceRepository(self.session).add(user_id, tag_ids)
+        return user_id
+
     async def upsert_subscription(
         self, user_id: UUID, pub_type: PublicationType, deadline_reminder: bool = True
     ) -> TgUserSubscription:
@@ -270,6 +485,37 @@ class ParserRepository(BaseRepository):
         result = await self.session.execute(select(Parser).where(Parser.is_active.is_(True)))
         return list(result.scalars())
 
+    async def list_due(self, now: datetime.datetime) -> list[Parser]:
+        result = await self.session.execute(
+            select(Parser)
+            .where(
+                Parser.is_active.is_(True),
+                or_(Parser.next_run_at.is_(None), Parser.next_run_at <= now),
+            )
+            .order_by(Parser.next_run_at)
+        )
+        return list(result.scalars())
+
+    async def claim(
+        self, parser_id: UUID, now: datetime.datetime, lease_until: datetime.datetime
+    ) -> bool:
+        """Atomically move a due parser's ``next_run_at`` to ``lease_until``."""
+
+        result = typing_cast(
+            CursorResult[Any],
+            await self.session.execute(
+                update(Parser)
+                .where(
+                    Parser.id == parser_id,
+                    Parser.is_active.is_(True),
+                    or_(Parser.next_run_at.is_(None), Parser.next_run_at <= now),
+                )
+                .values(next_run_at=lease_until)
+                .execution_options(synchronize_session="fetch")
+            ),
+        )
+        return result.rowcount == 1
+
     def base_query(self):
         return select(Parser)
 
@@ -284,6 +530,9 @@ class ParserRepository(BaseRepository):
         parsing_interval: int,
         parsing_start_time: datetime.datetime,
         is_active: bool = True,
+        adaptive_scheduling: bool = False,
+        min_parsing_interval: int | None = None,
+        max_parsing_interval: int | None = None,
     ) -> Parser:
         parser = Parser(
             source_name=source_name,
@@ -292,6 +541,9 @@ class ParserRepository(BaseRepository):
             parsing_interval=parsing_interval,
             parsing_start_time=parsing_start_time,
             is_active=is_active,
+            adaptive_scheduling=adaptive_scheduling,
+            min_parsing_interval=min_parsing_interval,
+            max_parsing_interval=max_parsing_interval,
         )
         self.session.add(parser)
         return parser
@@ -306,6 +558,11 @@ class ParserRepository(BaseRepository):
         parsing_interval: int | None = None,
         parsing_start_time: datetime.datetime | None = None,
         is_active: bool | None = None,
+        adaptive_scheduling: bool | None = None,
+        min_parsing_interval: int | None = None,
+        max_parsing_interval: int | None = None,
+        clear_min_parsing_interval: bool = False,
+        clear_max_parsing_interval: bool = False,
     ) -> Parser:
         if source_name is not None:
             parser.source_name = source_name
@@ -319,6 +576,18 @@ class ParserRepository(BaseRepository):
             parser.parsing_start_time = parsing_start_time
         if is_active is not None:
             parser.is_active = is_active
+        if adaptive_scheduling is not None:
+            parser.adaptive_scheduling = adaptive_scheduling
+        if min_parsing_interval is not None:
+            parser.min_parsing_interval = min_parsing_interval
+        if max_parsing_interval is not None:
+            parser.max_parsing_interval = max_parsing_interval
+        if clear_min_parsing_interval:
+            parser.min_parsing_interval = None
+        if clear_max_parsing_interval:
+            parser.max_parsing_interval = None
+        # Schedule inputs may have changed; the next run recomputes the due time.
+        parser.next_run_at = None
         return parser
 
 
@@ -38,6 +38,27 @@ class PublicationRead(Model):
     editor_id: UUID | None = None
 
 
+class PublicationSummary(Model):
+    """List row: ``PublicationRead`` without description and contacts, plus an excerpt."""
+
+    id: UUID
+    title: str
+    excerpt: str
+    type: PublicationType
+    company: str
+    url: str
+    created_at: datetime
+    vacancy_created_at: datetime
+    updated_at: datetime | None = None
+    is_edited: bool
+    is_declined: bool
+    deadline_at: datetime | None = None
+    tags: list[TagRead] = Field(default_factory=list)
+    status: str
+    decline_reason: str | None = None
+    editor_id: UUID | None = None
+
+
 class PublicationCreate(BaseModel):
     title: str
     description: str
@@ -84,6 +105,11 @@ class ParserRead(Model):
     parsing_start_time: datetime
     last_parsed_at: datetime | None = None
     is_active: bool
+    adaptive_scheduling: bool = False
+    min_parsing_interval: int | None = None
+    max_parsing_interval: int | None = None
+    last_changed_at: datetime | None = None
+    next_run_at: datetime | None = None
 
 
 class ParsingResultRead(Model):
@@ -92,6 +118,15 @@ class ParsingResultRead(Model):
     parser_id: UUID
     success: bool
     received_amount: int
+    saved_amount: int = 0
+    duplicate_amount: int = 0
+    rejected_amount: int = 0
+    output_bytes: int = 0
+    spawn_ms: int | None = None
+    execute_ms: int | None = None
+    decode_ms: int | None = None
+    dedup_ms: int | None = None
+    insert_ms: int | None = None
 
 
 class PublicationScheduleRead(Model):
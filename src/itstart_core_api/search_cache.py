@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import datetime
+import json
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+from uuid import UUID
+
+from itstart_common.redis_client import get_redis
+from itstart_domain import PublicationType
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "search:version:{type}"
+# Freshness comes from the version in the key; the TTL only evicts keys of old versions.
+CACHE_TTL_SEC = 3600
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """What the bot renders for a search result; the same shape on cache hits and misses."""
+
+    title: str
+    company: str | None
+    url: str | None
+    type: PublicationType
+    deadline_at: datetime.datetime | None = None
+
+    @classmethod
+    def from_publication(cls, pub) -> SearchHit:
+        return cls(
+            title=pub.title,
+            company=pub.company,
+            url=pub.url,
+            type=PublicationType(pub.type),
+            deadline_at=pub.deadline_at,
+        )
+
+
+@dataclass(frozen=True)
+class SearchPage:
+    hits: list[SearchHit]
+    # Opaque keyset cursor of the last hit, None on the last page.
+    next_cursor: str | None = None
+
+
+def encode_page(page: SearchPage) -> bytes:
+    """Positional JSON arrays: no repeated field names, no whitespace."""
+    rows = [
+        [
+            h.title,
+            h.company,
+            h.url,
+            h.type.value,
+            h.deadline_at.isoformat() if h.deadline_at else None,
+        ]
+        for h in page.hits
+    ]
+    return json.dumps([page.next_cursor, rows], ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+def decode_page(raw: bytes | str) -> SearchPage:
+    next_cursor, rows = json.loads(raw)
+    hits = [
+        SearchHit(
+            title=title,
+            company=company,
+            url=url,
+            type=PublicationType(pub_type),
+            deadline_at=datetime.datetime.fromisoformat(deadline) if deadline else None,
+        )
+        for title, company, url, pub_type, deadline in rows
+    ]
+    return SearchPage(hits=hits, next_cursor=next_cursor)
+
+
+def version_key(pub_type: PublicationType) -> str:
+    return VERSION_KEY.format(type=PublicationType(pub_type).value)
+
+
+def cache_key(
+    pub_type: PublicationType,
+    version: int,
+    tag_ids: Iterable[UUID],
+    terms: Iterable[str] = (),
+) -> str:
+    tags = "-".join(sorted(str(t) for t in tag_ids))
+    text = " ".join(terms)
+    return f"search:{PublicationType(pub_type).value}:v{version}:{tags}:{text}"
+
+
+async def bump_search_version(redis_url: str | None, types: Iterable[PublicationType]) -> None:
+    """Call after a commit that changed what searches of ``types`` return."""
+    keys = sorted({version_key(t) for t in types})
+    if not redis_url or not keys:
+        return
+    try:
+        async with get_redis(redis_url).pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.incr(key)
+            await pipe.execute()
+    except Exception:
+        logger.warning("Failed to bump search cache version", exc_info=True)
@@ -1,10 +1,9 @@
 from __future__ import annotations
 
 import datetime
-from collections import defaultdict
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func, select
+from sqlalchemy import case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from itstart_domain import AdminRole
@@ -15,6 +14,8 @@ from .models import ParsingResult, Publication, PublicationTag, Tag, TgUser
 
 router = APIRouter(prefix="/admin/stats", tags=["stats"])
 
+PARSER_PHASES = ("spawn", "execute", "decode", "dedup", "insert")
+
 
 def _date_range_filter(
     query, column, date_from: datetime.date | None, date_to: datetime.date | None
@@ -93,21 +94,43 @@ async def parsers_error_percent(
     if current.role != AdminRole.admin:
         raise HTTPException(status_code=403, detail="Forbidden")
 
-    q = select(ParsingResult.parser_id, ParsingResult.success).select_from(ParsingResult)
+    q = select(
+        ParsingResult.parser_id,
+        func.count().label("total"),
+        func.sum(case((ParsingResult.success.is_(False), 1), else_=0)).label("errors"),
+        func.sum(ParsingResult.received_amount).label("received"),
+        func.sum(ParsingResult.saved_amount).label("saved"),
+        func.sum(ParsingResult.duplicate_amount).label("duplicates"),
+        func.sum(ParsingResult.rejected_amount).label("rejected"),
+        func.sum(ParsingResult.output_bytes).label("output_bytes"),
+        *(func.avg(getattr(ParsingResult, f"{phase}_ms")).label(phase) for phase in PARSER_PHASES),
+    ).group_by(ParsingResult.parser_id)
     q = _date_range_filter(q, ParsingResult.date, date_from, date_to)
     rows = (await session.execute(q)).all()
 
-    totals: dict[str, int] = defaultdict(int)
-    errors: dict[str, int] = defaultdict(int)
-    for parser_id, success in rows:
-        totals[parser_id] += 1
-        if not success:
-            errors[parser_id] += 1
     result = []
-    for pid, total in totals.items():
-        err = errors.get(pid, 0)
-        percent = (err / total) * 100 if total else 0
-        result.append({"parser_id": str(pid), "error_percent": percent, "total": total})
+    for row in rows:
+        percent = (row.errors / row.total) * 100 if row.total else 0
+        result.append(
+            {
+                "parser_id": str(row.parser_id),
+                "error_percent": percent,
+                "total": row.total,
+                "received": int(row.received or 0),
+                "saved": int(row.saved or 0),
+                "duplicates": int(row.duplicates or 0),
+                "rejected": int(row.rejected or 0),
+                "output_bytes": int(row.output_bytes or 0),
+                "avg_phase_ms": {
+                    phase: (
+                        round(float(getattr(row, phase)), 1)
+                        if getattr(row, phase) is not None
+                        else None
+                    )
+                    for phase in PARSER_PHASES
+                },
+            }
+        )
     return result
 
 
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from itstart_common.redis_client import get_redis
+from itstart_domain import TagCategory
+
+from .repositories import TagRepository
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "tags:catalog:version"
+CHANNEL = "tags:catalog"
+LISTEN_RETRY_SEC = 5.0
+
+
+@dataclass(frozen=True)
+class TagEntry:
+    id: UUID
+    name: str
+    category: TagCategory
+
+
+@dataclass(frozen=True)
+class TagCatalog:
+    """Immutable snapshot of the ``tag`` table with the lookups the hot paths need."""
+
+    version: int | None
+    entries: tuple[TagEntry, ...]
+    by_name: dict[str, UUID] = field(repr=False)
+    by_id: dict[UUID, TagEntry] = field(repr=False)
+    _matcher: re.Pattern[str] | None = field(repr=False)
+    # name -> ids of all tags whose names are substrings of it ("javascript" -> java, script)
+    _implied: dict[str, frozenset[UUID]] = field(repr=False)
+
+    @classmethod
+    def from_tags(cls, tags: Iterable, version: int | None = None) -> TagCatalog:
+        entries = tuple(TagEntry(id=t.id, name=t.name, category=t.category) for t in tags)
+        by_name = {e.name.lower(): e.id for e in entries}
+        ids_by_key: dict[str, set[UUID]] = {}
+        for e in entries:
+            if e.name:
+                ids_by_key.setdefault(e.name.casefold(), set()).add(e.id)
+
+        keys = sorted(ids_by_key, key=len, reverse=True)
+        implied = {
+            key: frozenset(tag_id for other in keys if other in key for tag_id in ids_by_key[other])
+            for key in keys
+        }
+        # Lookahead at every position, longest name first: together with _implied this
+        # finds exactly the names contained in the text, in one pass.
+        matcher = re.compile("(?=(" + "|".join(re.escape(k) for k in keys) + "))") if keys else None
+        return cls(
+            version=version,
+            entries=entries,
+            by_name=by_name,
+            by_id={e.id: e for e in entries},
+            _matcher=matcher,
+            _implied=implied,
+        )
+
+    def match(self, text: str) -> set[UUID]:
+        """Ids of tags whose name occurs in ``text`` (case-insensitive substring match)."""
+        if self._matcher is None:
+            return set()
+        found: set[UUID] = set()
+        for key in {m.group(1) for m in self._matcher.finditer(text.casefold())}:
+            found |= self._implied[key]
+        return found
+
+
+class TagCatalogCache:
+    """
+    Process-wide TagCatalog. Processes running :meth:`listen` (API, bot) drop the
+    snapshot on a pub/sub message and otherwise never touch Redis or ``tag``; others
+    (Celery workers) compare the snapshot with the Redis version key once per call.
+    Without Redis every call reloads, which is what the code did before the cache.
+    """
+
+    def __init__(self) -> None:
+        self._catalog: TagCatalog | None = None
+        self._listening = False
+        self._generation = 0
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._catalog = None
+
+    async def _remote_version(self, redis_url: str | None) -> int | None:
+        if not redis_url:
+            return None
+        try:
+            return int(await get_redis(redis_url).get(VERSION_KEY) or 0)
+        except Exception:
+            logger.warning("Tag catalog version unavailable", exc_info=True)
+            return None
+
+    async def get(self, session: AsyncSession, redis_url: str | None) -> TagCatalog:
+        catalog = self._catalog
+        if catalog is not None and self._listening:
+            return catalog
+        generation = self._generation
+        # Version first: a change committed during the load bumps it again.
+        version = await self._remote_version(redis_url)
+        if catalog is not None and version is not None and catalog.version == version:
+            return catalog
+        catalog = TagCatalog.from_tags(await TagRepository(session).get_all(), version)
+        # An invalidation that arrived during the load means this snapshot may be stale.
+        if generation == self._generation:
+            self._catalog = catalog
+        return catalog
+
+    async def listen(self, redis_url: str) -> None:
+        """Subscribe to catalog changes until cancelled, reconnecting on errors."""
+        while True:
+            pubsub = None
+            try:
+                pubsub = get_redis(redis_url).pubsub()
+                await pubsub.subscribe(CHANNEL)
+                # Changes made while unsubscribed were missed.
+                self.invalidate()
+                self._listening = True
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.invalidate()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Tag catalog listener disconnected", exc_info=True)
+            finally:
+                self._listening = False
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+            await asyncio.sleep(LISTEN_RETRY_SEC)
+
+
+tag_catalog = TagCatalogCache()
+
+
+async def publish_tags_changed(redis_url: str | None) -> None:
+    """Call after a commit that changed ``tag``: bumps the version and notifies listeners."""
+    tag_catalog.invalidate()
+    if not redis_url:
+        return
+    try:
+        client = get_redis(redis_url)
+        version = await client.incr(VERSION_KEY)
+        await client.publish(CHANNEL, version)
+    except Exception:
+        logger.warning("Failed to publish tag catalog change", exc_info=True)
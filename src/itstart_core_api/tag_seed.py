@@ -3,6 +3,7 @@ from __future__ import annotations
 from itstart_domain import TagCategory
 
 from .repositories import TagRepository
+from .tag_catalog import tag_catalog
 
 SEED_TAGS = {
     # keep lowercase to match user input normalization
@@ -16,10 +17,14 @@ SEED_TAGS = {
 }
 
 
-async def seed_tags(tag_repo: TagRepository) -> None:
-    existing = await tag_repo.get_all()
-    existing_map = {(t.name, t.category) for t in existing}
+async def seed_tags(tag_repo: TagRepository, redis_url: str | None = None) -> int:
+    """Create missing seed tags; returns how many were added (caller commits and publishes)."""
+    catalog = await tag_catalog.get(tag_repo.session, redis_url)
+    existing_map = {(t.name, t.category) for t in catalog.entries}
+    created = 0
     for category, names in SEED_TAGS.items():
         for name in names:
             if (name, category) not in existing_map:
                 tag_repo.create(name=name, category=category)
+                created += 1
+    return created
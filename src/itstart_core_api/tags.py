@@ -8,9 +8,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from itstart_domain import TagCategory
 
 from .auth import get_current_admin
+from .config import Settings, get_settings
 from .dependencies import get_db_session
 from .repositories import TagRepository
 from .schemas import TagRead
+from .tag_catalog import publish_tags_changed
 
 router = APIRouter(prefix="/admin/tags", tags=["tags"])
 
@@ -34,6 +36,7 @@ async def create_tag(
     name: str,
     category: TagCategory,
     session: AsyncSession = Depends(get_db_session),
+    settings: Settings = Depends(get_settings),
     current=Depends(get_current_admin),
 ):
     repo = TagRepository(session)
@@ -42,6 +45,7 @@ async def create_tag(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Tag exists")
     tag = repo.create(name=name, category=category)
     await session.commit()
+    await publish_tags_changed(settings.redis_url)
     await session.refresh(tag)
     return tag
 
@@ -52,6 +56,7 @@ async def update_tag(
     name: str,
     category: TagCategory,
     session: AsyncSession = Depends(get_db_session),
+    settings: Settings = Depends(get_settings),
     current=Depends(get_current_admin),
 ):
     repo = TagRepository(session)
@@ -61,6 +66,7 @@ async def update_tag(
     tag.name = name
     tag.category = category
     await session.commit()
+    await publish_tags_changed(settings.redis_url)
     await session.refresh(tag)
     return tag
 
@@ -69,6 +75,7 @@ async def update_tag(
 async def delete_tag(
     tag_id: UUID,
     session: AsyncSession = Depends(get_db_session),
+    settings: Settings = Depends(get_settings),
     current=Depends(get_current_admin),
 ):
     repo = TagRepository(session)
@@ -77,4 +84,5 @@ async def delete_tag(
         raise HTTPException(status_code=404, detail="Not found")
     await session.delete(tag)
     await session.commit()
+    await publish_tags_changed(settings.redis_url)
     return None
@@ -21,6 +21,7 @@ from .models import (
     TgUserSubscriptionTag,
 )
 from .parsing_service import run_due_parsers
+from .parsing_service import run_parser as run_single_parser
 from .repositories import PublicationRepository
 
 logger = logging.getLogger(__name__)
@@ -212,3 +213,14 @@ async def run_parsers() -> None:
 
     async with Session() as session:
         await run_due_parsers(session, settings)
+
+
+async def run_parser(parser_id: str) -> None:
+    """Entry point for Celery to run one parser enqueued by the beat dispatcher."""
+
+    settings = get_settings()
+    engine = build_engine(settings)
+    Session = build_session_maker(engine)
+
+    async with Session() as session:
+        await run_single_parser(session, settings, UUID(parser_id))
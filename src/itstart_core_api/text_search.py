@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from sqlalchemy import Boolean, Float, Text, literal
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+# ``publication.search_vector`` is a generated tsvector column (see migration
+# 20261019_0015) and is deliberately not mapped: the model is also created on SQLite.
+# The expressions below render to tsquery matching on PostgreSQL and to a
+# case-insensitive substring check elsewhere, which is what the tests run on.
+
+
+class _TextSearch(FunctionElement):
+    inherit_cache = True
+
+    def __init__(self, terms: Iterable[str]):
+        super().__init__(*(literal(term, Text) for term in terms))
+
+
+class text_match(_TextSearch):
+    """``publication`` rows matching all ``terms``."""
+
+    type = Boolean()
+    name = "text_match"
+    inherit_cache = True
+
+
+class text_rank(_TextSearch):
+    """Relevance of a ``publication`` row to ``terms``, higher is better."""
+
+    type = Float()
+    name = "text_rank"
+    inherit_cache = True
+
+
+def _pg_tsquery(element: _TextSearch, compiler, **kw) -> str:
+    text = " || ' ' || ".join(compiler.process(term, **kw) for term in element.clauses)
+    # Stemmed Russian catches word forms, simple catches English words and identifiers.
+    return f"(websearch_to_tsquery('russian', {text}) || websearch_to_tsquery('simple', {text}))"
+
+
+@compiles(text_match, "postgresql")
+def _pg_text_match(element, compiler, **kw):
+    return f"publication.search_vector @@ {_pg_tsquery(element, compiler, **kw)}"
+
+
+@compiles(text_rank, "postgresql")
+def _pg_text_rank(element, compiler, **kw):
+    return f"ts_rank_cd(publication.search_vector, {_pg_tsquery(element, compiler, **kw)})"
+
+
+@compiles(text_match)
+def _fallback_text_match(element, compiler, **kw):
+    document = (
+        "lower(publication.title || ' ' || publication.company || ' ' || publication.description)"
+    )
+    checks = [
+        f"instr({document}, lower({compiler.process(term, **kw)})) > 0" for term in element.clauses
+    ]
+    return "(" + " AND ".join(checks) + ")"
+
+
+@compiles(text_rank)
+def _fallback_text_rank(element, compiler, **kw):
+    return "0.0"
@@ -90,6 +90,11 @@ class Parser(BaseModel):
     parsing_start_time: datetime
     last_parsed_at: datetime | None = None
     is_active: bool = True
+    adaptive_scheduling: bool = False
+    min_parsing_interval: int | None = None
+    max_parsing_interval: int | None = None
+    last_changed_at: datetime | None = None
+    next_run_at: datetime | None = None
 
 
 class ParsingResult(BaseModel):
@@ -98,6 +103,15 @@ class ParsingResult(BaseModel):
     parser_id: UUID
     success: bool
     received_amount: int
+    saved_amount: int = 0
+    duplicate_amount: int = 0
+    rejected_amount: int = 0
+    output_bytes: int = 0
+    spawn_ms: int | None = None
+    execute_ms: int | None = None
+    decode_ms: int | None = None
+    dedup_ms: int | None = None
+    insert_ms: int | None = None
 
 
 class AdminRole(StrEnum):
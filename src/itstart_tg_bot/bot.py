@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import signal
 
 import sentry_sdk
 from aiogram import Bot, Dispatcher, F, Router, types
@@ -10,13 +11,34 @@ from aiogram.enums import ChatMemberStatus
 from aiogram.filters import Command, CommandObject
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
+from aiogram.fsm.storage.base import BaseEventIsolation, BaseStorage
+from aiogram.fsm.storage.memory import MemoryStorage, SimpleEventIsolation
+from aiogram.fsm.storage.redis import RedisStorage
 from aiogram.types import KeyboardButton, ReplyKeyboardMarkup
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from itstart_core_api.tag_catalog import tag_catalog
 from itstart_domain import PublicationType
 
 from .config import Settings, get_settings
 from .db import build_engine, build_session_maker
+from .metrics import (
+    BotApiMetricsMiddleware,
+    HandlerMetricsMiddleware,
+    MeteredStorage,
+    UpdateMetricsMiddleware,
+    start_metrics_server,
+)
+from .middlewares import (
+    ConcurrencyLimitMiddleware,
+    DbSessionMiddleware,
+    ThrottlingMiddleware,
+    instrument_db_time,
+)
 from .service import (
+    SearchCursor,
     block_user,
     get_preferences,
     search_publications,
@@ -24,6 +46,7 @@ from .service import (
     subscribe_tokens,
     unsubscribe_tokens,
 )
+from .throttling import LocalLimiter, RedisGcraLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +74,8 @@ def _format_unsubscribe_success(result: dict) -> str:
     )
 
 
+SEARCH_MORE_PREFIX = "search:more:"
+
 MAIN_MENU = ReplyKeyboardMarkup(
     keyboard=[
         [KeyboardButton(text="📝 Подписаться"), KeyboardButton(text="🚫 Отписаться")],
@@ -75,8 +100,43 @@ SUBSCRIBE_TIP = (
 )
 
 
-def _build_dispatcher() -> Dispatcher:
-    dp = Dispatcher()
+def _build_storage(settings: Settings) -> tuple[BaseStorage, BaseEventIsolation]:
+    if settings.fsm_storage == "redis":
+        storage = RedisStorage.from_url(
+            settings.redis_url,
+            state_ttl=settings.fsm_state_ttl_sec,
+            data_ttl=settings.fsm_state_ttl_sec,
+        )
+        # Апдейты одного пользователя не обрабатываются параллельно даже на разных репликах.
+        return storage, storage.create_isolation()
+    return MemoryStorage(), SimpleEventIsolation()
+
+
+def _build_limiter(settings: Settings, rate: float, burst: int, prefix: str):
+    if rate <= 0:
+        return None
+    if settings.throttle_backend == "redis":
+        return RedisGcraLimiter(settings.redis_url, rate, burst, prefix=prefix)
+    return LocalLimiter(rate, burst)
+
+
+def _build_throttling(settings: Settings) -> ThrottlingMiddleware | None:
+    per_user = _build_limiter(
+        settings, settings.throttle_user_rate, settings.throttle_user_burst, "throttle:user"
+    )
+    global_ = _build_limiter(
+        settings, settings.throttle_global_rate, settings.throttle_global_burst, "throttle"
+    )
+    if per_user is None and global_ is None:
+        return None
+    return ThrottlingMiddleware(per_user, global_)
+
+
+def _build_dispatcher(
+    storage: BaseStorage | None = None,
+    events_isolation: BaseEventIsolation | None = None,
+) -> Dispatcher:
+    dp = Dispatcher(storage=storage or MemoryStorage(), events_isolation=events_isolation)
     router = Router()
 
     class SubscribeStates(StatesGroup):
@@ -108,30 +168,27 @@ def _build_dispatcher() -> Dispatcher:
             "• /subscribe [теги] — подписка (без аргументов запустит мастер)\n"
             "• /unsubscribe [теги] — отписка (без аргументов запустит мастер)\n"
             "• /preferences — показать сохранённые теги\n"
-            "• /jobs /internships /conferences /contests [теги] — быстрый поиск\n\n"
+            "• /jobs /internships /conferences /contests [теги, слова] — быстрый поиск\n\n"
             f"{SUBSCRIBE_TIP}",
             reply_markup=MAIN_MENU,
         )
 
     @router.message(Command("subscribe"))
     async def cmd_subscribe(
-        message: types.Message, command: CommandObject, state: FSMContext
+        message: types.Message, command: CommandObject, state: FSMContext, session: AsyncSession
     ) -> None:
         if message.from_user is None:
             return
-        settings = get_settings()
-        engine = build_engine(settings)
-        Session = build_session_maker(engine)
         args = command.args or ""
         if args.strip():
             # старый быстрый режим через пробелы
             tokens = split_tokens(args)
-            async with Session() as session:
-                try:
-                    result = await subscribe_tokens(session, message.from_user.id, tokens)
-                except ValueError as exc:
-                    await message.answer(f"⚠️ {exc}\n\n{SUBSCRIBE_TIP}", reply_markup=MAIN_MENU)
-                    return
+            try:
+                result = await subscribe_tokens(session, message.from_user.id, tokens)
+            except ValueError as exc:
+                await session.rollback()
+                await message.answer(f"⚠️ {exc}\n\n{SUBSCRIBE_TIP}", reply_markup=MAIN_MENU)
+                return
             await message.answer(
                 _format_subscribe_success(result),
                 reply_markup=MAIN_MENU,
@@ -140,7 +197,7 @@ def _build_dispatcher() -> Dispatcher:
 
         # Пошаговый режим FSM
         await state.set_state(SubscribeStates.choose_types)
-        await state.update_data(types=set(), occupation=None, platform=None, extra=[])
+        await state.update_data(types=[], occupation=None, platform=None, extra=[])
         await message.answer(
             "🔸 Шаг 1/4. Выберите типы публикаций (jobs, internships, conferences, contests).\n"
             "Отправляйте по одному слову. Когда закончите — напишите «далее». Для отмены — «отмена».",
@@ -184,7 +241,7 @@ def _build_dispatcher() -> Dispatcher:
                 chosen.remove(text)
             else:
                 chosen.add(text)
-            await state.update_data(types=chosen)
+            await state.update_data(types=sorted(chosen))
             await message.answer(
                 f"✅ Выбрано: {', '.join(sorted(chosen)) or 'пусто'}. Напишите ещё тип или «далее».",
             )
@@ -232,7 +289,9 @@ def _build_dispatcher() -> Dispatcher:
         )
 
     @router.message(SubscribeStates.extra)
-    async def subscribe_extra(message: types.Message, state: FSMContext) -> None:
+    async def subscribe_extra(
+        message: types.Message, state: FSMContext, session: AsyncSession
+    ) -> None:
         text = (message.text or "").strip()
         if text.lower() == "отмена":
             await state.clear()
@@ -253,16 +312,13 @@ def _build_dispatcher() -> Dispatcher:
 
         if message.from_user is None:
             return
-        settings = get_settings()
-        engine = build_engine(settings)
-        Session = build_session_maker(engine)
-        async with Session() as session:
-            try:
-                result = await subscribe_tokens(session, message.from_user.id, tokens)
-            except ValueError as exc:
-                await message.answer(f"⚠️ {exc}\n\n{SUBSCRIBE_TIP}", reply_markup=MAIN_MENU)
-                await state.clear()
-                return
+        try:
+            result = await subscribe_tokens(session, message.from_user.id, tokens)
+        except ValueError as exc:
+            await session.rollback()
+            await message.answer(f"⚠️ {exc}\n\n{SUBSCRIBE_TIP}", reply_markup=MAIN_MENU)
+            await state.clear()
+            return
         await state.clear()
         await message.answer(
             _format_subscribe_success(result),
@@ -271,17 +327,13 @@ def _build_dispatcher() -> Dispatcher:
 
     @router.message(Command("unsubscribe"))
     async def cmd_unsubscribe(
-        message: types.Message, command: CommandObject, state: FSMContext
+        message: types.Message, command: CommandObject, state: FSMContext, session: AsyncSession
     ) -> None:
         if message.from_user is None:
             return
-        settings = get_settings()
-        engine = build_engine(settings)
-        Session = build_session_maker(engine)
         tokens = split_tokens(command.args or "")
         if tokens:
-            async with Session() as session:
-                result = await unsubscribe_tokens(session, message.from_user.id, tokens)
+            result = await unsubscribe_tokens(session, message.from_user.id, tokens)
             await message.answer(
                 _format_unsubscribe_success(result),
                 reply_markup=MAIN_MENU,
@@ -290,7 +342,7 @@ def _build_dispatcher() -> Dispatcher:
 
         # Пошаговый режим
         await state.set_state(UnsubscribeStates.choose_types)
-        await state.update_data(types=set(), tags=[])
+        await state.update_data(types=[], tags=[])
         await message.answer(
             "Шаг 1/2. Что отключаем: jobs / internships / conferences / contests. "
             "Отправляйте по одному, завершите словом «далее» или напишите «пропустить».",
@@ -325,14 +377,14 @@ def _build_dispatcher() -> Dispatcher:
                     resize_keyboard=True,
                 ),
             )
-            await state.update_data(types=chosen)
+            await state.update_data(types=sorted(chosen))
             return
         if text in allowed:
             if text in chosen:
                 chosen.remove(text)
             else:
                 chosen.add(text)
-            await state.update_data(types=chosen)
+            await state.update_data(types=sorted(chosen))
             await message.answer(
                 f"Выбрано: {', '.join(sorted(chosen)) or 'пусто'}. Добавьте ещё или «далее».",
             )
@@ -342,7 +394,9 @@ def _build_dispatcher() -> Dispatcher:
             )
 
     @router.message(UnsubscribeStates.tags)
-    async def unsubscribe_tags(message: types.Message, state: FSMContext) -> None:
+    async def unsubscribe_tags(
+        message: types.Message, state: FSMContext, session: AsyncSession
+    ) -> None:
         text = (message.text or "").strip()
         if text.lower() == "отмена":
             await state.clear()
@@ -353,11 +407,7 @@ def _build_dispatcher() -> Dispatcher:
         tokens = list(data.get("types", [])) + tags_tokens
         if message.from_user is None:
             return
-        settings = get_settings()
-        engine = build_engine(settings)
-        Session = build_session_maker(engine)
-        async with Session() as session:
-            result = await unsubscribe_tokens(session, message.from_user.id, tokens)
+        result = await unsubscribe_tokens(session, message.from_user.id, tokens)
         await state.clear()
         await message.answer(
             _format_unsubscribe_success(result),
@@ -365,14 +415,10 @@ def _build_dispatcher() -> Dispatcher:
         )
 
     @router.message(Command("preferences"))
-    async def cmd_preferences(message: types.Message) -> None:
+    async def cmd_preferences(message: types.Message, session: AsyncSession) -> None:
         if message.from_user is None:
             return
-        settings = get_settings()
-        engine = build_engine(settings)
-        Session = build_session_maker(engine)
-        async with Session() as session:
-            prefs = await get_preferences(session, message.from_user.id)
+        prefs = await get_preferences(session, message.from_user.id)
         if not prefs:
             await message.answer(
                 "🫙 Предпочтения не заданы. Используйте /subscribe.", reply_markup=MAIN_MENU
@@ -393,71 +439,95 @@ def _build_dispatcher() -> Dispatcher:
         await message.answer("📋 Ваши предпочтения:\n" + "\n".join(lines), reply_markup=MAIN_MENU)
 
     async def handle_search(
-        message: types.Message, pub_type: PublicationType, tokens: list[str]
+        message: types.Message,
+        session: AsyncSession,
+        state: FSMContext,
+        pub_type: PublicationType,
+        tokens: list[str],
+        cursor: SearchCursor | None = None,
     ) -> None:
-        settings = get_settings()
-        engine = build_engine(settings)
-        Session = build_session_maker(engine)
-        async with Session() as session:
-            pubs = await search_publications(session, pub_type, tokens)
-        if not pubs:
+        if cursor is None:
+            # Следующие страницы ищут по тем же тегам; в callback data они не помещаются.
+            await state.update_data(search_tokens=tokens)
+        try:
+            page = await search_publications(session, pub_type, tokens, cursor)
+        except ValueError:
+            await message.answer(
+                "⌛ Эта выдача устарела. Повторите поиск, чтобы листать дальше.",
+                reply_markup=MAIN_MENU,
+            )
+            return
+        if not page.hits:
             await message.answer(
                 "😕 Ничего не нашли. Попробуйте убрать часть тегов или изменить тип публикаций.",
                 reply_markup=MAIN_MENU,
             )
             return
         resp = []
-        for p in pubs:
-            if isinstance(p, dict):
-                resp.append(
-                    f"🔗 <b>{p['title']}</b>\n"
-                    f"🏢 {p.get('company') or '—'}\n"
-                    f"🔗 {p.get('url') or '—'}"
-                )
-            else:
-                icon = {
-                    PublicationType.job: "💼",
-                    PublicationType.internship: "🧑‍🎓",
-                    PublicationType.conference: "🎤",
-                    PublicationType.contest: "🏆",
-                }.get(p.type, "🔗")
-                deadline = (
-                    f"\n🗓 Дедлайн: {p.deadline_at:%d.%m.%Y}"
-                    if getattr(p, "deadline_at", None)
-                    else ""
-                )
-                city = getattr(p, "city", None)
-                location_line = f"📍 {city}\n" if city else ""
-                resp.append(
-                    f"{icon} <b>{p.title}</b>\n"
-                    f"🏢 {getattr(p, 'company', '—')}\n"
-                    f"{location_line}"
-                    f"🔗 {p.url}{deadline}"
-                )
-        await message.answer("\n\n".join(resp[:10]), reply_markup=MAIN_MENU)
+        for p in page.hits:
+            icon = {
+                PublicationType.job: "💼",
+                PublicationType.internship: "🧑‍🎓",
+                PublicationType.conference: "🎤",
+                PublicationType.contest: "🏆",
+            }.get(p.type, "🔗")
+            deadline = f"\n🗓 Дедлайн: {p.deadline_at:%d.%m.%Y}" if p.deadline_at else ""
+            resp.append(
+                f"{icon} <b>{p.title}</b>\n"
+                f"🏢 {p.company or '—'}\n"
+                f"🔗 {p.url or '—'}{deadline}"
+            )
+        markup: types.InlineKeyboardMarkup | ReplyKeyboardMarkup = MAIN_MENU
+        if page.next_cursor:
+            markup = types.InlineKeyboardMarkup(
+                inline_keyboard=[
+                    [
+                        types.InlineKeyboardButton(
+                            text="➡️ Ещё", callback_data=f"{SEARCH_MORE_PREFIX}{page.next_cursor}"
+                        )
+                    ]
+                ]
+            )
+        await message.answer("\n\n".join(resp), reply_markup=markup)
 
     @router.message(Command("jobs"))
-    async def cmd_jobs(message: types.Message, command: CommandObject) -> None:
-        await handle_search(message, PublicationType.job, split_tokens(command.args or ""))
+    async def cmd_jobs(
+        message: types.Message, command: CommandObject, state: FSMContext, session: AsyncSession
+    ) -> None:
+        await handle_search(
+            message, session, state, PublicationType.job, split_tokens(command.args or "")
+        )
 
     @router.message(Command("internships"))
-    async def cmd_internships(message: types.Message, command: CommandObject) -> None:
-        await handle_search(message, PublicationType.internship, split_tokens(command.args or ""))
+    async def cmd_internships(
+        message: types.Message, command: CommandObject, state: FSMContext, session: AsyncSession
+    ) -> None:
+        await handle_search(
+            message, session, state, PublicationType.internship, split_tokens(command.args or "")
+        )
 
     @router.message(Command("conferences"))
-    async def cmd_conferences(message: types.Message, command: CommandObject) -> None:
-        await handle_search(message, PublicationType.conference, split_tokens(command.args or ""))
+    async def cmd_conferences(
+        message: types.Message, command: CommandObject, state: FSMContext, session: AsyncSession
+    ) -> None:
+        await handle_search(
+            message, session, state, PublicationType.conference, split_tokens(command.args or "")
+        )
 
     @router.message(Command("contests"))
-    async def cmd_contests(message: types.Message, command: CommandObject) -> None:
-        await handle_search(message, PublicationType.contest, split_tokens(command.args or ""))
+    async def cmd_contests(
+        message: types.Message, command: CommandObject, state: FSMContext, session: AsyncSession
+    ) -> None:
+        await handle_search(
+            message, session, state, PublicationType.contest, split_tokens(command.args or "")
+        )
 
     @router.callback_query(F.data == "cmd:subscribe")
     async def cb_subscribe(callback: types.CallbackQuery, state: FSMContext) -> None:
         await callback.answer()
         if callback.message:
             await state.set_state(SubscribeStates.choose_types)
-            await state.update_data(types=set(), occupation=None, platform=None, extra=[])
+            await state.update_data(types=[], occupation=None, platform=None, extra=[])
             await callback.message.answer(
                 "🔸 Шаг 1/4. Выберите типы публикаций (jobs, internships, conferences, contests).\n"
                 "Отправляйте по одному слову. Когда закончите — напишите «далее». Для отмены — «отмена».",
@@ -482,13 +552,15 @@ def _build_dispatcher() -> Dispatcher:
             )
 
     @router.callback_query(F.data == "cmd:preferences")
-    async def cb_preferences(callback: types.CallbackQuery) -> None:
+    async def cb_preferences(callback: types.CallbackQuery, session: AsyncSession) -> None:
         await callback.answer()
-        if callback.message:
-            await cmd_preferences(callback.message)
+        if isinstance(callback.message, types.Message):
+            await cmd_preferences(callback.message, session)
 
     @router.callback_query(F.data.startswith("cmd:search:"))
-    async def cb_search(callback: types.CallbackQuery) -> None:
+    async def cb_search(
+        callback: types.CallbackQuery, state: FSMContext, session: AsyncSession
+    ) -> None:
         await callback.answer()
         if not callback.message or not callback.data:
             return
@@ -501,60 +573,83 @@ def _build_dispatcher() -> Dispatcher:
         }
         pub_type = mapping.get(target)
         if pub_type and isinstance(callback.message, types.Message):
-            await handle_search(callback.message, pub_type, [])
+            await handle_search(callback.message, session, state, pub_type, [])
+
+    @router.callback_query(F.data.startswith(SEARCH_MORE_PREFIX))
+    async def cb_search_more(
+        callback: types.CallbackQuery, state: FSMContext, session: AsyncSession
+    ) -> None:
+        await callback.answer()
+        if not isinstance(callback.message, types.Message) or not callback.data:
+            return
+        try:
+            cursor = SearchCursor.decode(callback.data.removeprefix(SEARCH_MORE_PREFIX))
+        except ValueError:
+            return
+        tokens = (await state.get_data()).get("search_tokens") or []
+        await handle_search(callback.message, session, state, cursor.type, tokens, cursor)
 
     # Русскоязычные кнопки-короткие пути
     @router.message(F.text.lower().in_({"📝 подписаться", "подписаться"}))
-    async def btn_subscribe(message: types.Message, state: FSMContext) -> None:
+    async def btn_subscribe(
+        message: types.Message, state: FSMContext, session: AsyncSession
+    ) -> None:
         await cmd_subscribe(
-            message, CommandObject(command="subscribe", prefix="/", args=None), state
+            message, CommandObject(command="subscribe", prefix="/", args=None), state, session
         )
 
     @router.message(F.text.lower().in_({"🚫 отписаться", "отписаться"}))
-    async def btn_unsubscribe(message: types.Message, state: FSMContext) -> None:
+    async def btn_unsubscribe(
+        message: types.Message, state: FSMContext, session: AsyncSession
+    ) -> None:
         await cmd_unsubscribe(
-            message, CommandObject(command="unsubscribe", prefix="/", args=None), state
+            message, CommandObject(command="unsubscribe", prefix="/", args=None), state, session
         )
 
     @router.message(F.text.lower().in_({"📋 предпочтения", "предпочтения"}))
-    async def btn_preferences(message: types.Message) -> None:
-        await cmd_preferences(message)
+    async def btn_preferences(message: types.Message, session: AsyncSession) -> None:
+        await cmd_preferences(message, session)
 
     @router.message(F.text.lower().in_({"💼 вакансии", "вакансии"}))
-    async def btn_jobs(message: types.Message) -> None:
-        await handle_search(message, PublicationType.job, [])
+    async def btn_jobs(message: types.Message, state: FSMContext, session: AsyncSession) -> None:
+        await handle_search(message, session, state, PublicationType.job, [])
 
     @router.message(F.text.lower().in_({"🧑‍🎓 стажировки", "стажировки"}))
-    async def btn_internships(message: types.Message) -> None:
-        await handle_search(message, PublicationType.internship, [])
+    async def btn_internships(
+        message: types.Message, state: FSMContext, session: AsyncSession
+    ) -> None:
+        await handle_search(message, session, state, PublicationType.internship, [])
 
     @router.message(F.text.lower().in_({"🎤 конференции", "конференции"}))
-    async def btn_conferences(message: types.Message) -> None:
-        await handle_search(message, PublicationType.conference, [])
+    async def btn_conferences(
+        message: types.Message, state: FSMContext, session: AsyncSession
+    ) -> None:
+        await handle_search(message, session, state, PublicationType.conference, [])
 
     @router.message(F.text.lower().in_({"🏆 хакатоны", "хакатоны", "контесты", "конкурсы"}))
-    async def btn_contests(message: types.Message) -> None:
-        await handle_search(message, PublicationType.contest, [])
+    async def btn_contests(
+        message: types.Message, state: FSMContext, session: AsyncSession
+    ) -> None:
+        await handle_search(message, session, state, PublicationType.contest, [])
 
     @router.message(F.text.lower().in_({"ℹ️ справка", "справка"}))
     async def btn_help(message: types.Message) -> None:
         await cmd_help(message)
 
     @router.my_chat_member()
-    async def handle_block(update: types.ChatMemberUpdated) -> None:
+    async def handle_block(update: types.ChatMemberUpdated, session: AsyncSession) -> None:
         # React to user blocking the bot or leaving
         if update.new_chat_member.status not in {
             ChatMemberStatus.KICKED,
             ChatMemberStatus.LEFT,
         }:
             return
-        settings = get_settings()
-        engine = build_engine(settings)
-        Session = build_session_maker(engine)
-        async with Session() as session:
-            await block_user(session, update.from_user.id)
+        await block_user(session, update.from_user.id)
 
     dp.include_router(router)
+    # Внутренние middleware родителя применяются и к хендлерам вложенных роутеров.
+    dp.message.middleware(HandlerMetricsMiddleware())
+    dp.callback_query.middleware(HandlerMetricsMiddleware())
     return dp
 
 
@@ -564,6 +659,7 @@ async def run_bot(settings: Settings | None = None) -> None:
         sentry_sdk.init(dsn=settings.sentry_dsn, traces_sample_rate=1.0)
 
     engine = build_engine(settings)
+    instrument_db_time(engine)
     session_maker = build_session_maker(engine)
 
     async with engine.begin() as conn:
@@ -571,11 +667,87 @@ async def run_bot(settings: Settings | None = None) -> None:
     logger.info("DB connectivity OK")
 
     bot = Bot(settings.bot_token, default=DefaultBotProperties(parse_mode="HTML"))
-    dp = _build_dispatcher()
+    bot.session.middleware(BotApiMetricsMiddleware())
+    storage, events_isolation = _build_storage(settings)
+    dp = _build_dispatcher(MeteredStorage(storage), events_isolation)
     dp["session_maker"] = session_maker
-
-    logger.info("Starting Telegram bot")
-    await dp.start_polling(bot)
+    dp.update.outer_middleware(UpdateMetricsMiddleware())
+    # Флуд отсекается до ожидания слота и до открытия сессии БД.
+    throttling = _build_throttling(settings)
+    if throttling is not None:
+        dp.update.outer_middleware(throttling)
+    if settings.max_concurrent_updates > 0:
+        dp.update.outer_middleware(ConcurrencyLimitMiddleware(settings.max_concurrent_updates))
+    dp.update.middleware(DbSessionMiddleware(session_maker))
+
+    metrics_runner = None
+    if settings.metrics_port:
+        metrics_runner = await start_metrics_server(settings.metrics_host, settings.metrics_port)
+        logger.info("Metrics server started", extra={"port": settings.metrics_port})
+
+    # Справочник тегов кэшируется в процессе и сбрасывается по сообщению от админки.
+    tag_listener = asyncio.create_task(tag_catalog.listen(settings.redis_url))
+    try:
+        if settings.bot_mode == "webhook":
+            await _run_webhook(bot, dp, settings)
+        else:
+            logger.info("Starting Telegram bot (polling)")
+            await dp.start_polling(bot)
+    finally:
+        tag_listener.cancel()
+        if metrics_runner is not None:
+            await metrics_runner.cleanup()
+        await dp.storage.close()
+        await engine.dispose()
+
+
+async def _run_webhook(bot: Bot, dp: Dispatcher, settings: Settings) -> None:
+    """aiohttp-сервер для апдейтов; реплики равноправны, вебхук регистрирует каждая (идемпотентно)."""
+    if not settings.webhook_base_url:
+        raise RuntimeError("WEBHOOK_BASE_URL is required when BOT_MODE=webhook")
+    webhook_url = settings.webhook_base_url.rstrip("/") + settings.webhook_path
+
+    async def on_startup(bot: Bot) -> None:
+        await bot.set_webhook(
+            webhook_url,
+            secret_token=settings.webhook_secret,
+            allowed_updates=dp.resolve_used_update_types(),
+        )
+        logger.info("Webhook registered", extra={"url": webhook_url})
+
+    dp.startup.register(on_startup)
+
+    async def healthz(request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok"})
+
+    app = web.Application()
+    app.router.add_get("/healthz", healthz)
+    # Отвечаем Telegram сразу, апдейт обрабатывается фоновой задачей.
+    SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        handle_in_background=True,
+        secret_token=settings.webhook_secret,
+    ).register(app, path=settings.webhook_path)
+    setup_application(app, dp, bot=bot)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, settings.webhook_host, settings.webhook_port)
+    await site.start()
+    logger.info(
+        "Starting Telegram bot (webhook)",
+        extra={"host": settings.webhook_host, "port": settings.webhook_port},
+    )
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        # Реплику гасят по SIGTERM: дорабатываем принятые апдейты и закрываем сервер.
+        loop.add_signal_handler(sig, stop.set)
+    try:
+        await stop.wait()
+    finally:
+        await runner.cleanup()
 
 
 def run() -> None:
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -15,6 +16,28 @@ class Settings(BaseSettings):
     )
     sentry_dsn: str | None = None
     bot_channel_id: str | None = None
+    # polling — один процесс; webhook — aiohttp-сервер, можно держать N реплик за балансировщиком.
+    bot_mode: Literal["polling", "webhook"] = "polling"
+    webhook_base_url: str | None = None
+    webhook_path: str = "/tg/webhook"
+    webhook_secret: str | None = None
+    webhook_host: str = "0.0.0.0"
+    webhook_port: int = 8081
+    # redis — состояние мастеров переживает рестарт и общее для всех реплик.
+    fsm_storage: Literal["memory", "redis"] = "redis"
+    fsm_state_ttl_sec: int = 60 * 60 * 24
+    # Сколько апдейтов один процесс обрабатывает одновременно (0 — без ограничения).
+    max_concurrent_updates: int = 32
+    # Антифлуд (GCRA): запросов в секунду и размер всплеска; rate 0 — без ограничения.
+    # redis — лимиты общие для всех реплик.
+    throttle_backend: Literal["memory", "redis"] = "memory"
+    throttle_user_rate: float = 1.0
+    throttle_user_burst: int = 5
+    throttle_global_rate: float = 30.0
+    throttle_global_burst: int = 60
+    # Prometheus /metrics на отдельном порту (0 — не поднимать).
+    metrics_host: str = "0.0.0.0"
+    metrics_port: int = 9101
 
 
 @lru_cache
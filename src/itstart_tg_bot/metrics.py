@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.dispatcher.event.bases import UNHANDLED
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramConflictError,
+    TelegramEntityTooLarge,
+    TelegramForbiddenError,
+    TelegramNetworkError,
+    TelegramNotFound,
+    TelegramRetryAfter,
+    TelegramServerError,
+    TelegramUnauthorizedError,
+)
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+from aiogram.methods import TelegramMethod
+from aiogram.types import CallbackQuery, Message, TelegramObject, Update
+from aiohttp import web
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+UPDATE_DB_SECONDS = Histogram(
+    "bot_update_db_seconds",
+    "Time spent in DB queries while handling one update",
+    ["update_type"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+UPDATES_THROTTLED = Counter(
+    "bot_updates_throttled_total",
+    "Updates dropped by flood control",
+    ["scope"],
+)
+UPDATES_RECEIVED = Counter(
+    "bot_updates_received_total", "Updates received from Telegram", ["update_type"]
+)
+UPDATES_PROCESSED = Counter(
+    "bot_updates_processed_total",
+    "Updates that finished processing (handled, unhandled or error)",
+    ["update_type", "result"],
+)
+HANDLER_SECONDS = Histogram(
+    "bot_handler_seconds",
+    "Handler latency by command or callback data prefix",
+    ["handler"],
+    buckets=_LATENCY_BUCKETS,
+)
+FSM_TRANSITIONS = Counter(
+    "bot_fsm_transitions_total", "FSM state changes", ["from_state", "to_state"]
+)
+SEARCH_CACHE = Counter(
+    "bot_search_cache_total", "Search cache lookups (hit, miss, error)", ["result"]
+)
+BOT_API_SECONDS = Histogram(
+    "bot_api_request_seconds",
+    "Outgoing Bot API call latency",
+    ["method"],
+    buckets=_LATENCY_BUCKETS,
+)
+BOT_API_ERRORS = Counter(
+    "bot_api_errors_total", "Failed Bot API calls by error code", ["method", "code"]
+)
+
+_ERROR_CODES: tuple[tuple[type[Exception], str], ...] = (
+    (TelegramRetryAfter, "429"),
+    (TelegramBadRequest, "400"),
+    (TelegramUnauthorizedError, "401"),
+    (TelegramForbiddenError, "403"),
+    (TelegramNotFound, "404"),
+    (TelegramConflictError, "409"),
+    (TelegramEntityTooLarge, "413"),
+    (TelegramServerError, "5xx"),
+    (TelegramNetworkError, "network"),
+)
+
+
+def update_type(event: TelegramObject) -> str:
+    if not isinstance(event, Update):
+        return type(event).__name__.lower()
+    try:
+        return event.event_type
+    except LookupError:
+        return "unknown"
+
+
+def handler_label(event: TelegramObject) -> str:
+    """``/command`` for commands, the first two ``:`` parts of callback data, else the type."""
+    if isinstance(event, Message):
+        text = event.text or ""
+        if text.startswith("/"):
+            return text.split(maxsplit=1)[0].split("@", 1)[0].lower()
+        return "message"
+    if isinstance(event, CallbackQuery):
+        return ":".join((event.data or "").split(":", 2)[:2]) or "callback"
+    return type(event).__name__.lower()
+
+
+def _error_code(exc: Exception) -> str:
+    for exc_type, code in _ERROR_CODES:
+        if isinstance(exc, exc_type):
+            return code
+    return type(exc).__name__
+
+
+class UpdateMetricsMiddleware(BaseMiddleware):
+    """Outer update middleware: counts received updates and how each one ended."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        kind = update_type(event)
+        UPDATES_RECEIVED.labels(update_type=kind).inc()
+        result = "error"
+        try:
+            response = await handler(event, data)
+            result = "unhandled" if response is UNHANDLED else "handled"
+            return response
+        finally:
+            UPDATES_PROCESSED.labels(update_type=kind, result=result).inc()
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """
+    Inner message/callback middleware, so it only sees updates a handler matched and the
+    label set stays bounded by the commands and buttons the bot defines.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            HANDLER_SECONDS.labels(handler=handler_label(event)).observe(
+                time.perf_counter() - started
+            )
+
+
+class BotApiMetricsMiddleware(BaseRequestMiddleware):
+    """Bot session middleware timing every Bot API call and counting failures."""
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[Any],
+        bot: Bot,
+        method: TelegramMethod[Any],
+    ) -> Any:
+        name = method.__api_method__
+        started = time.perf_counter()
+        try:
+            return await make_request(bot, method)
+        except Exception as exc:
+            BOT_API_ERRORS.labels(method=name, code=_error_code(exc)).inc()
+            raise
+        finally:
+            BOT_API_SECONDS.labels(method=name).observe(time.perf_counter() - started)
+
+
+def _state_name(state: StateType) -> str:
+    if isinstance(state, State):
+        state = state.state
+    return state or "none"
+
+
+class MeteredStorage(BaseStorage):
+    """
+    FSM storage wrapper counting state transitions. Reads the previous state only when a
+    state is set, which happens on wizard steps, not on every update.
+    """
+
+    def __init__(self, storage: BaseStorage) -> None:
+        self.storage = storage
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        previous = await self.storage.get_state(key)
+        await self.storage.set_state(key, state)
+        if _state_name(previous) != _state_name(state):
+            FSM_TRANSITIONS.labels(
+                from_state=_state_name(previous), to_state=_state_name(state)
+            ).inc()
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        return await self.storage.get_state(key)
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        await self.storage.set_data(key, data)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        return await self.storage.get_data(key)
+
+    async def close(self) -> None:
+        await self.storage.close()
+
+
+async def start_metrics_server(host: str, port: int) -> web.AppRunner:
+    """Serve ``/metrics`` on a side port, separate from the webhook server."""
+
+    async def metrics(request: web.Request) -> web.Response:
+        response = web.Response(body=generate_latest())
+        response.content_type = CONTENT_TYPE_LATEST.split(";")[0]
+        return response
+
+    app = web.Application()
+    app.router.add_get("/metrics", metrics)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
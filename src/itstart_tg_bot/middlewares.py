@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from typing import Any, Protocol
+
+from aiogram import BaseMiddleware
+from aiogram.types import CallbackQuery, Message, TelegramObject, Update, User
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from .metrics import UPDATE_DB_SECONDS, UPDATES_THROTTLED, update_type
+from .throttling import GcraLimiter
+
+logger = logging.getLogger(__name__)
+
+# Accumulated query time of the update being handled; None outside DbSessionMiddleware.
+_update_db_time: ContextVar[list[float] | None] = ContextVar("update_db_time", default=None)
+
+
+def instrument_db_time(engine: AsyncEngine) -> None:
+    """Add every cursor execution on the engine to the current update's DB time."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany) -> None:
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        spent = _update_db_time.get()
+        if spent is not None:
+            spent[0] += elapsed
+
+
+class DbSessionMiddleware(BaseMiddleware):
+    """
+    Opens one AsyncSession per update from the shared pool and passes it to handlers
+    as ``session``. Commits when the handler returns, rolls back when it raises.
+    """
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession]) -> None:
+        self.session_maker = session_maker
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        spent = [0.0]
+        token = _update_db_time.set(spent)
+        try:
+            async with self.session_maker() as session:
+                data["session"] = session
+                try:
+                    result = await handler(event, data)
+                except Exception:
+                    await session.rollback()
+                    raise
+                await session.commit()
+                return result
+        finally:
+            _update_db_time.reset(token)
+            kind = update_type(event)
+            UPDATE_DB_SECONDS.labels(update_type=kind).observe(spent[0])
+            logger.debug("Update %s spent %.4fs in DB", kind, spent[0])
+
+
+class ConcurrencyLimitMiddleware(BaseMiddleware):
+    """Caps how many updates this process handles at once; the rest wait for a slot."""
+
+    def __init__(self, limit: int) -> None:
+        self._slots = asyncio.Semaphore(limit)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        async with self._slots:
+            return await handler(event, data)
+
+
+class Limiter(Protocol):
+    async def allow(self, key: object) -> bool: ...
+
+
+THROTTLED_TEXT = "⏳ Слишком много запросов. Подождите немного и повторите."
+# At most one "slow down" notice per user per this many seconds.
+THROTTLE_NOTICE_INTERVAL_SEC = 10.0
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """
+    Drops messages and callback queries over the per-user or the global bucket before
+    they reach the DB session. Dropped users get a fixed notice, at most once per
+    THROTTLE_NOTICE_INTERVAL_SEC; drops are counted in ``bot_updates_throttled_total``.
+    """
+
+    def __init__(self, per_user: Limiter | None, global_: Limiter | None) -> None:
+        self.per_user = per_user
+        self.global_ = global_
+        self._notices = GcraLimiter(1 / THROTTLE_NOTICE_INTERVAL_SEC, 1)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        user: User | None = data.get("event_from_user")
+        target = (event.message or event.callback_query) if isinstance(event, Update) else event
+        if user is None or not isinstance(target, Message | CallbackQuery):
+            # Membership changes and other service updates are never dropped.
+            return await handler(event, data)
+
+        scope = None
+        if self.per_user is not None and not await self.per_user.allow(user.id):
+            scope = "user"
+        elif self.global_ is not None and not await self.global_.allow("global"):
+            scope = "global"
+        if scope is None:
+            return await handler(event, data)
+
+        UPDATES_THROTTLED.labels(scope=scope).inc()
+        if isinstance(target, CallbackQuery):
+            # Callback queries must be answered anyway, or the button keeps spinning.
+            await target.answer(THROTTLED_TEXT if self._notices.allow(user.id) else None)
+        elif self._notices.allow(user.id):
+            await target.answer(THROTTLED_TEXT)
+        return None
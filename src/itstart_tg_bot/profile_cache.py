@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from itstart_common.redis_client import get_redis
+from itstart_core_api import models
+from itstart_domain import PublicationType
+
+logger = logging.getLogger(__name__)
+
+PROFILE_KEY = "bot:profile:{tg_id}"
+# Stored for tg ids without a tg_user row, so unknown users don't reach the DB either.
+_MISSING = b"0"
+
+
+@dataclass(frozen=True)
+class UserProfile:
+    """What the bot needs to know about a Telegram user without touching the DB."""
+
+    id: UUID
+    is_active: bool
+    types: frozenset[PublicationType] = frozenset()
+    tag_ids: frozenset[UUID] = frozenset()
+
+    def encode(self) -> bytes:
+        row = [
+            self.id.hex,
+            int(self.is_active),
+            sorted(t.value for t in self.types),
+            sorted(t.hex for t in self.tag_ids),
+        ]
+        return json.dumps(row, separators=(",", ":")).encode()
+
+    @classmethod
+    def decode(cls, raw: bytes) -> UserProfile:
+        user_id, is_active, types, tag_ids = json.loads(raw)
+        return cls(
+            id=UUID(user_id),
+            is_active=bool(is_active),
+            types=frozenset(PublicationType(t) for t in types),
+            tag_ids=frozenset(UUID(t) for t in tag_ids),
+        )
+
+
+async def load_profile(session: AsyncSession, tg_id: int) -> UserProfile | None:
+    user = (
+        await session.execute(
+            select(models.TgUser.id, models.TgUser.is_active).where(models.TgUser.tg_id == tg_id)
+        )
+    ).one_or_none()
+    if user is None:
+        return None
+    types = await session.scalars(
+        select(models.TgUserSubscription.publication_type).where(
+            models.TgUserSubscription.user_id == user.id
+        )
+    )
+    tag_ids = await session.scalars(
+        select(models.UserPreference.tag_id).where(models.UserPreference.user_id == user.id)
+    )
+    return UserProfile(
+        id=user.id, is_active=user.is_active, types=frozenset(types), tag_ids=frozenset(tag_ids)
+    )
+
+
+class ProfileCache:
+    """
+    tg_id -> UserProfile in a per-process LRU backed by Redis, loaded from the DB on a
+    miss in both. Writers (subscribe, unsubscribe, block) must :meth:`invalidate` the
+    entry after their commit rather than write a profile they assembled themselves, so
+    the next read reloads what was committed. Another replica may serve its own LRU copy
+    for up to ``local_ttl`` seconds after a write.
+    """
+
+    def __init__(
+        self, maxsize: int = 10_000, local_ttl: float = 30.0, redis_ttl: int = 60 * 60 * 24
+    ) -> None:
+        self.maxsize = maxsize
+        self.local_ttl = local_ttl
+        self.redis_ttl = redis_ttl
+        self._local: OrderedDict[int, tuple[float, UserProfile | None]] = OrderedDict()
+
+    def clear(self) -> None:
+        self._local.clear()
+
+    def _remember(self, tg_id: int, profile: UserProfile | None) -> None:
+        self._local[tg_id] = (time.monotonic() + self.local_ttl, profile)
+        self._local.move_to_end(tg_id)
+        while len(self._local) > self.maxsize:
+            self._local.popitem(last=False)
+
+    async def get(
+        self, session: AsyncSession, tg_id: int, redis_url: str | None
+    ) -> UserProfile | None:
+        entry = self._local.get(tg_id)
+        if entry is not None and entry[0] > time.monotonic():
+            self._local.move_to_end(tg_id)
+            return entry[1]
+
+        if redis_url:
+            try:
+                raw = await get_redis(redis_url).get(PROFILE_KEY.format(tg_id=tg_id))
+            except Exception:
+                logger.warning("Profile cache unavailable", exc_info=True)
+                raw = None
+            if raw is not None:
+                profile = None if raw == _MISSING else UserProfile.decode(raw)
+                self._remember(tg_id, profile)
+                return profile
+
+        profile = await load_profile(session, tg_id)
+        await self.put(tg_id, profile, redis_url)
+        return profile
+
+    async def put(self, tg_id: int, profile: UserProfile | None, redis_url: str | None) -> None:
+        self._remember(tg_id, profile)
+        if not redis_url:
+            return
+        key = PROFILE_KEY.format(tg_id=tg_id)
+        try:
+            raw = _MISSING if profile is None else profile.encode()
+            await get_redis(redis_url).set(key, raw, ex=self.redis_ttl)
+        except Exception:
+            logger.warning("Failed to write profile cache", exc_info=True)
+
+    async def invalidate(self, tg_id: int, redis_url: str | None) -> None:
+        self._local.pop(tg_id, None)
+        if not redis_url:
+            return
+        try:
+            await get_redis(redis_url).delete(PROFILE_KEY.format(tg_id=tg_id))
+        except Exception:
+            logger.warning("Failed to invalidate profile cache", exc_info=True)
+
+
+profile_cache = ProfileCache()
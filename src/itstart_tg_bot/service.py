@@ -1,24 +1,35 @@
 from __future__ import annotations
 
+import base64
 import datetime
-import json
+import hashlib
+import struct
 from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
 from uuid import UUID
 
-import redis.asyncio as redis
-from sqlalchemy import delete, func
+from sqlalchemy import ColumnElement, func, literal, select, tuple_
 
+from itstart_common.redis_client import get_redis
 from itstart_core_api import models
-from itstart_core_api.repositories import (
-    PublicationRepository,
-    SubscriptionRepository,
-    TagRepository,
-    TgUserRepository,
-    UserPreferenceRepository,
+from itstart_core_api.repositories import SubscriptionRepository, TgUserRepository
+from itstart_core_api.search_cache import (
+    CACHE_TTL_SEC,
+    SearchHit,
+    SearchPage,
+    cache_key,
+    decode_page,
+    encode_page,
+    version_key,
 )
+from itstart_core_api.tag_catalog import TagCatalog, tag_catalog
+from itstart_core_api.text_search import text_match, text_rank
 from itstart_domain import PublicationType
 
 from .config import get_settings
+from .metrics import SEARCH_CACHE
+from .profile_cache import profile_cache
 
 
 def split_tokens(text: str) -> list[str]:
@@ -26,12 +37,13 @@ def split_tokens(text: str) -> list[str]:
 
 
 def parse_tokens(
-    tokens: Iterable[str], tags: list
+    tokens: Iterable[str], tags: TagCatalog | list
 ) -> tuple[list[PublicationType], list[UUID], list[str]]:
     pub_types: list[PublicationType] = []
     tag_ids: list[UUID] = []
     unknown: list[str] = []
-    tag_lookup = {t.name.lower(): t.id for t in tags}
+    catalog = tags if isinstance(tags, TagCatalog) else TagCatalog.from_tags(tags)
+    tag_lookup = catalog.by_name
     for token in tokens:
         if token in ("jobs", "job"):
             pub_types.append(PublicationType.job)
@@ -57,171 +69,235 @@ def parse_tokens(
     return list(set(pub_types)), list(set(tag_ids)), unknown
 
 
-async def ensure_user(session, tg_id: int):
-    user_repo = TgUserRepository(session)
-    now = datetime.datetime.utcnow()
-    return await user_repo.create_or_activate(tg_id, now)
-
-
 async def subscribe_tokens(session, tg_id: int, tokens: Iterable[str]):
-    tag_repo = TagRepository(session)
-    tags = await tag_repo.get_all()
+    redis_url = get_settings().redis_url
+    tags = await tag_catalog.get(session, redis_url)
     pub_types, tag_ids, unknown = parse_tokens(tokens, tags)
 
-    user = await ensure_user(session, tg_id)
-    await session.flush()  # ensure user.id is available
-
-    sub_repo = SubscriptionRepository(session)
-    pref_repo = UserPreferenceRepository(session)
-
     if not pub_types:
         raise ValueError("Укажите тип публикаций: jobs, internships или conferences.")
 
-    target_types = pub_types
-
-    for ptype in target_types:
-        sub = await sub_repo.upsert_subscription(user.id, ptype)
-        await session.flush()
-        await sub_repo.add_tags(sub.id, tag_ids)
-
-    await pref_repo.add(user.id, tag_ids)
+    now = datetime.datetime.utcnow()
+    await SubscriptionRepository(session).subscribe(tg_id, now, pub_types, tag_ids)
     await session.commit()
-    return {"types": target_types, "tags": tag_ids, "unknown": unknown}
+    await profile_cache.invalidate(tg_id, redis_url)
+    return {"types": pub_types, "tags": tag_ids, "unknown": unknown}
 
 
 async def unsubscribe_tokens(session, tg_id: int, tokens: Iterable[str]):
-    tag_repo = TagRepository(session)
-    tags = await tag_repo.get_all()
+    redis_url = get_settings().redis_url
+    tags = await tag_catalog.get(session, redis_url)
     pub_types, tag_ids, unknown = parse_tokens(tokens, tags)
-
     user_repo = TgUserRepository(session)
-    user = await user_repo.get_by_tg_id(tg_id)
-    if not user:
+
+    if not tokens:
+        # full unsubscribe: mark inactive, subscriptions are kept for a later re-subscribe
+        user_id = await user_repo.deactivate(tg_id, datetime.datetime.utcnow())
+    else:
+        # partial remove tags from subscriptions and preferences
+        user_id = await user_repo.unsubscribe(tg_id, pub_types, tag_ids)
+    if user_id is None:
         return {"removed_types": [], "removed_tags": [], "unknown": tokens}
+    await session.commit()
+    await profile_cache.invalidate(tg_id, redis_url)
 
     if not tokens:
-        # full unsubscribe
-        user.is_active = False
-        user.refused_at = datetime.datetime.utcnow()
-        # Clearing preferences/subscriptions would require cascading; simplest is to mark inactive.
-        await session.commit()
         return {"removed_types": ["all"], "removed_tags": ["all"], "unknown": []}
-
-    # partial remove tags from subscriptions and preferences
-    removed_types = []
-    removed_tags = []
-
-    if pub_types:
-        await session.execute(
-            delete(SubscriptionRepository(session).model).where(
-                SubscriptionRepository(session).model.user_id == user.id,
-                SubscriptionRepository(session).model.publication_type.in_(pub_types),
-            )
-        )
-        removed_types = pub_types
-
-    if tag_ids:
-        # delete from user_preferences
-        await session.execute(
-            delete(UserPreferenceRepository(session).model).where(
-                UserPreferenceRepository(session).model.user_id == user.id,
-                UserPreferenceRepository(session).model.tag_id.in_(tag_ids),
-            )
-        )
-        removed_tags = tag_ids
-
-    await session.commit()
-    return {"removed_types": removed_types, "removed_tags": removed_tags, "unknown": unknown}
+    return {"removed_types": pub_types, "removed_tags": tag_ids, "unknown": unknown}
 
 
 async def get_preferences(session, tg_id: int):
-    user_repo = TgUserRepository(session)
-    user = await user_repo.get_by_tg_id(tg_id)
-    if not user:
+    """Preference tag names by category; no DB queries while the profile is cached."""
+    redis_url = get_settings().redis_url
+    profile = await profile_cache.get(session, tg_id, redis_url)
+    if profile is None:
         return {}
-    q = (
-        TagRepository(session)
-        .base_query()
-        .join(
-            UserPreferenceRepository(session).model,
-            UserPreferenceRepository(session).model.tag_id == TagRepository(session).model.id,
-        )
-        .where(UserPreferenceRepository(session).model.user_id == user.id)
-    )
-    rows = (await session.execute(q)).scalars().all()
+    catalog = await tag_catalog.get(session, redis_url)
     grouped: dict[models.TagCategory, list[str]] = {}
-    for t in rows:
-        grouped.setdefault(t.category, []).append(t.name)
+    for tag_id in profile.tag_ids:
+        tag = catalog.by_id.get(tag_id)
+        if tag:
+            grouped.setdefault(tag.category, []).append(tag.name)
     return grouped
 
 
-async def search_publications(session, pub_type: PublicationType, tokens: Iterable[str]):
-    tag_repo = TagRepository(session)
-    tags = await tag_repo.get_all()
-    _, tag_ids, _ = parse_tokens(tokens, tags)
+SEARCH_PAGE_SIZE = 10
+_EPOCH = datetime.datetime(1970, 1, 1)
+_PUBLICATION_TYPES = list(PublicationType)
+# type index, text rank, created_at in microseconds, id, digest of the tag and text filter
+_CURSOR = struct.Struct(">Bdq16s4s")
+
+
+def _filter_digest(tag_ids: Iterable[UUID], terms: Iterable[str]) -> bytes:
+    key = "-".join(sorted(str(t) for t in tag_ids)) + ":" + " ".join(terms)
+    return hashlib.sha1(key.encode()).digest()[:4]
 
-    cache_key = None
-    cache_client = None
-    try:
-        cache_client = redis.from_url(get_settings().redis_url, decode_responses=True)
-        cache_key = f"search:{pub_type}:{'-'.join(sorted([str(t) for t in tag_ids]))}"
-        if cache_client:
-            cached = await cache_client.get(cache_key)
-            if cached:
-                data = json.loads(cached)
-                # Return lightweight dicts to avoid ORM session issues
-                return data
-    except Exception:
-        cache_client = None
 
-    repo = PublicationRepository(session)
-    base_filters = [repo.model.type == pub_type, repo.model.is_declined.is_(False)]
+@dataclass(frozen=True)
+class SearchCursor:
+    """Keyset position (rank, created_at, id) of the last shown hit; fits into callback data."""
 
-    q = repo.base_query().where(*base_filters)
+    type: PublicationType
+    rank: float
+    created_at: datetime.datetime
+    id: UUID
+    filter_digest: bytes
 
+    def encode(self) -> str:
+        micros = (self.created_at - _EPOCH) // datetime.timedelta(microseconds=1)
+        raw = _CURSOR.pack(
+            _PUBLICATION_TYPES.index(self.type),
+            self.rank,
+            micros,
+            self.id.bytes,
+            self.filter_digest,
+        )
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> SearchCursor:
+        try:
+            raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+            type_index, rank, micros, id_bytes, digest = _CURSOR.unpack(raw)
+            return cls(
+                type=_PUBLICATION_TYPES[type_index],
+                rank=rank,
+                created_at=_EPOCH + datetime.timedelta(microseconds=micros),
+                id=UUID(bytes=id_bytes),
+                filter_digest=digest,
+            )
+        except (ValueError, IndexError, struct.error) as exc:
+            raise ValueError("Invalid search cursor") from exc
+
+
+async def _fetch_search_page(
+    session,
+    pub_type: PublicationType,
+    tag_ids: list[UUID],
+    terms: list[str],
+    after: SearchCursor | None,
+) -> SearchPage:
+    model = models.Publication
+    # Without text the keyset walk only touches (type, created_at, id, is_declined), all of
+    # which are in idx_publication_type_created_at; the row data is read for the page's ids
+    # only. Text searches go through the GIN index and are ordered by rank first.
+    rank = text_rank(terms) if terms else None
+    order: list[ColumnElement[Any]] = [model.created_at.desc(), model.id.desc()]
+    if rank is not None:
+        order.insert(0, rank.desc())
+
+    ids = select(model.id).where(model.type == pub_type, model.is_declined.is_(False))
+    if terms:
+        ids = ids.where(text_match(terms))
+    if after is not None:
+        if rank is not None:
+            ids = ids.where(
+                tuple_(rank, model.created_at, model.id)
+                < tuple_(literal(after.rank), literal(after.created_at), literal(after.id))
+            )
+        else:
+            ids = ids.where(
+                tuple_(model.created_at, model.id)
+                < tuple_(literal(after.created_at), literal(after.id))
+            )
     if tag_ids:
         # Require all specified tags to be present on the publication
-        q = (
-            q.join(models.PublicationTag, models.PublicationTag.publication_id == repo.model.id)
+        ids = (
+            ids.join(models.PublicationTag, models.PublicationTag.publication_id == model.id)
             .where(models.PublicationTag.tag_id.in_(tag_ids))
-            .group_by(repo.model.id)
+            .group_by(model.id)
             .having(func.count(func.distinct(models.PublicationTag.tag_id)) == len(tag_ids))
         )
+    ids = ids.order_by(*order).limit(SEARCH_PAGE_SIZE + 1)
+
+    result = await session.execute(
+        select(
+            model.id,
+            model.created_at,
+            model.title,
+            model.company,
+            model.url,
+            model.type,
+            model.deadline_at,
+            (rank if rank is not None else literal(0.0)).label("rank"),
+        )
+        .where(model.id.in_(ids.scalar_subquery()))
+        .order_by(*order)
+    )
+    rows = list(result)
+    next_cursor = None
+    if len(rows) > SEARCH_PAGE_SIZE:
+        rows = rows[:SEARCH_PAGE_SIZE]
+        last = rows[-1]
+        next_cursor = SearchCursor(
+            type=pub_type,
+            rank=float(last.rank),
+            created_at=last.created_at,
+            id=last.id,
+            filter_digest=_filter_digest(tag_ids, terms),
+        ).encode()
+    return SearchPage(hits=[SearchHit.from_publication(r) for r in rows], next_cursor=next_cursor)
+
+
+async def search_publications(
+    session,
+    pub_type: PublicationType,
+    tokens: Iterable[str],
+    cursor: SearchCursor | None = None,
+) -> SearchPage:
+    """
+    One page of ``pub_type`` publications matching the ``tokens``, best first. Tokens
+    naming a tag must all be tagged; any other token is matched as text, and then
+    results are ranked by relevance instead of only by date.
+
+    ``cursor`` is the ``next_cursor`` of the previous page; it must come from a search
+    with the same type and tokens, otherwise ValueError is raised.
+    """
+    redis_url = get_settings().redis_url
+    tags = await tag_catalog.get(session, redis_url)
+    _, tag_ids, terms = parse_tokens(tokens, tags)
+    tag_ids = list(tag_ids)
+
+    if cursor is not None:
+        if cursor.type != pub_type or cursor.filter_digest != _filter_digest(tag_ids, terms):
+            raise ValueError("Search cursor does not match the search")
+        # Later pages are plain index range scans and are not cached.
+        return await _fetch_search_page(session, pub_type, tag_ids, terms, cursor)
 
-    result = await session.execute(q.order_by(repo.model.created_at.desc()).limit(10))
-    pubs = list(result.scalars())
+    cache_client = None
+    key = None
+    try:
+        cache_client = get_redis(redis_url)
+        version = int(await cache_client.get(version_key(pub_type)) or 0)
+        key = cache_key(pub_type, version, tag_ids, terms)
+        cached = await cache_client.get(key)
+        if cached is not None:
+            SEARCH_CACHE.labels(result="hit").inc()
+            return decode_page(cached)
+        SEARCH_CACHE.labels(result="miss").inc()
+    except Exception:
+        SEARCH_CACHE.labels(result="error").inc()
+        cache_client = None
+
+    page = await _fetch_search_page(session, pub_type, tag_ids, terms, None)
 
-    if cache_client and cache_key:
+    if cache_client and key:
         try:
-            await cache_client.set(
-                cache_key,
-                json.dumps([{"title": p.title, "company": p.company, "url": p.url} for p in pubs]),
-                ex=300,
-            )
+            # Empty results are cached too: the version bump is what makes new rows visible.
+            await cache_client.set(key, encode_page(page), ex=CACHE_TTL_SEC)
         except Exception:
             pass
-    return pubs
+    return page
 
 
 async def block_user(session, tg_id: int) -> bool:
     """Mark user as refused and clear preferences/subscriptions"""
-    user_repo = TgUserRepository(session)
-    user = await user_repo.get_by_tg_id(tg_id)
-    if not user:
-        return False
-
-    user.is_active = False
-    user.refused_at = datetime.datetime.utcnow()
-
-    await session.execute(
-        delete(UserPreferenceRepository(session).model).where(
-            UserPreferenceRepository(session).model.user_id == user.id
-        )
-    )
-    await session.execute(
-        delete(SubscriptionRepository(session).model).where(
-            SubscriptionRepository(session).model.user_id == user.id
-        )
+    redis_url = get_settings().redis_url
+    user_id = await TgUserRepository(session).deactivate(
+        tg_id, datetime.datetime.utcnow(), clear_subscriptions=True
     )
+    if user_id is None:
+        return False
     await session.commit()
+    await profile_cache.invalidate(tg_id, redis_url)
     return True
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import logging
+import math
+import time
+
+from redis.commands.core import AsyncScript
+
+from itstart_common.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Keys kept in memory before the ones whose bucket has fully refilled are dropped.
+SWEEP_THRESHOLD = 10_000
+
+
+class GcraLimiter:
+    """
+    Token bucket via GCRA: one number per key, the theoretical arrival time (TAT) of the
+    next request. ``rate`` is requests per second on average, ``burst`` how many may be
+    made back to back after a pause.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.interval = 1.0 / rate
+        self.window = self.interval * max(burst, 1)
+        self._tat: dict[object, float] = {}
+
+    def allow(self, key: object, now: float | None = None) -> bool:
+        now = time.monotonic() if now is None else now
+        new_tat = max(self._tat.get(key, now), now) + self.interval
+        if new_tat - now > self.window:
+            return False
+        self._tat[key] = new_tat
+        if len(self._tat) > SWEEP_THRESHOLD:
+            self._tat = {k: tat for k, tat in self._tat.items() if tat > now}
+        return True
+
+
+class LocalLimiter:
+    """Async GcraLimiter with the same interface as RedisGcraLimiter."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self._limiter = GcraLimiter(rate, burst)
+
+    async def allow(self, key: object) -> bool:
+        return self._limiter.allow(key)
+
+
+# KEYS[1] is the bucket; ARGV are now, interval and window in ms. The TAT key lives
+# exactly until the bucket has refilled.
+_GCRA_SCRIPT = """
+local now = tonumber(ARGV[1])
+local tat = math.max(tonumber(redis.call('GET', KEYS[1]) or now), now)
+local new_tat = tat + tonumber(ARGV[2])
+if new_tat - now > tonumber(ARGV[3]) then
+  return 0
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now))
+return 1
+"""
+
+
+class RedisGcraLimiter:
+    """GCRA with state shared by all replicas; falls back to a local bucket without Redis."""
+
+    def __init__(self, redis_url: str, rate: float, burst: int, prefix: str = "throttle") -> None:
+        self.redis_url = redis_url
+        self.prefix = prefix
+        self.interval_ms = 1000.0 / rate
+        self.window_ms = self.interval_ms * max(burst, 1)
+        self._fallback = GcraLimiter(rate, burst)
+        self._script: AsyncScript | None = None
+
+    async def allow(self, key: object) -> bool:
+        try:
+            client = get_redis(self.redis_url)
+            script = self._script
+            if script is None:
+                # EVALSHA after the first call; the script object is not tied to a loop.
+                script = self._script = client.register_script(_GCRA_SCRIPT)
+            allowed = await script(
+                keys=[f"{self.prefix}:{key}"],
+                args=[math.floor(time.time() * 1000), self.interval_ms, self.window_ms],
+                client=client,
+            )
+        except Exception:
+            logger.warning("Redis throttling unavailable; using local bucket", exc_info=True)
+            return self._fallback.allow(key)
+        return bool(allowed)
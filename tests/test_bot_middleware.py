@@ -0,0 +1,193 @@
+import asyncio
+import datetime
+
+import aiohttp
+import pytest
+from aiogram.dispatcher.event.bases import UNHANDLED
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import CallbackQuery, Chat, Message, Update, User
+from prometheus_client import REGISTRY
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from itstart_core_api import models
+from itstart_tg_bot.metrics import (
+    MeteredStorage,
+    UpdateMetricsMiddleware,
+    handler_label,
+    start_metrics_server,
+)
+from itstart_tg_bot.middlewares import (
+    ConcurrencyLimitMiddleware,
+    DbSessionMiddleware,
+    ThrottlingMiddleware,
+    instrument_db_time,
+)
+from itstart_tg_bot.throttling import GcraLimiter, LocalLimiter
+
+
+async def make_session_maker():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", future=True)
+    instrument_db_time(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+    return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+
+def make_update() -> Update:
+    message = Message(
+        message_id=1,
+        date=datetime.datetime.now(datetime.timezone.utc),
+        chat=Chat(id=1, type="private"),
+        text="/start",
+    )
+    return Update(update_id=1, message=message)
+
+
+async def count_users(Session) -> int:
+    async with Session() as session:
+        return await session.scalar(select(func.count()).select_from(models.TgUser))
+
+
+@pytest.mark.asyncio
+async def test_db_session_middleware_commits_and_records_db_time():
+    engine, Session = await make_session_maker()
+    middleware = DbSessionMiddleware(Session)
+    before = (
+        REGISTRY.get_sample_value("bot_update_db_seconds_count", {"update_type": "message"}) or 0
+    )
+
+    async def handler(event, data):
+        data["session"].add(models.TgUser(tg_id=42, register_at=datetime.datetime.utcnow()))
+        await data["session"].flush()
+        return "handled"
+
+    assert await middleware(handler, make_update(), {}) == "handled"
+    assert await count_users(Session) == 1
+    after = REGISTRY.get_sample_value("bot_update_db_seconds_count", {"update_type": "message"})
+    assert after == before + 1
+    assert REGISTRY.get_sample_value("bot_update_db_seconds_sum", {"update_type": "message"}) > 0
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_db_session_middleware_rolls_back_on_error():
+    engine, Session = await make_session_maker()
+    middleware = DbSessionMiddleware(Session)
+
+    async def handler(event, data):
+        data["session"].add(models.TgUser(tg_id=43, register_at=datetime.datetime.utcnow()))
+        await data["session"].flush()
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await middleware(handler, make_update(), {})
+    assert await count_users(Session) == 0
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_middleware_caps_parallel_updates():
+    middleware = ConcurrencyLimitMiddleware(2)
+    running = 0
+    peak = 0
+
+    async def handler(event, data):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    await asyncio.gather(*(middleware(handler, make_update(), {}) for _ in range(6)))
+    assert peak == 2
+
+
+def test_gcra_allows_burst_then_rate():
+    limiter = GcraLimiter(rate=2, burst=3)
+
+    assert [limiter.allow("u", now=0.0) for _ in range(4)] == [True, True, True, False]
+    # One token comes back every 1/rate seconds.
+    assert limiter.allow("u", now=0.5) is True
+    assert limiter.allow("u", now=0.5) is False
+    assert limiter.allow("other", now=0.5) is True
+
+
+@pytest.mark.asyncio
+async def test_throttling_middleware_drops_and_notifies_once(monkeypatch):
+    replies = []
+
+    async def fake_answer(self, text, **kwargs):
+        replies.append(text)
+
+    monkeypatch.setattr(Message, "answer", fake_answer)
+    middleware = ThrottlingMiddleware(LocalLimiter(rate=0.001, burst=2), None)
+    handled = []
+
+    async def handler(event, data):
+        handled.append(event)
+
+    def sample():
+        return REGISTRY.get_sample_value("bot_updates_throttled_total", {"scope": "user"}) or 0
+
+    dropped = sample()
+    user = User(id=7, is_bot=False, first_name="u")
+    for _ in range(4):
+        await middleware(handler, make_update(), {"event_from_user": user})
+
+    assert len(handled) == 2
+    assert len(replies) == 1
+    assert sample() == dropped + 2
+    # Updates without a user (channel posts, service updates) pass through.
+    await middleware(handler, make_update(), {})
+    assert len(handled) == 3
+
+
+def make_message(text: str) -> Message:
+    return make_update().message.model_copy(update={"text": text})
+
+
+def test_handler_label_uses_command_and_callback_prefix():
+    user = User(id=1, is_bot=False, first_name="u")
+    assert handler_label(make_message("/jobs@itstart_bot python")) == "/jobs"
+    assert handler_label(make_message("вакансии")) == "message"
+    callback = CallbackQuery(id="1", from_user=user, chat_instance="c", data="search:more:abc")
+    assert handler_label(callback) == "search:more"
+
+
+@pytest.mark.asyncio
+async def test_update_metrics_and_fsm_transitions():
+    def sample(name, labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    processed = {"update_type": "message", "result": "unhandled"}
+    before = sample("bot_updates_processed_total", processed)
+
+    async def handler(event, data):
+        return UNHANDLED
+
+    await UpdateMetricsMiddleware()(handler, make_update(), {})
+    assert sample("bot_updates_processed_total", processed) == before + 1
+
+    transition = {"from_state": "none", "to_state": "Wizard:step"}
+    before = sample("bot_fsm_transitions_total", transition)
+    storage = MeteredStorage(MemoryStorage())
+    key = StorageKey(bot_id=1, chat_id=1, user_id=1)
+    await storage.set_state(key, "Wizard:step")
+    await storage.set_state(key, "Wizard:step")
+    assert sample("bot_fsm_transitions_total", transition) == before + 1
+    assert await storage.get_state(key) == "Wizard:step"
+
+
+@pytest.mark.asyncio
+async def test_metrics_server_serves_prometheus_text():
+    runner = await start_metrics_server("127.0.0.1", 0)
+    try:
+        host, port = runner.addresses[0][:2]
+        async with aiohttp.ClientSession() as client:
+            async with client.get(f"http://{host}:{port}/metrics") as resp:
+                assert resp.status == 200
+                assert "bot_updates_received_total" in await resp.text()
+    finally:
+        await runner.cleanup()
@@ -2,13 +2,24 @@ import datetime
 from uuid import uuid4
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from itstart_core_api import models
 from itstart_core_api.repositories import TagRepository
+from itstart_core_api.search_cache import (
+    SearchHit,
+    SearchPage,
+    decode_page,
+    encode_page,
+    version_key,
+)
+from itstart_core_api.tag_catalog import tag_catalog
 from itstart_domain import PublicationType, TagCategory
+from itstart_tg_bot import service
+from itstart_tg_bot.profile_cache import PROFILE_KEY, UserProfile, profile_cache
 from itstart_tg_bot.service import (
+    SearchCursor,
     block_user,
     get_preferences,
     parse_tokens,
@@ -19,6 +30,14 @@ from itstart_tg_bot.service import (
 )
 
 
+@pytest.fixture(autouse=True)
+def _fresh_profile_cache():
+    # Every test gets its own in-memory DB but reuses tg ids.
+    profile_cache.clear()
+    yield
+    profile_cache.clear()
+
+
 def make_session():
     engine = create_async_engine("sqlite+aiosqlite:///:memory:", future=True)
     Session = async_sessionmaker(engine, expire_on_commit=False)
@@ -85,8 +104,149 @@ async def test_search_publications():
         session.add(models.PublicationTag(publication_id=pub.id, tag_id=t.id))
         await session.commit()
 
-        pubs = await search_publications(session, PublicationType.job, ["python"])
-        assert len(pubs) == 1
+        page = await search_publications(session, PublicationType.job, ["python"])
+        assert page.next_cursor is None
+        assert page.hits[0] == SearchHit(
+            title="Py Dev", company="Co", url="u", type=PublicationType.job
+        )
+
+        # Tokens that are not tags are matched against the text.
+        page = await search_publications(session, PublicationType.job, ["python", "dev"])
+        assert len(page.hits) == 1
+        page = await search_publications(session, PublicationType.job, ["python", "senior"])
+        assert page.hits == []
+
+
+class DictRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def incr(self, key):
+        self.data[key] = int(self.data.get(key) or 0) + 1
+        return self.data[key]
+
+
+def test_search_page_roundtrip():
+    page = SearchPage(
+        hits=[
+            SearchHit("Dev", "Co", "https://x", PublicationType.job, datetime.datetime(2026, 1, 2)),
+            SearchHit("Конф", None, None, PublicationType.conference),
+        ],
+        next_cursor="abc",
+    )
+    assert decode_page(encode_page(page)) == page
+    assert decode_page(encode_page(SearchPage(hits=[]))) == SearchPage(hits=[])
+
+
+def test_search_cursor_roundtrip_fits_callback_data():
+    cursor = SearchCursor(
+        type=PublicationType.contest,
+        rank=0.25,
+        created_at=datetime.datetime(2026, 10, 19, 12, 30, 1, 123456),
+        id=uuid4(),
+        filter_digest=b"\x01\x02\x03\x04",
+    )
+    encoded = cursor.encode()
+    assert SearchCursor.decode(encoded) == cursor
+    assert len(f"search:more:{encoded}".encode()) <= 64
+    with pytest.raises(ValueError):
+        SearchCursor.decode("not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_search_pages_walk_keyset_without_gaps():
+    engine, Session = make_session()
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+
+    created = datetime.datetime(2026, 1, 1)
+    async with Session() as session:
+        # Pairs share created_at so the id tiebreaker is exercised.
+        for i in range(25):
+            session.add(
+                models.Publication(
+                    title=f"pub {i}",
+                    description="",
+                    type=PublicationType.job,
+                    company="Co",
+                    url=str(i),
+                    created_at=created + datetime.timedelta(minutes=i // 2),
+                    vacancy_created_at=created,
+                    status="new",
+                )
+            )
+        await session.commit()
+
+        seen = []
+        page = await search_publications(session, PublicationType.job, [])
+        seen += [h.title for h in page.hits]
+        while page.next_cursor:
+            cursor = SearchCursor.decode(page.next_cursor)
+            page = await search_publications(session, PublicationType.job, [], cursor)
+            seen += [h.title for h in page.hits]
+
+        assert len(seen) == len(set(seen)) == 25
+        assert seen[0] in {"pub 23", "pub 24"}
+
+        first = await search_publications(session, PublicationType.job, [])
+        with pytest.raises(ValueError):
+            await search_publications(
+                session,
+                PublicationType.internship,
+                [],
+                SearchCursor.decode(first.next_cursor),
+            )
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_search_cache_is_versioned_per_type(monkeypatch):
+    cache = DictRedis()
+    monkeypatch.setattr(service, "get_redis", lambda url: cache)
+    engine, Session = make_session()
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+
+    def add_job(session, title):
+        session.add(
+            models.Publication(
+                title=title,
+                description="",
+                type=PublicationType.job,
+                company="Co",
+                url=title,
+                created_at=datetime.datetime.utcnow(),
+                vacancy_created_at=datetime.datetime.utcnow(),
+                status="new",
+            )
+        )
+
+    async with Session() as session:
+        add_job(session, "first")
+        await session.commit()
+        page = await search_publications(session, PublicationType.job, [])
+        assert [h.title for h in page.hits] == ["first"]
+
+        # Served from the cache until the version of this type changes.
+        add_job(session, "second")
+        await session.commit()
+        assert len((await search_publications(session, PublicationType.job, [])).hits) == 1
+
+        await cache.incr(version_key(PublicationType.internship))
+        assert len((await search_publications(session, PublicationType.job, [])).hits) == 1
+
+        await cache.incr(version_key(PublicationType.job))
+        assert len((await search_publications(session, PublicationType.job, [])).hits) == 2
+    await engine.dispose()
 
 
 def test_split_tokens():
@@ -143,3 +303,80 @@ async def test_subscribe_requires_type_and_details():
         # Type provided without occupation — now allowed
         result = await subscribe_tokens(session, tg_id=999, tokens=["jobs", "python"])
         assert PublicationType.job in result["types"]
+
+
+def test_user_profile_roundtrip():
+    profile = UserProfile(
+        id=uuid4(),
+        is_active=True,
+        types=frozenset({PublicationType.job, PublicationType.contest}),
+        tag_ids=frozenset({uuid4(), uuid4()}),
+    )
+    assert UserProfile.decode(profile.encode()) == profile
+    assert UserProfile.decode(UserProfile(id=uuid4(), is_active=False).encode()).types == set()
+
+
+@pytest.mark.asyncio
+async def test_profile_is_invalidated_on_write_and_read_without_queries(monkeypatch):
+    cache = DictRedis()
+    monkeypatch.setattr("itstart_tg_bot.profile_cache.get_redis", lambda url: cache)
+    engine, Session = make_session()
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+
+    statements = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    key = PROFILE_KEY.format(tg_id=55)
+
+    async with Session() as session:
+        tag_repo = TagRepository(session)
+        python = tag_repo.create("python", TagCategory.language)
+        remote = tag_repo.create("remote", TagCategory.format)
+        await session.commit()
+
+        # Writers don't read the profile first; they drop the cached copy after commit.
+        await get_preferences(session, 55)
+        assert key in cache.data
+        await subscribe_tokens(session, tg_id=55, tokens=["jobs", "python", "remote"])
+        assert key not in cache.data
+        await get_preferences(session, 55)
+        assert key in cache.data
+        await unsubscribe_tokens(session, 55, ["remote"])
+        assert key not in cache.data
+        # The bot process keeps the tag catalog current over pub/sub instead of reloading.
+        monkeypatch.setattr(tag_catalog, "_listening", True)
+
+        # The first read after a write reloads the committed profile, later ones are free.
+        assert await get_preferences(session, 55) == {TagCategory.language: ["python"]}
+        statements.clear()
+        assert await get_preferences(session, 55) == {TagCategory.language: ["python"]}
+        assert statements == []
+
+        profile = await profile_cache.get(session, 55, None)
+        assert profile.types == {PublicationType.job}
+        assert profile.tag_ids == {python.id}
+        assert remote.id not in profile.tag_ids
+
+        # Another replica gets it from Redis, and it matches what the DB holds.
+        profile_cache.clear()
+        assert await profile_cache.get(session, 55, "redis://") == profile
+        assert statements == []
+        profile_cache.clear()
+        assert await profile_cache.get(session, 55, None) == profile
+
+        await block_user(session, 55)
+        assert key not in cache.data
+        assert await get_preferences(session, 55) == {}
+        statements.clear()
+        assert (await profile_cache.get(session, 55, None)).is_active is False
+        assert statements == []
+
+        # Unknown users are answered without a write or a cache entry.
+        result = await unsubscribe_tokens(session, 56, ["jobs"])
+        assert result == {"removed_types": [], "removed_tags": [], "unknown": ["jobs"]}
+        assert PROFILE_KEY.format(tg_id=56) not in cache.data
+    await engine.dispose()
@@ -0,0 +1,75 @@
+import datetime
+
+import pytest
+
+from itstart_core_api import celery_app
+from itstart_core_api.celery_app import PublicationScheduler
+
+
+class FakeApp:
+    def __init__(self):
+        self.sent = []
+
+    def send_task(self, name, kwargs):
+        self.sent.append(kwargs["parser_id"])
+
+
+def make_scheduler():
+    scheduler = PublicationScheduler.__new__(PublicationScheduler)
+    scheduler.app = FakeApp()
+    scheduler.max_interval = 300
+    scheduler.parser_heap = []
+    scheduler.dispatched_at = {}
+    return scheduler
+
+
+def test_queued_parser_is_not_dispatched_again_on_refresh():
+    scheduler = make_scheduler()
+    now = datetime.datetime.utcnow()
+    due = now - datetime.timedelta(minutes=1)
+    later = now + datetime.timedelta(minutes=30)
+
+    scheduler._load_parser_heap([(due, "a"), (later, "b")], now)
+    scheduler._dispatch_due_parsers()
+    assert scheduler.app.sent == ["a"]
+
+    # Not claimed by a worker yet: next_run_at is still in the past.
+    scheduler._load_parser_heap([(due, "a"), (later, "b")], now)
+    scheduler._dispatch_due_parsers()
+    assert scheduler.app.sent == ["a"]
+    assert scheduler.parser_heap == [(later, "b")]
+
+    # Claimed and rescheduled: it is dispatched again once due.
+    scheduler._load_parser_heap([(later, "a"), (later, "b")], now)
+    assert len(scheduler.parser_heap) == 2
+
+    # A dispatch lost before any claim is retried after the lease.
+    scheduler._load_parser_heap(
+        [(due, "a")], now + datetime.timedelta(minutes=celery_app.PARSER_RUN_LEASE_MINUTES + 1)
+    )
+    assert scheduler.parser_heap == [(due, "a")]
+
+
+@pytest.mark.asyncio
+async def test_fetch_parser_next_runs_disposes_engine(monkeypatch):
+    disposed = []
+
+    class Engine:
+        async def dispose(self):
+            disposed.append(True)
+
+    class Session:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    async def next_runs(session):
+        return []
+
+    monkeypatch.setattr(celery_app, "build_engine", lambda settings: Engine())
+    monkeypatch.setattr(celery_app, "build_session_maker", lambda engine: Session)
+    monkeypatch.setattr(celery_app, "list_parser_next_runs", next_runs)
+    assert await celery_app._fetch_parser_next_runs() == []
+    assert disposed == [True]
@@ -0,0 +1,66 @@
+import sqlite3
+
+from fastapi import Depends
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from itstart_core_api import dependencies
+from itstart_core_api.config import Settings
+from itstart_core_api.db import build_engine
+from itstart_core_api.dependencies import get_db_session
+from itstart_core_api.main import create_app
+from itstart_core_api.metrics import MeteredAsyncPool
+
+
+def test_app_reuses_one_engine_per_lifespan(monkeypatch):
+    built = []
+    original_build_engine = dependencies.build_engine
+
+    def counting_build_engine(settings):
+        engine = original_build_engine(settings)
+        built.append(engine)
+        return engine
+
+    monkeypatch.setattr(dependencies, "build_engine", counting_build_engine)
+    app = create_app(Settings(database_url="sqlite+aiosqlite:///:memory:"))
+
+    @app.get("/_probe")
+    async def probe(session=Depends(get_db_session)):
+        return {"bind": id(session.bind)}
+
+    with TestClient(app) as client:
+        first = client.get("/_probe").json()["bind"]
+        second = client.get("/_probe").json()["bind"]
+        assert first == second == id(app.state.engine)
+
+    assert len(built) == 1
+
+
+def test_build_engine_applies_pool_settings():
+    settings = Settings(
+        database_url="postgresql+asyncpg://u:p@localhost:5432/db",
+        db_pool_size=3,
+        db_max_overflow=2,
+        db_pool_recycle=60,
+    )
+    engine = build_engine(settings)
+
+    pool = engine.sync_engine.pool
+    assert isinstance(pool, MeteredAsyncPool)
+    assert pool.size() == 3
+    assert pool._max_overflow == 2
+    assert pool._recycle == 60
+    assert pool._pre_ping is True
+
+
+def test_metered_pool_records_checkout_wait():
+    def sample(name):
+        return REGISTRY.get_sample_value(name) or 0.0
+
+    waits = sample("db_pool_checkout_wait_seconds_count")
+    pool = MeteredAsyncPool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0)
+
+    conn = pool.connect()
+    conn.close()
+
+    assert sample("db_pool_checkout_wait_seconds_count") == waits + 1
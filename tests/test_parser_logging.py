@@ -0,0 +1,94 @@
+import gzip
+import logging
+import logging.handlers
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+PARSERS_DIR = Path(__file__).resolve().parents[1] / "parsers"
+
+
+@pytest.fixture()
+def sentry_service(monkeypatch):
+    # Parser scripts import their helpers as top-level modules.
+    monkeypatch.syspath_prepend(str(PARSERS_DIR))
+    import sentry_service
+
+    return sentry_service
+
+
+def _record(message: str) -> logging.LogRecord:
+    return logging.makeLogRecord({"msg": message, "levelno": logging.INFO, "levelname": "INFO"})
+
+
+def _handler(sentry_service, path: Path, interval: float):
+    handler = sentry_service.SizeAndTimeRotatingFileHandler(
+        str(path), max_bytes=0, interval=interval, backup_count=5
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    return handler
+
+
+def test_reopened_handler_rotates_segment_older_than_interval(sentry_service, tmp_path):
+    log_path = tmp_path / "parser.txt"
+    handler = _handler(sentry_service, log_path, interval=3600)
+    handler.emit(_record("first run"))
+    handler.close()
+
+    # A later run touched the file an hour after the segment was started.
+    started = time.time() - 7200
+    Path(handler.start_path).write_text(repr(started))
+    os.utime(log_path, (started + 3600, started + 3600))
+
+    handler = _handler(sentry_service, log_path, interval=3600)
+    handler.emit(_record("next run"))
+    handler.close()
+
+    segments = list(tmp_path.glob("parser.txt.*.gz"))
+    assert len(segments) == 1
+    with gzip.open(segments[0], "rt") as f:
+        assert f.read() == "first run\n"
+    assert log_path.read_text() == "next run\n"
+
+
+def test_reopened_handler_keeps_recent_segment(sentry_service, tmp_path):
+    log_path = tmp_path / "parser.txt"
+    for message in ("first run", "next run"):
+        handler = _handler(sentry_service, log_path, interval=3600)
+        handler.emit(_record(message))
+        handler.close()
+
+    assert not list(tmp_path.glob("parser.txt.*"))
+    assert log_path.read_text() == "first run\nnext run\n"
+
+
+def test_parse_worker_appends_without_rotating(sentry_service, tmp_path, monkeypatch):
+    monkeypatch.setenv("PARSERS_LOG_DIR", str(tmp_path))
+    monkeypatch.setattr(sentry_service, "_log_initialized", {"parser"})
+    root = logging.getLogger()
+    before, level = list(root.handlers), root.level
+    try:
+        sentry_service.parse_worker_initializer("parser")()
+        added = [h for h in root.handlers if h not in before]
+        assert len(added) == 1
+        added = added[0]
+        assert isinstance(added, logging.handlers.WatchedFileHandler)
+        assert not isinstance(added, logging.handlers.BaseRotatingHandler)
+        assert added.baseFilename == str(tmp_path / "parser.txt")
+        added.emit(_record("from a worker"))
+    finally:
+        for handler in root.handlers[:]:
+            if handler not in before:
+                root.removeHandler(handler)
+                handler.close()
+        root.setLevel(level)
+
+    assert (tmp_path / "parser.txt").read_text().endswith("from a worker\n")
+    # The sidecar belongs to the parent's rotating handler only.
+    assert not (tmp_path / ".parser.txt.start").exists()
+
+
+def test_parse_worker_initializer_needs_file_logging(sentry_service):
+    assert sentry_service.parse_worker_initializer("not-initialized") is None
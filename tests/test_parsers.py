@@ -1,4 +1,6 @@
 import datetime
+import json
+from pathlib import Path
 from uuid import uuid4
 
 import pytest
@@ -12,6 +14,9 @@ from itstart_core_api.dependencies import get_db_session
 from itstart_core_api.main import create_app
 from itstart_core_api.security import hash_password
 
+PARSERS_DIR = Path(__file__).resolve().parents[1] / "parsers"
+GOLDEN = json.loads((PARSERS_DIR / "fixtures" / "golden" / "parse_detail.json").read_text())
+
 
 @pytest.mark.asyncio
 async def test_parsers_crud(monkeypatch):
@@ -77,6 +82,33 @@ async def test_parsers_crud(monkeypatch):
     assert resp.json()["parsing_interval"] == 20
     assert resp.json()["is_active"] is False
 
+    resp = client.patch(
+        f"/admin/parsers/{parser_id}",
+        headers=headers,
+        params={
+            "adaptive_scheduling": True,
+            "min_parsing_interval": 10,
+            "max_parsing_interval": 240,
+        },
+    )
+    assert resp.status_code == 200
+    assert resp.json()["adaptive_scheduling"] is True
+    assert resp.json()["max_parsing_interval"] == 240
+
+    resp = client.patch(
+        f"/admin/parsers/{parser_id}", headers=headers, params={"min_parsing_interval": 30}
+    )
+    assert resp.status_code == 400
+
+    resp = client.patch(
+        f"/admin/parsers/{parser_id}",
+        headers=headers,
+        params={"clear_min_parsing_interval": True, "clear_max_parsing_interval": True},
+    )
+    assert resp.status_code == 200
+    assert resp.json()["min_parsing_interval"] is None
+    assert resp.json()["max_parsing_interval"] is None
+
     resp = client.post(f"/admin/parsers/{parser_id}/enable", headers=headers)
     assert resp.status_code == 204
 
@@ -85,3 +117,36 @@ async def test_parsers_crud(monkeypatch):
 
     resp = client.post(f"/admin/parsers/{parser_id}/disable", headers=headers)
     assert resp.status_code == 204
+
+
+@pytest.fixture()
+def bench_parse(monkeypatch):
+    # Parser scripts import their helpers as top-level modules.
+    monkeypatch.syspath_prepend(str(PARSERS_DIR))
+    import bench_parse
+
+    return bench_parse
+
+
+def _parse_case(bench_parse, name):
+    cases = {case_name: (path, parse) for case_name, path, parse in bench_parse._cases()}
+    path, parse = cases[name]
+    return bench_parse._stable(parse(Path(path).read_text(encoding="utf-8")))
+
+
+@pytest.mark.parametrize("name", sorted(GOLDEN))
+def test_parse_detail_matches_golden(bench_parse, name):
+    import scraping_runtime
+
+    # lxml is a declared dependency, so CI checks the fast path here.
+    assert scraping_runtime.lxml_html is not None
+    assert scraping_runtime.PAGE_FEATURES == "lxml"
+    assert _parse_case(bench_parse, name) == GOLDEN[name]
+
+
+@pytest.mark.parametrize("name", sorted(n for n in GOLDEN if n.startswith("tbank/")))
+def test_tbank_soup_fallback_matches_golden(bench_parse, monkeypatch, name):
+    import tbank_parser
+
+    monkeypatch.setattr(tbank_parser, "lxml_html", None)
+    assert _parse_case(bench_parse, name) == GOLDEN[name]
@@ -7,7 +7,14 @@ from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from itstart_core_api import models
 from itstart_core_api.config import Settings
-from itstart_core_api.parsing_service import run_parsers_once
+from itstart_core_api.parsing_service import (
+    _due_at,
+    _effective_interval,
+    _is_due,
+    list_parser_next_runs,
+    run_parser,
+    run_parsers_once,
+)
 
 
 @pytest.mark.asyncio
@@ -79,3 +86,226 @@ async def test_run_parsers_once_ingests_and_tags(tmp_path, monkeypatch):
         assert len(results) == 1
         assert results[0].success is True
         assert results[0].received_amount == 2
+        assert results[0].saved_amount == 1
+        assert results[0].duplicate_amount == 1
+        assert results[0].rejected_amount == 0
+        assert results[0].output_bytes > 0
+        assert results[0].spawn_ms is not None
+        assert results[0].execute_ms is not None
+
+        parser = (await session.execute(select(models.Parser))).scalar_one()
+        assert parser.next_run_at == results[0].date + datetime.timedelta(minutes=60)
+
+    # Not due again until next_run_at: a second sweep runs nothing.
+    assert await run_parsers_once(Session, settings) == []
+
+
+def _adaptive_parser(**kwargs):
+    now = datetime.datetime.utcnow()
+    defaults = dict(
+        source_name="adaptive",
+        executable_file_path="python fake.py",
+        type=models.ParserType.website_parser,
+        parsing_interval=60,
+        parsing_start_time=now - datetime.timedelta(days=30),
+        is_active=True,
+        adaptive_scheduling=True,
+        min_parsing_interval=15,
+        max_parsing_interval=720,
+    )
+    defaults.update(kwargs)
+    return models.Parser(**defaults)
+
+
+def _result(date, received, saved, success=True):
+    return models.ParsingResult(
+        date=date, success=success, received_amount=received, saved_amount=saved
+    )
+
+
+def test_effective_interval_fixed_without_adaptive_mode():
+    now = datetime.datetime.utcnow()
+    parser = _adaptive_parser(adaptive_scheduling=False)
+    assert _effective_interval(parser, [_result(now, 10, 10)], now) == 60
+
+
+def test_effective_interval_tightens_on_high_yield():
+    now = datetime.datetime.utcnow()
+    parser = _adaptive_parser(last_changed_at=now)
+    results = [_result(now, 10, 9), _result(now - datetime.timedelta(hours=1), 10, 9)]
+    assert _effective_interval(parser, results, now) == 15
+
+
+def test_effective_interval_relaxes_when_source_is_idle():
+    now = datetime.datetime.utcnow()
+    parser = _adaptive_parser(last_changed_at=now - datetime.timedelta(days=2))
+    results = [_result(now, 10, 0), _result(now - datetime.timedelta(hours=1), 10, 0)]
+    # 10% of two idle days, within [15, 720]
+    assert _effective_interval(parser, results, now) == 288
+
+    parser.last_changed_at = now - datetime.timedelta(days=30)
+    assert _effective_interval(parser, results, now) == 720
+
+
+def test_effective_interval_starts_at_base_before_any_change():
+    now = datetime.datetime.utcnow()
+    # Created a month ago, adaptive mode just switched on: no idle history yet.
+    parser = _adaptive_parser(last_changed_at=None)
+    results = [_result(now, 10, 0)]
+    assert _effective_interval(parser, results, now) == 60
+
+
+def test_is_due_uses_adaptive_interval():
+    now = datetime.datetime.utcnow()
+    parser = _adaptive_parser(last_changed_at=now - datetime.timedelta(days=30))
+    last_run = now - datetime.timedelta(hours=2)
+    results = [_result(last_run, 5, 0)]
+    assert _is_due(parser, results, now) is False
+    assert _is_due(parser, results, last_run + datetime.timedelta(minutes=720)) is True
+
+
+def test_due_at_covers_start_time_and_failure_backoff():
+    now = datetime.datetime.utcnow()
+    parser = _adaptive_parser(adaptive_scheduling=False)
+    assert _due_at(parser, [], now) == parser.parsing_start_time
+
+    failed = [_result(now, 0, 0, success=False)]
+    assert _due_at(parser, failed, now) == now + datetime.timedelta(minutes=15)
+    failed.append(_result(now - datetime.timedelta(minutes=15), 0, 0, success=False))
+    assert _due_at(parser, failed, now) == now + datetime.timedelta(minutes=45)
+
+    parser.parsing_start_time = now + datetime.timedelta(days=1)
+    assert _due_at(parser, failed, now) == parser.parsing_start_time
+
+
+@pytest.mark.asyncio
+async def test_run_parser_claims_once_and_backfills_next_run_at(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'dispatch.db'}", future=True)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+
+    script_path = tmp_path / "empty_parser.py"
+    script_path.write_text("print('[]')\n")
+    now = datetime.datetime.utcnow()
+    settings = Settings()
+
+    async with Session() as session:
+        due = _adaptive_parser(
+            adaptive_scheduling=False, executable_file_path=f"python {script_path}"
+        )
+        waiting = _adaptive_parser(adaptive_scheduling=False, source_name="waiting")
+        session.add_all([due, waiting])
+        await session.flush()
+        session.add(
+            models.ParsingResult(
+                date=now - datetime.timedelta(minutes=10),
+                parser_id=waiting.id,
+                success=True,
+                received_amount=0,
+            )
+        )
+        await session.commit()
+
+        stats = await run_parser(session, settings, due.id, now=now)
+        assert stats is not None and stats.success is True
+        assert due.next_run_at == now + datetime.timedelta(minutes=60)
+        # Dispatched twice: the second delivery finds the parser already claimed.
+        assert await run_parser(session, settings, due.id, now=now) is None
+
+        # Unknown next_run_at is computed from history instead of running early.
+        assert await run_parser(session, settings, waiting.id, now=now) is None
+        assert waiting.next_run_at == now + datetime.timedelta(minutes=50)
+
+        heap = sorted(await list_parser_next_runs(session))
+        assert [pid for _, pid in heap] == [str(waiting.id), str(due.id)]
+
+
+@pytest.mark.asyncio
+async def test_run_parser_pipes_known_urls_to_stdin(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'known.db'}", future=True)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+
+    # Emits only the listing URLs the runner did not report as already stored.
+    script_path = tmp_path / "incremental_parser.py"
+    script_path.write_text(
+        "import json, sys\n"
+        "known = {line.strip() for line in sys.stdin}\n"
+        "urls = ['https://example.com/jobs/1', 'https://example.com/jobs/2']\n"
+        "json.dump([\n"
+        "    {'title': 'Python Developer', 'company': 'ACME', 'description': 'Python',\n"
+        "     'url': url, 'type': 'job'}\n"
+        "    for url in urls if url not in known\n"
+        "], sys.stdout)\n"
+    )
+    now = datetime.datetime.utcnow()
+
+    async with Session() as session:
+        parser = _adaptive_parser(
+            adaptive_scheduling=False, executable_file_path=f"python {script_path}"
+        )
+        session.add(parser)
+        await session.flush()
+        session.add(
+            models.Publication(
+                title="Python Developer",
+                description="Python",
+                type=models.PublicationType.job,
+                company="ACME",
+                url="https://example.com/jobs/1",
+                source_id=parser.id,
+                created_at=now,
+                vacancy_created_at=now,
+            )
+        )
+        await session.commit()
+
+        stats = await run_parser(session, Settings(), parser.id, now=now)
+        assert stats is not None
+        assert stats.received == 1
+        assert stats.saved == 1
+
+
+@pytest.mark.asyncio
+async def test_run_parser_passes_watermark_from_stored_publications(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'watermark.db'}", future=True)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+
+    # Echoes the watermark it was given so the test can read it back from the stored row.
+    script_path = tmp_path / "watermark_parser.py"
+    script_path.write_text(
+        "import json, os, sys\n"
+        "since = os.environ.get('PARSER_WATERMARK', 'none')\n"
+        "json.dump([\n"
+        "    {'title': 'Python Developer since ' + since, 'company': 'ACME',\n"
+        "     'description': 'since ' + since, 'url': 'https://example.com/jobs/' + since,\n"
+        "     'type': 'job', 'vacancy_created_at': '2026-01-10T00:00:00+00:00'}\n"
+        "], sys.stdout)\n"
+    )
+    now = datetime.datetime.utcnow()
+
+    async with Session() as session:
+        parser = _adaptive_parser(
+            adaptive_scheduling=False, executable_file_path=f"python {script_path}"
+        )
+        session.add(parser)
+        await session.commit()
+
+        # Nothing stored yet: the parser runs without a watermark.
+        assert await run_parser(session, Settings(), parser.id, now=now) is not None
+        # The first run's row is committed, so the next run starts from its date.
+        later = now + datetime.timedelta(minutes=parser.parsing_interval)
+        assert await run_parser(session, Settings(), parser.id, now=later) is not None
+
+        descriptions = (
+            await session.scalars(
+                select(models.Publication.description)
+                .where(models.Publication.source_id == parser.id)
+                .order_by(models.Publication.description)
+            )
+        ).all()
+        assert descriptions == ["since 2026-01-10T00:00:00+00:00", "since none"]
@@ -1,4 +1,6 @@
+import base64
 import datetime
+import json
 from uuid import uuid4
 
 import pytest
@@ -10,6 +12,7 @@ from itstart_core_api.auth import _create_access_token
 from itstart_core_api.config import Settings, get_settings
 from itstart_core_api.dependencies import get_db_session
 from itstart_core_api.main import create_app
+from itstart_core_api.pagination import KeysetCursor
 from itstart_core_api.security import hash_password
 from itstart_domain import PublicationType, TagCategory
 
@@ -68,6 +71,18 @@ async def test_publications_crud_flow(monkeypatch):
     resp = client.get("/admin/publications", headers=headers)
     assert resp.status_code == 200
     assert len(resp.json()) == 1
+    # Lists carry an excerpt; description and contacts only come with the single row.
+    assert resp.json()[0]["excerpt"] == "desc"
+    assert "description" not in resp.json()[0]
+    assert "contact_info" not in resp.json()[0]
+    resp = client.get(f"/admin/publications/{pub.id}", headers=headers)
+    assert resp.json()["description"] == "desc"
+    assert [t["name"] for t in resp.json()["tags"]] == ["python"]
+
+    resp = client.get("/admin/publications", headers=headers, params={"q": "py desc"})
+    assert [p["title"] for p in resp.json()] == ["Py Dev"]
+    resp = client.get("/admin/publications", headers=headers, params={"q": "golang"})
+    assert resp.json() == []
 
     deadline = datetime.datetime.utcnow().isoformat()
     resp = client.patch(
@@ -156,3 +171,136 @@ async def test_create_and_delete_publication(monkeypatch, tmp_path):
     resp = client.get("/admin/publications", headers=headers)
     assert resp.status_code == 200
     assert resp.json() == []
+
+
+@pytest.mark.asyncio
+async def test_list_publications_keyset_pages_and_tag_filters(monkeypatch):
+    monkeypatch.setenv("POSTGRES_DSN", "sqlite+aiosqlite:///:memory:")
+    monkeypatch.setenv("SECRET_KEY", "secret")
+    settings = Settings(access_token_ttl_sec=3600)
+    app = create_app(settings)
+    engine = create_async_engine(settings.database_url, future=True)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+
+    async def override_get_db_session():
+        async with Session() as session:
+            yield session
+
+    app.dependency_overrides[get_db_session] = override_get_db_session
+    app.dependency_overrides[get_settings] = lambda: settings
+
+    created = datetime.datetime(2026, 1, 1)
+    async with Session() as session:
+        admin = models.AdminUser(
+            id=uuid4(),
+            username="root",
+            password_hash=hash_password("root"),
+            role=models.AdminRole.admin,
+            is_active=True,
+            created_at=datetime.datetime.utcnow(),
+        )
+        session.add(admin)
+        python = models.Tag(id=uuid4(), name="python", category=TagCategory.language)
+        remote = models.Tag(id=uuid4(), name="remote", category=TagCategory.format)
+        session.add_all([python, remote])
+        for i in range(7):
+            pub = models.Publication(
+                id=uuid4(),
+                title=f"pub {i}",
+                description="desc",
+                type=PublicationType.job,
+                company="Co",
+                url=str(i),
+                # Pairs share created_at so the id tiebreaker is exercised.
+                created_at=created + datetime.timedelta(minutes=i // 2),
+                vacancy_created_at=created,
+                status="new",
+            )
+            session.add(pub)
+            session.add(models.PublicationTag(publication_id=pub.id, tag_id=python.id))
+            if i % 3 == 0:
+                session.add(models.PublicationTag(publication_id=pub.id, tag_id=remote.id))
+        await session.commit()
+
+    token = _create_access_token(settings, str(admin.id))
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    seen = []
+    params = {"limit": 3}
+    while True:
+        resp = client.get("/admin/publications", headers=headers, params=params)
+        assert resp.status_code == 200
+        assert len(resp.json()) <= 3
+        seen += [p["title"] for p in resp.json()]
+        if "cursor" not in params:
+            assert resp.headers["X-Total-Count"] == "7"
+        if "X-Next-Cursor" not in resp.headers:
+            break
+        params["cursor"] = resp.headers["X-Next-Cursor"]
+    assert len(seen) == len(set(seen)) == 7
+    assert seen[0] == "pub 6"
+
+    resp = client.get("/admin/publications", headers=headers, params={"tag_ids": [str(remote.id)]})
+    assert sorted(p["title"] for p in resp.json()) == ["pub 0", "pub 3", "pub 6"]
+    assert resp.headers["X-Total-Count"] == "3"
+    assert all(len(p["tags"]) == 2 for p in resp.json())
+
+    both = {"tag_ids": [str(python.id), str(remote.id)]}
+    resp = client.get("/admin/publications", headers=headers, params=both)
+    assert len(resp.json()) == 7
+    resp = client.get("/admin/publications", headers=headers, params={**both, "tags_match": "all"})
+    assert len(resp.json()) == 3
+
+    # Relevance order keeps the rank in the cursor.
+    resp = client.get("/admin/publications", headers=headers, params={"q": "desc", "limit": 5})
+    cursor = resp.headers["X-Next-Cursor"]
+    resp = client.get(
+        "/admin/publications", headers=headers, params={"q": "desc", "cursor": cursor}
+    )
+    assert len(resp.json()) == 2
+    resp = client.get("/admin/publications", headers=headers, params={"cursor": cursor})
+    assert resp.status_code == 400
+
+    resp = client.get("/admin/publications", headers=headers, params={"limit": 1000})
+    assert resp.status_code == 422
+    resp = client.get("/admin/publications", headers=headers, params={"cursor": "nope"})
+    assert resp.status_code == 400
+    # Valid base64 JSON with a number where the id goes.
+    crafted = _encode_cursor_row(["2026-01-01T00:00:00", 5])
+    resp = client.get("/admin/publications", headers=headers, params={"cursor": crafted})
+    assert resp.status_code == 400
+    await engine.dispose()
+
+
+def _encode_cursor_row(row) -> str:
+    raw = json.dumps(row).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+@pytest.mark.parametrize(
+    "row",
+    [
+        ["2026-01-01T00:00:00", 5],
+        [20260101, uuid4().hex],
+        ["2026-01-01T00:00:00", uuid4().hex, "high"],
+        ["2026-01-01T00:00:00", uuid4().hex, True],
+        ["2026-01-01T00:00:00", uuid4().hex, 1.0, 2.0],
+        {"created_at": "2026-01-01T00:00:00"},
+        "2026-01-01T00:00:00",
+        ["not a date", uuid4().hex],
+    ],
+)
+def test_keyset_cursor_rejects_crafted_values(row):
+    with pytest.raises(ValueError):
+        KeysetCursor.decode(_encode_cursor_row(row))
+
+
+def test_keyset_cursor_roundtrip():
+    cursor = KeysetCursor(datetime.datetime(2026, 1, 1, 12), uuid4(), rank=0.5)
+    assert KeysetCursor.decode(cursor.encode()) == cursor
+    plain = KeysetCursor(datetime.datetime(2026, 1, 1, 12), uuid4())
+    assert KeysetCursor.decode(plain.encode()) == plain
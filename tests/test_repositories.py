@@ -1,8 +1,11 @@
 import datetime
+from uuid import uuid4
 
 import pytest
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql
 
-from itstart_core_api import models
+from itstart_core_api import models, repositories
 from itstart_core_api.repositories import (
     PublicationRepository,
     SubscriptionRepository,
@@ -101,3 +104,139 @@ async def test_user_preferences(session):
     rows = prefs.fetchall()
     assert len(rows) == 1
     assert rows[0].tag_id == tag.id
+
+
+async def count_rows(session, model, **filters) -> int:
+    query = select(func.count()).select_from(model)
+    for name, value in filters.items():
+        query = query.where(getattr(model, name) == value)
+    return await session.scalar(query)
+
+
+@pytest.mark.asyncio
+async def test_subscribe_unsubscribe_and_deactivate(session):
+    user_repo = TgUserRepository(session)
+    sub_repo = SubscriptionRepository(session)
+    tags = [
+        models.Tag(name="go", category=TagCategory.language),
+        models.Tag(name="office", category=TagCategory.format),
+    ]
+    session.add_all(tags)
+    await session.commit()
+    tag_ids = [t.id for t in tags]
+    now = datetime.datetime.utcnow()
+
+    user_id = await sub_repo.subscribe(777, now, [PublicationType.job], tag_ids)
+    # Repeating is an upsert: same user, same subscription, no duplicate tags.
+    again = await sub_repo.subscribe(
+        777, now, [PublicationType.job, PublicationType.contest], tag_ids
+    )
+    await session.commit()
+    assert again == user_id
+    Sub = models.TgUserSubscription
+    assert await count_rows(session, Sub, user_id=user_id) == 2
+    sub_tags = select(func.count()).where(
+        models.TgUserSubscriptionTag.subscription_id.in_(
+            select(Sub.id).where(Sub.user_id == user_id)
+        )
+    )
+    assert await session.scalar(sub_tags) == 4
+    assert await count_rows(session, models.UserPreference, user_id=user_id) == 2
+
+    assert await user_repo.unsubscribe(777, [PublicationType.contest], tag_ids[:1]) == user_id
+    assert await count_rows(session, Sub, user_id=user_id) == 1
+    assert await count_rows(session, models.UserPreference, user_id=user_id) == 1
+
+    assert await user_repo.deactivate(777, now, clear_subscriptions=True) == user_id
+    await session.commit()
+    assert await count_rows(session, Sub, user_id=user_id) == 0
+    assert await count_rows(session, models.TgUser, tg_id=777, is_active=False) == 1
+    assert await user_repo.deactivate(778, now) is None
+
+
+class RecordingSession:
+    """Compiles statements for asyncpg instead of running them; every result is one id."""
+
+    def __init__(self):
+        self.executed = []
+
+    async def execute(self, stmt):
+        sql = str(stmt.compile(dialect=postgresql.asyncpg.dialect()))
+        self.executed.append(" ".join(sql.split()))
+        return self
+
+    def scalar_one(self):
+        return uuid4()
+
+    scalar_one_or_none = scalar_one
+
+
+@pytest.fixture()
+def pg_session(monkeypatch):
+    monkeypatch.setattr(repositories, "_is_postgres", lambda session: True)
+    return RecordingSession()
+
+
+@pytest.mark.asyncio
+async def test_subscribe_is_one_statement_on_postgres(pg_session):
+    await SubscriptionRepository(pg_session).subscribe(
+        1, datetime.datetime.utcnow(), [PublicationType.job, PublicationType.internship], [uuid4()]
+    )
+
+    assert len(pg_session.executed) == 1
+    sql = pg_session.executed[0]
+    assert sql.startswith("WITH u AS (INSERT INTO tg_user ")
+    assert "ON CONFLICT (tg_id) DO UPDATE SET" in sql
+    assert (
+        "subs AS (INSERT INTO tg_user_subscriptions (user_id, publication_type, deadline_reminder)"
+        " SELECT u.id" in sql
+    )
+    assert "ON CONFLICT (user_id, publication_type) DO UPDATE SET deadline_reminder" in sql
+    # Tags of new subscriptions are only reachable through the subs CTE's RETURNING.
+    assert "sub_tags AS (INSERT INTO tg_user_subscription_tags (subscription_id, tag_id)" in sql
+    assert "FROM subs JOIN (VALUES" in sql
+    assert "prefs AS (INSERT INTO user_preferences (user_id, tag_id) SELECT u.id" in sql
+    assert sql.endswith("SELECT u.id FROM u")
+
+
+@pytest.mark.asyncio
+async def test_subscribe_without_tags_skips_tag_ctes_on_postgres(pg_session):
+    await SubscriptionRepository(pg_session).subscribe(
+        1, datetime.datetime.utcnow(), [PublicationType.job], []
+    )
+
+    (sql,) = pg_session.executed
+    assert "subs AS" in sql
+    assert "sub_tags AS" not in sql
+    assert "prefs AS" not in sql
+
+
+@pytest.mark.asyncio
+async def test_deactivate_with_cleanup_is_one_statement_on_postgres(pg_session):
+    await TgUserRepository(pg_session).deactivate(
+        1, datetime.datetime.utcnow(), clear_subscriptions=True
+    )
+
+    (sql,) = pg_session.executed
+    assert sql.startswith("WITH u AS (UPDATE tg_user SET ")
+    assert "RETURNING tg_user.id" in sql
+    assert (
+        "DELETE FROM user_preferences WHERE user_preferences.user_id IN (SELECT u.id FROM u)" in sql
+    )
+    assert (
+        "DELETE FROM tg_user_subscriptions WHERE tg_user_subscriptions.user_id IN "
+        "(SELECT u.id FROM u)" in sql
+    )
+    assert sql.endswith("SELECT u.id FROM u")
+
+
+@pytest.mark.asyncio
+async def test_unsubscribe_is_one_statement_on_postgres(pg_session):
+    await TgUserRepository(pg_session).unsubscribe(1, [PublicationType.job], [uuid4()])
+
+    (sql,) = pg_session.executed
+    assert sql.startswith("WITH u AS (SELECT tg_user.id AS id FROM tg_user WHERE tg_user.tg_id =")
+    assert "s0 AS (DELETE FROM tg_user_subscriptions" in sql
+    assert "tg_user_subscriptions.publication_type IN" in sql
+    assert "s1 AS (DELETE FROM user_preferences" in sql
+    assert "user_preferences.tag_id IN" in sql
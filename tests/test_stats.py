@@ -1,14 +1,17 @@
+import csv
 import datetime
+import io
 from uuid import uuid4
 
 import pytest
 from fastapi.testclient import TestClient
+from openpyxl import load_workbook
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from itstart_core_api import models
 from itstart_core_api.auth import _create_access_token
 from itstart_core_api.config import Settings, get_settings
-from itstart_core_api.dependencies import get_db_session
+from itstart_core_api.dependencies import get_db_session, get_session_maker
 from itstart_core_api.main import create_app
 from itstart_core_api.security import hash_password
 from itstart_domain import PublicationType, TagCategory
@@ -31,6 +34,7 @@ async def test_stats_and_export(monkeypatch):
             yield session
 
     app.dependency_overrides[get_db_session] = override_get_db_session
+    app.dependency_overrides[get_session_maker] = lambda: Session
     app.dependency_overrides[get_settings] = lambda: settings
 
     async with Session() as session:
@@ -58,6 +62,46 @@ async def test_stats_and_export(monkeypatch):
             status="sent",
         )
         session.add(pub)
+        session.add(
+            models.Publication(
+                title="untagged",
+                description="d",
+                type=PublicationType.internship,
+                company="c",
+                url="u2",
+                created_at=datetime.datetime.utcnow(),
+                vacancy_created_at=datetime.datetime.utcnow(),
+                status="new",
+            )
+        )
+        await session.flush()
+        session.add(models.PublicationTag(publication_id=pub.id, tag_id=tag.id))
+        parser = models.Parser(
+            source_name="fake",
+            executable_file_path="python fake.py",
+            type=models.ParserType.website_parser,
+            parsing_interval=60,
+            parsing_start_time=datetime.datetime.utcnow(),
+        )
+        session.add(parser)
+        await session.flush()
+        session.add(
+            models.ParsingResult(
+                date=datetime.datetime.utcnow(),
+                parser_id=parser.id,
+                success=True,
+                received_amount=3,
+                saved_amount=1,
+                duplicate_amount=1,
+                rejected_amount=1,
+                output_bytes=512,
+                spawn_ms=4,
+                execute_ms=1200,
+                decode_ms=2,
+                dedup_ms=10,
+                insert_ms=6,
+            )
+        )
         await session.commit()
 
     token = _create_access_token(settings, str(admin.id))
@@ -76,7 +120,30 @@ async def test_stats_and_export(monkeypatch):
 
     resp = client.get("/admin/stats/parsers", headers=headers)
     assert resp.status_code == 200
+    [parser_stats] = resp.json()
+    assert parser_stats["error_percent"] == 0
+    assert parser_stats["saved"] == 1
+    assert parser_stats["duplicates"] == 1
+    assert parser_stats["rejected"] == 1
+    assert parser_stats["output_bytes"] == 512
+    assert parser_stats["avg_phase_ms"]["execute"] == 1200
 
     resp = client.get("/admin/export/publications", headers=headers)
     assert resp.status_code == 200
     assert resp.headers["Content-Type"].startswith("text/csv")
+    header, *rows = csv.reader(io.StringIO(resp.text))
+    assert header == ["id", "title", "type", "company", "url", "created_at", "status", "tags"]
+    by_title = {row[1]: row for row in rows}
+    assert by_title["t"][2] == "job"
+    assert by_title["t"][7] == "python"
+    assert by_title["untagged"][7] == ""
+
+    resp = client.get("/admin/export/publications", headers=headers, params={"fmt": "xlsx"})
+    assert resp.status_code == 200
+    sheet = load_workbook(io.BytesIO(resp.content), read_only=True)["publications"]
+    values = [list(row) for row in sheet.iter_rows(values_only=True)]
+    assert values[0][1] == "title"
+    assert sorted(row[7] or "" for row in values[1:]) == ["", "python"]
+
+    resp = client.get("/admin/export/publications", headers=headers, params={"fmt": "pdf"})
+    assert resp.status_code == 400
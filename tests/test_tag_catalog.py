@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from itstart_core_api import models
+from itstart_core_api.repositories import TagRepository
+from itstart_core_api.tag_catalog import TagCatalog, TagCatalogCache
+from itstart_domain import TagCategory
+
+
+def make_tags(*names):
+    return [SimpleNamespace(id=uuid4(), name=n, category=TagCategory.language) for n in names]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Senior JavaScript developer",
+        "java и Script",
+        "Разработчик Python/Go, удалённо",
+        "nothing relevant",
+        "",
+    ],
+)
+def test_match_equals_substring_containment(text):
+    tags = make_tags("java", "javascript", "script", "python", "go", "разработчик", "c++")
+    catalog = TagCatalog.from_tags(tags)
+
+    expected = {t.id for t in tags if t.name.casefold() in text.casefold()}
+    assert catalog.match(text) == expected
+
+
+def test_lookups_and_empty_catalog():
+    tags = make_tags("Python", "ios")
+    catalog = TagCatalog.from_tags(tags, version=3)
+
+    assert catalog.version == 3
+    assert catalog.by_name["python"] == tags[0].id
+    assert catalog.by_id[tags[1].id].name == "ios"
+    assert TagCatalog.from_tags([]).match("python") == set()
+
+
+@pytest.mark.asyncio
+async def test_cache_reuses_snapshot_until_invalidated():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", future=True)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+
+    cache = TagCatalogCache()
+    async with Session() as session:
+        TagRepository(session).create("python", TagCategory.language)
+        await session.commit()
+
+        # Without Redis every call reloads.
+        assert set((await cache.get(session, None)).by_name) == {"python"}
+        TagRepository(session).create("kotlin", TagCategory.language)
+        await session.commit()
+        assert set((await cache.get(session, None)).by_name) == {"python", "kotlin"}
+
+        # A process subscribed to changes serves the snapshot until a change arrives.
+        cache._listening = True
+        snapshot = await cache.get(session, None)
+        TagRepository(session).create("swift", TagCategory.language)
+        await session.commit()
+        assert await cache.get(session, None) is snapshot
+
+        cache.invalidate()
+        assert "swift" in (await cache.get(session, None)).by_name
+    await engine.dispose()
@@ -13,6 +13,7 @@ from itstart_core_api.tasks import (
     _parse_publication_type,
     _send_telegram_message,
     cleanup_old_publications,
+    run_parser,
     run_parsers,
     send_deadline_reminders,
     send_publication_now,
@@ -544,6 +545,25 @@ async def test_run_parsers_calls_run_due_parsers(monkeypatch, tmp_path):
     assert called["ok"] is True
 
 
+@pytest.mark.asyncio
+async def test_run_parser_runs_single_dispatched_parser(monkeypatch, tmp_path):
+    db_path = tmp_path / "test12.db"
+    monkeypatch.setenv("POSTGRES_DSN", f"sqlite+aiosqlite:///{db_path}")
+    monkeypatch.setenv("SECRET_KEY", "secret")
+    settings = Settings()
+    parser_id = uuid4()
+    called: list[object] = []
+
+    async def fake_run_single_parser(_session, _settings, pid, now=None):
+        called.append(pid)
+
+    monkeypatch.setattr("itstart_core_api.tasks.get_settings", lambda: settings)
+    monkeypatch.setattr("itstart_core_api.tasks.run_single_parser", fake_run_single_parser)
+
+    await run_parser(str(parser_id))
+    assert called == [parser_id]
+
+
 @pytest.mark.asyncio
 async def test_send_telegram_message_uses_httpx_client(monkeypatch):
     calls: list[tuple[str, dict]] = []